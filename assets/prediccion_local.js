@@ -0,0 +1,63 @@
+// Predicción en el navegador a partir del corte cuantizado que envía el servidor
+// (SistemaDifusoTarjetasGraficas.obtener_corte_cuantizado): interpolación trilineal
+// sobre configuracion x fps_objetivo x potencia_gpu, sin ir al servidor.
+(function () {
+  const decodificados = new WeakMap();
+
+  function decodificar(corte) {
+    let datos = decodificados.get(corte);
+    if (!datos) {
+      datos = {};
+      for (const salida of ["uso_gpu", "temperatura"]) {
+        const binario = atob(corte[salida].codigos);
+        const codigos = new Uint8Array(binario.length);
+        for (let i = 0; i < binario.length; i++) codigos[i] = binario.charCodeAt(i);
+        datos[salida] = codigos;
+      }
+      decodificados.set(corte, datos);
+    }
+    return datos;
+  }
+
+  // Índice de la celda y fracción dentro de ella para un eje de paso uniforme
+  function ubicar(eje, x) {
+    const n = eje.length;
+    const t = (Math.min(Math.max(x, eje[0]), eje[n - 1]) - eje[0]) / (eje[1] - eje[0]);
+    const i = Math.min(Math.floor(t), n - 2);
+    return [i, t - i];
+  }
+
+  function interpolar(corte, codigos, salida, valores) {
+    const [ejeC, ejeF, ejeG] = corte.ejes;
+    const nF = ejeF.length, nG = ejeG.length;
+    const [[i, u], [j, v], [k, w]] = [ubicar(ejeC, valores[0]), ubicar(ejeF, valores[1]), ubicar(ejeG, valores[2])];
+    let total = 0;
+    for (let a = 0; a < 2; a++) {
+      for (let b = 0; b < 2; b++) {
+        for (let c = 0; c < 2; c++) {
+          const peso = (a ? u : 1 - u) * (b ? v : 1 - v) * (c ? w : 1 - w);
+          if (peso) total += peso * codigos[((i + a) * nF + (j + b)) * nG + (k + c)];
+        }
+      }
+    }
+    return corte[salida].minimo + total * corte[salida].escala;
+  }
+
+  function etiquetar(valor, umbrales, etiquetas) {
+    let i = 0;
+    while (i < umbrales.length && valor > umbrales[i]) i++;
+    return etiquetas[i];
+  }
+
+  window.predecirLocal = function (corte, configuracion, fpsObjetivo, potenciaGpu) {
+    if (!corte || !corte.ejes) return "";
+    const datos = decodificar(corte);
+    const valores = [configuracion, fpsObjetivo, potenciaGpu];
+    const usoGpu = interpolar(corte, datos.uso_gpu, "uso_gpu", valores);
+    const temperatura = interpolar(corte, datos.temperatura, "temperatura", valores);
+    return "El Uso de GPU es " + etiquetar(usoGpu, corte.umbrales_uso_gpu, corte.etiquetas_uso_gpu) +
+      " (~" + usoGpu.toFixed(1) + "%) y la Temperatura es " +
+      etiquetar(temperatura, corte.umbrales_temperatura, corte.etiquetas_temperatura) +
+      " (~" + temperatura.toFixed(1) + "°C)";
+  };
+})();
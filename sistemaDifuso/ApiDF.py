@@ -0,0 +1,119 @@
+import asyncio
+import json
+import math
+
+import numpy as np
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from .MetricasDF import metricas
+from .SistemaDF import SistemaDifusoTarjetasGraficas
+
+# Máximo de entradas aceptadas por solicitud en /api/predicciones
+MAXIMO_LOTE = 10000
+
+
+def valores_entrada(sistema, datos):
+    """Convierte un objeto JSON de entrada en [resolucion, configuracion, fps_objetivo, potencia_gpu].
+
+    La resolución puede ser un nombre del catálogo, un texto "W×H" o un número del universo;
+    el resto, números.
+    """
+    if not isinstance(datos, dict):
+        raise ValueError("Cada entrada debe ser un objeto JSON")
+    valores = []
+    for nombre in SistemaDifusoTarjetasGraficas.ENTRADAS:
+        if nombre not in datos:
+            raise ValueError(f"Falta el campo '{nombre}'")
+        valor = datos[nombre]
+        if nombre == 'resolucion' and isinstance(valor, str):
+            valor = sistema.obtener_valor_resolucion(valor)
+        if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+            raise ValueError(f"El campo '{nombre}' debe ser un número finito")
+        # Un entero JSON demasiado grande no cabe en un float (OverflowError)
+        try:
+            valor = float(valor)
+        except (OverflowError, ValueError, TypeError):
+            raise ValueError(f"El campo '{nombre}' debe ser un número finito") from None
+        if not math.isfinite(valor):
+            raise ValueError(f"El campo '{nombre}' debe ser un número finito")
+        valores.append(valor)
+    return valores
+
+
+def evaluar_entradas(sistema, entradas, activaciones=False):
+    """Evalúa una lista de objetos JSON de entrada por el camino vectorizado y sin estado.
+
+    Retorna una lista de diccionarios con los valores crisp, sus etiquetas y, si se piden,
+    las pertenencias de cada antecedente.
+    """
+    matriz = np.array([valores_entrada(sistema, datos) for datos in entradas], dtype=np.float64).reshape(-1, 4)
+    lote = sistema.obtener_predicciones_lote(matriz)
+    resultados = [
+        {
+            'uso_gpu': uso_gpu,
+            'temperatura': temperatura,
+            'uso_gpu_etiqueta': sistema.uso_labels[codigo_uso],
+            'temperatura_etiqueta': sistema.temp_labels[codigo_temperatura],
+        }
+        for uso_gpu, temperatura, codigo_uso, codigo_temperatura in zip(
+            lote['uso_gpu'].tolist(), lote['temperatura'].tolist(),
+            lote['uso_gpu_codigo'].tolist(), lote['temperatura_codigo'].tolist(),
+        )
+    ]
+    if activaciones:
+        grados = sistema.obtener_activaciones_lote(matriz)
+        for i, resultado in enumerate(resultados):
+            resultado['activaciones'] = {
+                nombre: {etiqueta: float(valores[i]) for etiqueta, valores in por_etiqueta.items()}
+                for nombre, por_etiqueta in grados.items()
+            }
+    return resultados
+
+
+def crear_rutas(obtener_sistema, ejecutor=None):
+    """Rutas POST /api/prediccion y /api/predicciones para montar en el backend de la app.
+
+    obtener_sistema: función que retorna la instancia compartida de SistemaDifusoTarjetasGraficas.
+    ejecutor: ejecutor donde se evalúa, para no bloquear el event loop (None usa el por defecto).
+    """
+    async def _leer_json(request):
+        try:
+            return await request.json()
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise ValueError("El cuerpo de la solicitud no es JSON válido") from None
+
+    async def _evaluar(entradas, activaciones):
+        return await asyncio.get_running_loop().run_in_executor(
+            ejecutor, lambda: evaluar_entradas(obtener_sistema(), entradas, activaciones))
+
+    async def prediccion(request):
+        """Predicción de una entrada: {"resolucion": ..., "configuracion": ..., ..., "activaciones": false}."""
+        with metricas.en_curso('api'), metricas.medir('solicitud_api'):
+            try:
+                datos = await _leer_json(request)
+                activaciones = bool(datos.get('activaciones', False)) if isinstance(datos, dict) else False
+                resultado, = await _evaluar([datos], activaciones)
+            except ValueError as e:
+                return JSONResponse({'error': str(e)}, status_code=400)
+            return JSONResponse(resultado)
+
+    async def predicciones(request):
+        """Predicción de un lote: {"entradas": [{...}, ...], "activaciones": false}."""
+        with metricas.en_curso('api'), metricas.medir('solicitud_api'):
+            try:
+                datos = await _leer_json(request)
+                if not isinstance(datos, dict) or not isinstance(datos.get('entradas'), list):
+                    raise ValueError("Se esperaba un objeto con la lista 'entradas'")
+                if len(datos['entradas']) > MAXIMO_LOTE:
+                    return JSONResponse({'error': f"El lote supera el máximo de {MAXIMO_LOTE} entradas"},
+                                        status_code=413)
+                resultados = await _evaluar(datos['entradas'], bool(datos.get('activaciones', False)))
+            except ValueError as e:
+                return JSONResponse({'error': str(e)}, status_code=400)
+            return JSONResponse({'resultados': resultados})
+
+    return [
+        Route('/api/prediccion', prediccion, methods=['POST']),
+        Route('/api/predicciones', predicciones, methods=['POST']),
+    ]
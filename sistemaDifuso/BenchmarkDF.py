@@ -0,0 +1,287 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import resource
+import sys
+import threading
+import time
+
+import numpy as np
+import skfuzzy
+
+from .GraficosDF import renderizar_consecuente
+from .ResultadoDF import ResultadoPrediccion
+from .SistemaDF import SistemaDifusoTarjetasGraficas
+
+# Entrada fija usada para medir las etapas de una predicción individual
+ENTRADA_REFERENCIA = {'resolucion': 55, 'configuracion': 50, 'fps_objetivo': 90, 'potencia_gpu': 60}
+
+
+def _cronometrar(funcion, repeticiones):
+    """Ejecuta la función varias veces y retorna el mejor tiempo y la mediana en segundos."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return {'mejor_s': min(tiempos), 'mediana_s': float(np.median(tiempos)), 'repeticiones': repeticiones}
+
+
+def entradas_aleatorias(sistema, n, semilla=0):
+    """Lote (n x 4) de entradas aleatorias dentro de los universos, con resoluciones del catálogo."""
+    rng = np.random.default_rng(semilla)
+    return np.column_stack([
+        rng.choice(list(sistema.resoluciones.values()), n),
+        rng.uniform(sistema.configuracion_universe[0], sistema.configuracion_universe[-1], n),
+        rng.uniform(sistema.fps_objetivo_universe[0], sistema.fps_objetivo_universe[-1], n),
+        rng.uniform(sistema.potencia_gpu_universe[0], sistema.potencia_gpu_universe[-1], n),
+    ])
+
+
+def benchmark_construccion(ruta_compilado=None, repeticiones=1):
+    """Tiempo de SistemaDifusoTarjetasGraficas(): en frío y, si se indica, desde el artefacto compilado."""
+    resultado = {'en_frio': _cronometrar(SistemaDifusoTarjetasGraficas, repeticiones)}
+    if ruta_compilado is not None:
+        # La primera construcción genera el artefacto si no existe
+        SistemaDifusoTarjetasGraficas(ruta_compilado=ruta_compilado)
+        resultado['compilado'] = _cronometrar(
+            lambda: SistemaDifusoTarjetasGraficas(ruta_compilado=ruta_compilado), repeticiones)
+    return resultado
+
+
+def benchmark_etapas(sistema, repeticiones=5):
+    """Tiempo de cada etapa de obtener_prediccion con el simulador de skfuzzy."""
+    entrada = ENTRADA_REFERENCIA
+    simulador = sistema.simulador
+    sistema._simular(simulador, entrada)
+
+    def renders():
+        renderizar_consecuente(sistema.uso_gpu, simulador)
+        renderizar_consecuente(sistema.temperatura, simulador)
+
+    def interp_membership():
+        # Las 16 pertenencias de las entradas una por una, como las calculaba el código original
+        for nombre in sistema.ENTRADAS:
+            variable = getattr(sistema, nombre)
+            for termino in variable.terms.values():
+                skfuzzy.interp_membership(variable.universe, termino.mf, entrada[nombre])
+
+    # El texto se guarda en el resultado: cada repetición parte de una copia sin texto
+    resultado = sistema._evaluar(entrada)
+
+    def texto_activaciones():
+        ResultadoPrediccion(sistema, resultado.uso_gpu, resultado.temperatura,
+                            resultado.activaciones, resultado.fuerza_reglas).texto_activaciones()
+
+    return {
+        'generar_reglas': _cronometrar(sistema._generar_reglas, repeticiones),
+        'compute': _cronometrar(lambda: sistema._simular(simulador, entrada), repeticiones),
+        'renders_view_savefig': _cronometrar(renders, repeticiones),
+        'interp_membership_x16': _cronometrar(interp_membership, repeticiones),
+        'texto_activaciones': _cronometrar(texto_activaciones, repeticiones),
+    }
+
+
+def benchmark_graficos(sistema, repeticiones=20):
+    """Tiempo por gráfico de view() + savefig frente a RenderizadorPertenencias, en PNG y SVG.
+
+    Ambos caminos parten de la predicción ya calculada: view() con el simulador de skfuzzy
+    ya simulado y el renderizador con el ResultadoPrediccion de la misma entrada.
+    """
+    entrada = ENTRADA_REFERENCIA
+    simulador = sistema.simulador
+    sistema._simular(simulador, entrada)
+    resultado = sistema._evaluar(entrada)
+    activaciones = resultado.activaciones_salidas()
+
+    resultados = {}
+    for formato in ('png', 'svg'):
+        renderizador = sistema._renderizador('uso_gpu')
+        # El primer gráfico de cada formato dibuja el fondo
+        inicio = time.perf_counter()
+        renderizador.renderizar(activaciones['uso_gpu'], resultado.uso_gpu, formato)
+        primero = time.perf_counter() - inicio
+
+        view = _cronometrar(lambda: renderizar_consecuente(sistema.uso_gpu, simulador, formato), repeticiones)
+        fondo = _cronometrar(
+            lambda: renderizador.renderizar(activaciones['uso_gpu'], resultado.uso_gpu, formato), repeticiones)
+        resultados[formato] = {
+            'view_savefig': view,
+            'fondo_precalculado': fondo,
+            'primer_grafico_s': primero,
+            'aceleracion': view['mediana_s'] / fondo['mediana_s'],
+        }
+    return resultados
+
+
+def benchmark_concurrencia(sistema, concurrencias=(1, 4, 16), duracion=5.0, semilla=0):
+    """Predicciones por segundo con varios hilos llamando a obtener_prediccion durante `duracion` s."""
+    entradas = [dict(zip(('resolucion', 'configuracion', 'fps_objetivo', 'potencia_gpu'), fila))
+                for fila in entradas_aleatorias(sistema, 4096, semilla).tolist()]
+    resultados = []
+    for hilos in concurrencias:
+        completadas = [0] * hilos
+        latencias = [[] for _ in range(hilos)]
+        limite = time.perf_counter() + duracion
+
+        def trabajador(k):
+            i = k
+            while time.perf_counter() < limite:
+                inicio = time.perf_counter()
+                sistema.obtener_prediccion(entradas[i % len(entradas)])
+                latencias[k].append(time.perf_counter() - inicio)
+                completadas[k] += 1
+                i += hilos
+
+        inicio = time.perf_counter()
+        trabajadores = [threading.Thread(target=trabajador, args=(k,)) for k in range(hilos)]
+        for t in trabajadores:
+            t.start()
+        for t in trabajadores:
+            t.join()
+        transcurrido = time.perf_counter() - inicio
+
+        todas = np.concatenate([np.asarray(l) for l in latencias]) if sum(completadas) else np.zeros(1)
+        resultados.append({
+            'hilos': hilos,
+            'predicciones': sum(completadas),
+            'por_segundo': sum(completadas) / transcurrido,
+            'latencia_p50_s': float(np.percentile(todas, 50)),
+            'latencia_p95_s': float(np.percentile(todas, 95)),
+        })
+    return resultados
+
+
+def benchmark_reglas_activas(sistema, tamanos=(1, 1000, 20000), repeticiones=5):
+    """Compara la evaluación de las 256 reglas frente a la indexación de las reglas activas."""
+    motor = sistema.motor_vectorizado
+    resultados = []
+    for n in tamanos:
+        grados = motor.fuzzificar(entradas_aleatorias(sistema, n))
+        todas = _cronometrar(lambda: motor.acumular(motor.activar_reglas(grados)), repeticiones)
+        activas = _cronometrar(lambda: motor.acumular_activas(*motor.activar_reglas_activas(grados)), repeticiones)
+        resultados.append({
+            'n': n,
+            'todas_256': todas,
+            'solo_activas': activas,
+            'aceleracion': todas['mejor_s'] / activas['mejor_s'],
+        })
+    return resultados
+
+
+def benchmark_incremental(sistema, pasos=200, repeticiones=5):
+    """Latencia de mover un slider (una entrada a la vez) con SesionIncremental frente a recalcular todo.
+
+    Por cada entrada de los sliders recorre `pasos` valores del universo partiendo de ENTRADA_REFERENCIA;
+    el recálculo completo es _evaluar con el motor vectorizado, el mismo que usa la sesión (con
+    skfuzzy cada paso tardaría más de un segundo). Incluye la diferencia máxima entre ambos.
+    """
+    if sistema.motor != 'vectorizado':
+        raise ValueError("benchmark_incremental compara contra el motor 'vectorizado'")
+    resultados = {}
+    for nombre in ('configuracion', 'fps_objetivo', 'potencia_gpu'):
+        universo = getattr(sistema, nombre + '_universe')
+        recorrido = [dict(ENTRADA_REFERENCIA, **{nombre: float(x)})
+                     for x in np.linspace(universo[0], universo[-1], pasos)]
+
+        def incremental():
+            sesion = sistema.crear_sesion()
+            return [sesion.evaluar(entrada) for entrada in recorrido]
+
+        def completo():
+            return [sistema._evaluar(entrada) for entrada in recorrido]
+
+        diferencia = max(
+            max(abs(a.uso_gpu - b.uso_gpu), abs(a.temperatura - b.temperatura))
+            for a, b in zip(incremental(), completo())
+        )
+        tiempo_incremental = _cronometrar(incremental, repeticiones)
+        tiempo_completo = _cronometrar(completo, repeticiones)
+        resultados[nombre] = {
+            'pasos': pasos,
+            'incremental_por_paso_s': tiempo_incremental['mejor_s'] / pasos,
+            'completo_por_paso_s': tiempo_completo['mejor_s'] / pasos,
+            'aceleracion': tiempo_completo['mejor_s'] / tiempo_incremental['mejor_s'],
+            'diferencia_maxima': float(diferencia),
+        }
+    return resultados
+
+
+def rss_pico_mb():
+    """Memoria residente máxima del proceso en MB."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa en KB y macOS en bytes
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def ejecutar(motores=('skfuzzy', 'vectorizado'), ruta_compilado=None, ruta_tabla=None,
+             repeticiones=5, duracion=5.0, concurrencias=(1, 4, 16), medir_construccion=True):
+    """Ejecuta la suite completa y retorna un diccionario serializable a JSON."""
+    resultado = {
+        'entorno': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'skfuzzy': skfuzzy.__version__,
+            'plataforma': platform.platform(),
+            'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+    }
+    # obtener_prediccion imprime cada resultado; se descarta para no mezclarlo con el JSON
+    with contextlib.redirect_stdout(io.StringIO()):
+        if medir_construccion:
+            resultado['construccion'] = benchmark_construccion(ruta_compilado)
+
+        sistema = SistemaDifusoTarjetasGraficas(ruta_compilado=ruta_compilado)
+        resultado['etapas'] = benchmark_etapas(sistema, repeticiones)
+        resultado['reglas_activas'] = benchmark_reglas_activas(sistema, repeticiones=repeticiones)
+        resultado['graficos'] = benchmark_graficos(sistema)
+        resultado['incremental'] = benchmark_incremental(SistemaDifusoTarjetasGraficas(
+            motor='vectorizado', ruta_compilado=ruta_compilado, tamano_cache=0), repeticiones=repeticiones)
+
+        resultado['concurrencia'] = {}
+        for motor in motores:
+            sistema = SistemaDifusoTarjetasGraficas(
+                motor=motor, ruta_compilado=ruta_compilado, ruta_tabla=ruta_tabla,
+                tamano_cache=0, tamano_pool=max(concurrencias) if motor == 'skfuzzy' else 0,
+            )
+            resultado['concurrencia'][motor] = benchmark_concurrencia(sistema, concurrencias, duracion)
+
+    resultado['rss_pico_mb'] = rss_pico_mb()
+    return resultado
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del sistema difuso (salida JSON).")
+    parser.add_argument('--motores', default='skfuzzy,vectorizado',
+                        help="Motores a comparar en la prueba de concurrencia, separados por comas")
+    parser.add_argument('--ruta-compilado', default=None, help="Artefacto del sistema compilado a reutilizar")
+    parser.add_argument('--ruta-tabla', default=None, help="Tabla precompilada para el motor 'tabla'")
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--duracion', type=float, default=5.0, help="Segundos por nivel de concurrencia")
+    parser.add_argument('--concurrencias', default='1,4,16')
+    parser.add_argument('--sin-construccion', action='store_true',
+                        help="No medir la construcción en frío (tarda más de un minuto)")
+    parser.add_argument('--salida', default=None, help="Archivo JSON de salida (por defecto, stdout)")
+    args = parser.parse_args(argv)
+
+    resultado = ejecutar(
+        motores=tuple(args.motores.split(',')),
+        ruta_compilado=args.ruta_compilado,
+        ruta_tabla=args.ruta_tabla,
+        repeticiones=args.repeticiones,
+        duracion=args.duracion,
+        concurrencias=tuple(int(c) for c in args.concurrencias.split(',')),
+        medir_construccion=not args.sin_construccion,
+    )
+    texto = json.dumps(resultado, indent=2)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            f.write(texto + '\n')
+    else:
+        print(texto)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,218 @@
+import numbers
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """Caché acotada con desalojo LRU y estadísticas de uso, segura entre hilos."""
+
+    def __init__(self, tamano_maximo=1024):
+        if tamano_maximo <= 0:
+            raise ValueError("El tamaño máximo de la caché debe ser positivo")
+        self.tamano_maximo = tamano_maximo
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def obtener(self, clave, defecto=None):
+        """Retorna el valor cacheado (marcándolo como el más reciente) o el valor por defecto."""
+        with self._lock:
+            try:
+                valor = self._datos[clave]
+            except KeyError:
+                self.fallos += 1
+                return defecto
+            self._datos.move_to_end(clave)
+            self.aciertos += 1
+            return valor
+
+    def guardar(self, clave, valor):
+        """Guarda un valor, desalojando el menos usado recientemente si se supera el tamaño máximo."""
+        with self._lock:
+            self._datos[clave] = valor
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.tamano_maximo:
+                self._datos.popitem(last=False)
+                self.desalojos += 1
+
+    def limpiar(self):
+        """Vacía la caché sin reiniciar los contadores."""
+        with self._lock:
+            self._datos.clear()
+
+    def __len__(self):
+        return len(self._datos)
+
+    def estadisticas(self):
+        """Retorna aciertos, fallos, desalojos, tamaño actual y tasa de aciertos."""
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'desalojos': self.desalojos,
+                'tamano': len(self._datos),
+                'tamano_maximo': self.tamano_maximo,
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+            }
+
+
+class CacheRedis:
+    """Nivel de caché compartido entre workers en Redis, con valores en bytes y expiración (TTL).
+
+    Si Redis no responde, la operación cuenta como fallo y el nivel se desactiva durante
+    espera_reintento segundos: las predicciones siguen con la caché local sin esperar timeouts.
+    """
+
+    def __init__(self, url='redis://localhost:6379/0', prefijo='sistema_difuso', ttl=3600, timeout=0.05,
+                 espera_reintento=30.0, cliente=None):
+        """
+        url: dirección del servidor (se ignora si se pasa cliente).
+        prefijo: prefijo común de las claves en Redis.
+        ttl: segundos de vida de cada entrada (None no expira).
+        timeout: segundos máximos de conexión y de cada operación.
+        espera_reintento: segundos sin consultar Redis después de un error.
+        cliente: cliente redis.Redis ya construido (opcional).
+        """
+        import redis
+        self._errores_redis = redis.RedisError
+        self.cliente = cliente if cliente is not None else redis.Redis.from_url(
+            url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        self.prefijo = prefijo
+        self.ttl = ttl
+        self.espera_reintento = espera_reintento
+        self._lock = threading.Lock()
+        self._desactivado_hasta = 0.0
+        self.aciertos = 0
+        self.fallos = 0
+        self.escrituras = 0
+        self.errores = 0
+        self.omitidas = 0
+
+    @property
+    def disponible(self):
+        return time.monotonic() >= self._desactivado_hasta
+
+    def _ejecutar(self, operacion):
+        """Ejecuta la operación sobre el cliente; retorna None si Redis está desactivado o falla."""
+        if not self.disponible:
+            with self._lock:
+                self.omitidas += 1
+            return None
+        try:
+            return operacion(self.cliente)
+        except self._errores_redis:
+            with self._lock:
+                self.errores += 1
+                self._desactivado_hasta = time.monotonic() + self.espera_reintento
+            return None
+
+    def obtener(self, clave):
+        """Retorna los bytes guardados para la clave o None."""
+        datos = self._ejecutar(lambda cliente: cliente.get(f"{self.prefijo}:{clave}"))
+        with self._lock:
+            if datos is None:
+                self.fallos += 1
+            else:
+                self.aciertos += 1
+        return datos
+
+    def guardar(self, clave, datos):
+        """Guarda los bytes con el TTL configurado."""
+        if self._ejecutar(lambda cliente: cliente.set(f"{self.prefijo}:{clave}", datos, ex=self.ttl)) is not None:
+            with self._lock:
+                self.escrituras += 1
+
+    def limpiar(self, prefijo_clave=''):
+        """Borra las claves que empiezan con prefijo_clave (todas las de este prefijo si se omite)."""
+        def borrar(cliente):
+            claves = list(cliente.scan_iter(match=f"{self.prefijo}:{prefijo_clave}*", count=1000))
+            for inicio in range(0, len(claves), 1000):
+                cliente.delete(*claves[inicio:inicio + 1000])
+            return len(claves)
+        self._ejecutar(borrar)
+
+    def estadisticas(self):
+        """Retorna aciertos, fallos, escrituras, errores, consultas omitidas y disponibilidad."""
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'escrituras': self.escrituras,
+                'errores': self.errores,
+                'omitidas': self.omitidas,
+                'disponible': int(self.disponible),
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+            }
+
+
+class CacheDosNiveles:
+    """CacheLRU local delante de un nivel compartido (CacheRedis), con la misma interfaz que CacheLRU.
+
+    Las claves del nivel compartido incluyen un espacio (predicciones, gráficos, ...) y la versión
+    que retorna version(), de modo que al cambiar la base de reglas los workers dejan de leer
+    las entradas anteriores sin borrarlas: expiran por TTL. Los valores se guardan como bytes
+    con serializar(valor) y se reconstruyen con deserializar(datos); un valor que no se puede
+    reconstruir cuenta como fallo.
+    """
+
+    def __init__(self, local, remoto, espacio, version, serializar, deserializar):
+        self.local = local
+        self.remoto = remoto
+        self.espacio = espacio
+        self.version = version
+        self.serializar = serializar
+        self.deserializar = deserializar
+
+    def _clave_remota(self, clave):
+        """Clave del nivel compartido: los números se escriben como float, así 1, 1.0 y np.float64(1)
+        dan la misma entrada en todos los workers (como en la caché local); el resto, con str."""
+        partes = clave if isinstance(clave, tuple) else (clave,)
+        texto = ':'.join(repr(float(v)) if isinstance(v, numbers.Real) else str(v) for v in partes)
+        return f"{self.version()}:{self.espacio}:{texto}"
+
+    def obtener(self, clave, defecto=None):
+        """Busca en la caché local y luego en la compartida; un acierto remoto se copia a la local."""
+        valor = self.local.obtener(clave)
+        if valor is not None:
+            return valor
+        datos = self.remoto.obtener(self._clave_remota(clave))
+        if datos is None:
+            return defecto
+        try:
+            valor = self.deserializar(datos)
+        except ValueError:
+            return defecto
+        self.local.guardar(clave, valor)
+        return valor
+
+    def guardar(self, clave, valor):
+        """Guarda en ambos niveles."""
+        self.local.guardar(clave, valor)
+        self.remoto.guardar(self._clave_remota(clave), self.serializar(valor))
+
+    def limpiar(self):
+        """Vacía la caché local y, en la compartida, las entradas de este espacio con la versión actual.
+
+        Las de otras versiones ya no se consultan y expiran por TTL; las de la versión actual pueden
+        venir de otro worker que publicó las mismas reglas mientras este aún recargaba.
+        """
+        self.local.limpiar()
+        self.remoto.limpiar(f"{self.version()}:{self.espacio}:")
+
+    def __len__(self):
+        return len(self.local)
+
+    @property
+    def tamano_maximo(self):
+        return self.local.tamano_maximo
+
+    def estadisticas(self):
+        """Estadísticas de la caché local más las del nivel compartido con prefijo remoto_."""
+        estadisticas = self.local.estadisticas()
+        estadisticas.update({'remoto_' + campo: valor for campo, valor in self.remoto.estadisticas().items()})
+        return estadisticas
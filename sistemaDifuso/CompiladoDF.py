@@ -0,0 +1,83 @@
+import hashlib
+import os
+import pickle
+import stat
+import tempfile
+
+import skfuzzy
+
+# Cambiar si se modifica el contenido del artefacto
+VERSION_FORMATO = 1
+
+# Objetos de skfuzzy que forman el sistema compilado; se guardan juntos para conservar
+# las referencias compartidas entre el simulador, las reglas y las variables
+ATRIBUTOS_COMPILADOS = (
+    'resolucion', 'configuracion', 'fps_objetivo', 'potencia_gpu',
+    'uso_gpu', 'temperatura', 'rules', 'simulador',
+)
+
+
+def ruta_compilado_predeterminada():
+    """Ruta del artefacto en la caché privada del usuario ($XDG_CACHE_HOME o ~/.cache), no en el temporal compartido."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'sistema_difuso', 'sistema_difuso_compilado.pkl')
+
+
+def huella_sistema(sistema):
+    """Hash de las etiquetas, universos, funciones de pertenencia y consecuentes de las reglas."""
+    h = hashlib.sha256()
+    h.update(f"{VERSION_FORMATO}|{skfuzzy.__version__}".encode())
+    for nombre in ('resolucion', 'configuracion', 'fps_objetivo', 'potencia_gpu', 'uso_gpu', 'temperatura'):
+        variable = getattr(sistema, nombre)
+        h.update(nombre.encode())
+        h.update(variable.universe.tobytes())
+        for etiqueta, termino in variable.terms.items():
+            h.update(etiqueta.encode())
+            h.update(termino.mf.tobytes())
+    for regla in sistema.reglas_detalladas:
+        h.update(repr((regla['entradas'], regla['salidas'])).encode())
+    return h.hexdigest()
+
+
+def guardar_compilado(sistema, ruta, huella):
+    """Guarda el sistema compilado de forma atómica (varios workers pueden escribir a la vez)."""
+    datos = {'huella': huella}
+    datos.update({nombre: getattr(sistema, nombre) for nombre in ATRIBUTOS_COMPILADOS})
+
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    # Solo el usuario puede escribir en el directorio que crea (mkstemp ya crea el archivo con 0600)
+    os.makedirs(directorio, mode=0o700, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            pickle.dump(datos, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.unlink(temporal)
+        raise
+
+
+def cargar_compilado(ruta, huella):
+    """Carga el sistema compilado si existe y corresponde a la huella dada; si no, retorna None.
+
+    El archivo se deserializa con pickle, que puede ejecutar código: antes de leerlo se comprueba
+    que pertenezca al usuario del proceso y que nadie más pueda escribirlo; si no, se ignora.
+    """
+    try:
+        with open(ruta, 'rb') as f:
+            if not _es_privado(os.fstat(f.fileno())):
+                return None
+            datos = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if datos.get('huella') != huella:
+        return None
+    return datos
+
+
+def _es_privado(estado):
+    """Archivo del usuario del proceso y sin permiso de escritura para el grupo ni para otros."""
+    if not hasattr(os, 'geteuid'):
+        # Sin dueños POSIX (Windows) no hay nada que comprobar
+        return True
+    return estado.st_uid == os.geteuid() and not estado.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
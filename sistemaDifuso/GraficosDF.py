@@ -0,0 +1,246 @@
+import io
+import struct
+import threading
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import to_hex
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.patches import Polygon
+from PIL import Image
+from skfuzzy.control.visualization import FuzzyVariableVisualizer
+
+# Formatos de imagen admitidos por renderizar_consecuente
+FORMATOS = ('png', 'svg')
+
+# pyplot mantiene estado global, así que los renderizados se serializan
+_lock_render = threading.Lock()
+
+
+def renderizar_consecuente(consecuente, simulador, formato='png'):
+    """Dibuja un consecuente con la salida agregada del simulador y retorna los bytes de la imagen."""
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de gráfico no soportado: {formato}. Opciones: {', '.join(FORMATOS)}")
+    with _lock_render:
+        fig, _ = FuzzyVariableVisualizer(consecuente).view(sim=simulador)
+        buffer = io.BytesIO()
+        try:
+            fig.savefig(buffer, format=formato)
+        finally:
+            plt.close(fig)
+    return buffer.getvalue()
+
+
+class RenderizadorPertenencias:
+    """Gráfico de una variable de salida que dibuja el fondo estático una sola vez y lo reutiliza.
+
+    El fondo (funciones de pertenencia, leyenda y ejes, con el mismo aspecto que
+    FuzzyVariableVisualizer.view) se dibuja en la primera solicitud de cada formato. Después,
+    cada gráfico solo agrega las regiones recortadas y la línea del valor crisp, debajo de la
+    leyenda: en PNG se restaura el fondo rasterizado, se dibujan solo esos elementos y se
+    compone encima la leyenda precalculada; en SVG se insertan como trazados en el documento
+    del fondo ya serializado.
+    """
+
+    def __init__(self, nombre, universo, funciones):
+        """
+        nombre: nombre de la variable (etiqueta del eje x).
+        universo: universo de la variable.
+        funciones: diccionario {etiqueta: función de pertenencia sobre el universo}, en orden de leyenda.
+        """
+        self.nombre = nombre
+        self.universo = np.asarray(universo, dtype=np.float64)
+        self.etiquetas = list(funciones)
+        self.funciones = np.vstack([np.asarray(funciones[e], dtype=np.float64) for e in self.etiquetas])
+        self._lock = threading.Lock()
+        self._fondos = {}
+
+    def _crear_figura(self, dpi):
+        """Figura con el fondo estático; no usa pyplot, así que no comparte estado global."""
+        fig = Figure(dpi=dpi)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        ax.set_ylim([0, 1.01])
+        ax.set_xlim([self.universo.min(), self.universo.max()])
+        colores = [ax.plot(self.universo, mf, label=etiqueta, linewidth=1)[0].get_color()
+                   for etiqueta, mf in zip(self.etiquetas, self.funciones)]
+        ax.legend(framealpha=0.5)
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.get_xaxis().tick_bottom()
+        ax.get_yaxis().tick_left()
+        ax.tick_params(direction='out')
+        ax.set_ylabel('Membership')
+        ax.set_xlabel(self.nombre)
+        return fig, ax, colores
+
+    def _superposicion(self, activaciones, valor):
+        """Polígonos (etiqueta, x, y) de cada función recortada y segmento (x, altura) del valor crisp.
+
+        Reproduce CrispValueCalculator.find_memberships: el universo se completa con los puntos
+        donde cada función cruza su nivel de corte.
+        """
+        activaciones = np.asarray(activaciones, dtype=np.float64)
+        x, mfs = self.universo, self.funciones
+        cruces = [x]
+        for mf, h in zip(mfs, activaciones):
+            d = mf - h
+            i = np.flatnonzero(d[:-1] * d[1:] < 0)
+            cruces.append(x[i] + (h - mf[i]) * (x[i + 1] - x[i]) / (mf[i + 1] - mf[i]))
+        universo = np.unique(np.concatenate(cruces))
+        recortadas = np.minimum(activaciones[:, None], np.stack([np.interp(universo, x, mf) for mf in mfs]))
+        poligonos = [(j, universo, recortadas[j]) for j in range(len(mfs)) if activaciones[j] > 0]
+
+        segmento = None
+        if poligonos:
+            activas = activaciones > 0
+            altura = max(float(np.interp(valor, x, mf)) for mf in mfs[activas])
+            # Como en view(): los cortes pequeños se ven mal, se dibuja a altura 1
+            segmento = (float(valor), altura if altura >= 0.1 else 1.0)
+        return poligonos, segmento
+
+    def _fondo_png(self):
+        fig, ax, colores = self._crear_figura(dpi=matplotlib.rcParams['figure.dpi'])
+        # Las superposiciones no se agregan a los ejes para que no cambien la posición de la leyenda
+        regiones = [Polygon(np.zeros((1, 2)), closed=True, facecolor=c, edgecolor='none', alpha=0.4,
+                            transform=ax.transData, figure=fig) for c in colores]
+        linea = Line2D([], [], color='k', lw=3, transform=ax.transData, figure=fig)
+        # La leyenda queda fuera del fondo: se compone encima de las superposiciones en cada gráfico
+        leyenda = ax.get_legend()
+        leyenda.set_animated(True)
+        fig.canvas.draw()
+        fondo = fig.canvas.copy_from_bbox(fig.bbox)
+
+        # Capa de la leyenda (color premultiplicado y transmitancia), dibujándola sobre negro y sobre blanco
+        pixeles = np.asarray(fig.canvas.buffer_rgba())
+        x0, y0, x1, y1 = leyenda.get_window_extent().padded(2).extents
+        alto = pixeles.shape[0]
+        recuadro = (slice(max(int(alto - y1), 0), int(np.ceil(alto - y0))),
+                    slice(max(int(x0), 0), int(np.ceil(x1))))
+        capas = []
+        for color in (0, 255):
+            pixeles[recuadro][..., :3] = color
+            ax.draw_artist(leyenda)
+            capas.append(pixeles[recuadro][..., :3].astype(np.float32))
+        fig.canvas.restore_region(fondo)
+        return {'figura': fig, 'ejes': ax, 'regiones': regiones, 'linea': linea, 'fondo': fondo,
+                'recuadro_leyenda': recuadro, 'color_leyenda': capas[0],
+                'transmitancia_leyenda': (capas[1] - capas[0]) / 255}
+
+    def _fondo_svg(self):
+        # El backend SVG trabaja en puntos (72 por pulgada)
+        fig, ax, colores = self._crear_figura(dpi=72)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='svg')
+        documento = buffer.getvalue().decode()
+        corte = documento.index('<g id="legend_1">')
+        return {'ejes': ax, 'colores': [to_hex(c) for c in colores], 'alto': fig.bbox.height,
+                'inicio': documento[:corte], 'fin': documento[corte:]}
+
+    def renderizar(self, activaciones, valor, formato='png'):
+        """Bytes de la imagen con la salida agregada.
+
+        activaciones: nivel de corte de cada etiqueta, en el orden de `funciones`.
+        valor: valor crisp de la salida.
+        """
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato de gráfico no soportado: {formato}. Opciones: {', '.join(FORMATOS)}")
+        poligonos, segmento = self._superposicion(activaciones, valor)
+        with self._lock:
+            if formato not in self._fondos:
+                self._fondos[formato] = self._fondo_png() if formato == 'png' else self._fondo_svg()
+            fondo = self._fondos[formato]
+            if formato == 'svg':
+                return self._renderizar_svg(fondo, poligonos, segmento)
+            return self._renderizar_png(fondo, poligonos, segmento)
+
+    @staticmethod
+    def _renderizar_png(fondo, poligonos, segmento):
+        fig, ax = fondo['figura'], fondo['ejes']
+        fig.canvas.restore_region(fondo['fondo'])
+        for j, x, y in poligonos:
+            region = fondo['regiones'][j]
+            region.set_xy(np.column_stack([np.concatenate([x, x[::-1]]),
+                                           np.concatenate([y, np.zeros_like(y)])]))
+            ax.draw_artist(region)
+        if segmento is not None:
+            fondo['linea'].set_data([segmento[0]] * 2, [0, segmento[1]])
+            ax.draw_artist(fondo['linea'])
+        pixeles = np.asarray(fig.canvas.buffer_rgba())
+        debajo = pixeles[fondo['recuadro_leyenda']][..., :3]
+        debajo[...] = np.round(fondo['color_leyenda'] + fondo['transmitancia_leyenda'] * debajo)
+        buffer = io.BytesIO()
+        # El fondo es opaco: se codifica en RGB con compresión rápida
+        Image.fromarray(pixeles[..., :3]).save(buffer, format='png', compress_level=1)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _renderizar_svg(fondo, poligonos, segmento):
+        transformar = fondo['ejes'].transData.transform
+        alto = fondo['alto']
+
+        def trazado(puntos):
+            puntos = transformar(puntos)
+            return ' '.join(f"{'M' if i == 0 else 'L'} {px:.6g} {alto - py:.6g}" for i, (px, py) in enumerate(puntos))
+
+        elementos = []
+        for j, x, y in poligonos:
+            contorno = np.column_stack([np.concatenate([x, x[::-1]]), np.concatenate([y, np.zeros_like(y)])])
+            elementos.append(f'<path d="{trazado(contorno)} z" '
+                             f'style="fill: {fondo["colores"][j]}; fill-opacity: 0.4"/>')
+        if segmento is not None:
+            elementos.append(f'<path d="{trazado([(segmento[0], 0), segmento])}" '
+                             'style="fill: none; stroke: #000000; stroke-width: 3; stroke-linecap: square"/>')
+        return (fondo['inicio'] + '<g id="superposicion">' + ''.join(elementos) + '</g>\n   ' + fondo['fin']).encode()
+
+
+def renderizar_superficie(superficie, salida, formato='png'):
+    """Dibuja como mapa de calor una salida de SistemaDifusoTarjetasGraficas.obtener_superficie."""
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de gráfico no soportado: {formato}. Opciones: {', '.join(FORMATOS)}")
+    with _lock_render:
+        fig, ax = plt.subplots(figsize=(7, 5))
+        try:
+            malla = ax.pcolormesh(superficie['valores_x'], superficie['valores_y'], superficie[salida],
+                                  shading='nearest', cmap='inferno')
+            fig.colorbar(malla, ax=ax, label=salida)
+            ax.set_xlabel(superficie['eje_x'])
+            ax.set_ylabel(superficie['eje_y'])
+            ax.set_title(", ".join(f"{nombre}={valor:g}" for nombre, valor in superficie['fijos'].items()))
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format=formato, bbox_inches='tight')
+        finally:
+            plt.close(fig)
+    return buffer.getvalue()
+
+
+def serializar_graficos(graficos):
+    """Concatena los bytes de cada gráfico con su nombre y longitud, para cachés compartidas."""
+    partes = []
+    for nombre, datos in graficos.items():
+        nombre = nombre.encode()
+        partes += [struct.pack('<HI', len(nombre), len(datos)), nombre, datos]
+    return b''.join(partes)
+
+
+def deserializar_graficos(datos):
+    """Inverso de serializar_graficos; ValueError si los datos están truncados."""
+    graficos = {}
+    posicion = 0
+    try:
+        while posicion < len(datos):
+            largo_nombre, largo_datos = struct.unpack_from('<HI', datos, posicion)
+            posicion += struct.calcsize('<HI')
+            nombre = datos[posicion:posicion + largo_nombre].decode()
+            posicion += largo_nombre
+            graficos[nombre] = bytes(datos[posicion:posicion + largo_datos])
+            posicion += largo_datos
+    except (struct.error, UnicodeDecodeError):
+        raise ValueError("Gráficos serializados inválidos") from None
+    if posicion != len(datos):
+        raise ValueError("Gráficos serializados inválidos")
+    return graficos
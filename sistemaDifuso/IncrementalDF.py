@@ -0,0 +1,113 @@
+import threading
+
+import numpy as np
+
+from .MetricasDF import metricas
+from .ResultadoDF import ResultadoPrediccion
+
+
+class SesionIncremental:
+    """Evaluación incremental para una sesión que mueve una entrada a la vez (los sliders de la interfaz).
+
+    Guarda entre llamadas las pertenencias de cada antecedente y el tensor (4 x 4 x 4 x 4) de fuerza
+    de las reglas. Cuando cambia una sola entrada solo se fuzzifica esa variable y la fuerza se
+    obtiene como el mínimo entre su pertenencia y el tensor parcial de las otras tres, que se
+    conserva mientras se siga moviendo la misma variable. Si las activaciones de las salidas no
+    cambian, tampoco se vuelve a defuzzificar. Usa el motor vectorizado del sistema, así que los
+    resultados coinciden con los del motor 'vectorizado'.
+    """
+
+    def __init__(self, sistema):
+        """sistema: SistemaDifusoTarjetasGraficas compartido cuyo motor vectorizado se usa."""
+        self.sistema = sistema
+        self._lock = threading.Lock()
+        self.actualizaciones = {'completas': 0, 'incrementales': 0, 'sin_cambios': 0}
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta el estado guardado; la próxima evaluación recalcula todo."""
+        self._motor = None
+        self.entradas = None
+        self.grados = None
+        self.fuerza = None
+        self._variable_parcial = None
+        self._parcial = None
+        self._activaciones = None
+        self._salidas = None
+
+    @staticmethod
+    def _orientar(grados, k, variables):
+        """Vista de las pertenencias de la variable k a lo largo de su eje del tensor de reglas."""
+        return grados.reshape(tuple(-1 if j == k else 1 for j in range(variables)))
+
+    def evaluar(self, entrada):
+        """Evalúa la entrada reutilizando lo calculado para la anterior; retorna un ResultadoPrediccion."""
+        valores = tuple(float(entrada[nombre]) for nombre in self.sistema.ENTRADAS)
+        motor = self.sistema.motor_vectorizado
+        with self._lock:
+            # Una recarga de reglas reemplaza el motor: lo guardado ya no vale
+            if motor is not self._motor:
+                self.reiniciar()
+                self._motor = motor
+
+            if self.entradas is None:
+                cambiadas = list(range(len(valores)))
+            else:
+                cambiadas = [k for k, (antes, ahora) in enumerate(zip(self.entradas, valores)) if antes != ahora]
+
+            if not cambiadas:
+                self.actualizaciones['sin_cambios'] += 1
+            elif len(cambiadas) == 1:
+                self.actualizaciones['incrementales'] += 1
+                with metricas.medir('evaluacion_incremental'):
+                    self._actualizar_variable(cambiadas[0], valores[cambiadas[0]])
+            else:
+                self.actualizaciones['completas'] += 1
+                with metricas.medir('evaluacion_completa'):
+                    self._recalcular(valores)
+            self.entradas = valores
+            uso_gpu, temperatura = self._salidas
+            return ResultadoPrediccion(self.sistema, uso_gpu, temperatura, np.vstack(self.grados),
+                                       self.fuerza.reshape(-1))
+
+    def _recalcular(self, valores):
+        """Fuzzifica las cuatro variables y arma el tensor de fuerza completo."""
+        motor = self._motor
+        variables = len(valores)
+        self.grados = [motor.fuzzificar_variable(k, x) for k, x in enumerate(valores)]
+        fuerza = self._orientar(self.grados[0], 0, variables)
+        for k in range(1, variables):
+            fuerza = np.minimum(fuerza, self._orientar(self.grados[k], k, variables))
+        self._variable_parcial = self._parcial = None
+        self._actualizar_salidas(fuerza)
+
+    def _actualizar_variable(self, k, x):
+        """Recalcula solo la contribución de la variable k."""
+        grados_k = self._motor.fuzzificar_variable(k, x)
+        if np.array_equal(grados_k, self.grados[k]):
+            # El valor se movió dentro de una zona donde las pertenencias no cambian
+            return
+        self.grados = list(self.grados)
+        self.grados[k] = grados_k
+
+        variables = len(self.grados)
+        if self._variable_parcial != k:
+            # Mínimo de las otras variables; se reutiliza mientras se mueva la misma
+            parcial = None
+            for j in range(variables):
+                if j != k:
+                    orientado = self._orientar(self.grados[j], j, variables)
+                    parcial = orientado if parcial is None else np.minimum(parcial, orientado)
+            self._variable_parcial, self._parcial = k, parcial
+        self._actualizar_salidas(np.minimum(self._parcial, self._orientar(grados_k, k, variables)))
+
+    def _actualizar_salidas(self, fuerza):
+        """Acumula por etiqueta de salida y defuzzifica solo si las activaciones cambiaron."""
+        self.fuerza = fuerza
+        activaciones = self._motor.acumular(fuerza.reshape(1, -1))
+        if self._activaciones is not None and all(
+                np.array_equal(a, b) for a, b in zip(activaciones, self._activaciones)):
+            return
+        self._activaciones = activaciones
+        uso_gpu, temperatura = self._motor.defuzzificar_salidas(activaciones)
+        self._salidas = (uso_gpu[0], temperatura[0])
@@ -0,0 +1,104 @@
+import argparse
+import csv
+import itertools
+import sys
+import time
+
+import numpy as np
+
+from .SistemaDF import SistemaDifusoTarjetasGraficas
+
+# Columnas de salida que se agregan a cada fila de entrada
+COLUMNAS_SALIDA = ('uso_gpu', 'temperatura', 'uso_gpu_etiqueta', 'temperatura_etiqueta')
+
+
+def puntuar_bloque(sistema, filas, indices):
+    """Evalúa un bloque de filas CSV y retorna las columnas de salida como listas."""
+    columnas = list(zip(*filas))
+    entradas = np.column_stack([
+        sistema.obtener_valores_resolucion(columnas[indices['resolucion']]),
+        np.asarray(columnas[indices['configuracion']], dtype=np.float64),
+        np.asarray(columnas[indices['fps_objetivo']], dtype=np.float64),
+        np.asarray(columnas[indices['potencia_gpu']], dtype=np.float64),
+    ])
+    lote = sistema.obtener_predicciones_lote(entradas)
+    return (
+        np.round(lote['uso_gpu'], 4).tolist(),
+        np.round(lote['temperatura'], 4).tolist(),
+        np.asarray(sistema.uso_labels)[lote['uso_gpu_codigo']].tolist(),
+        np.asarray(sistema.temp_labels)[lote['temperatura_codigo']].tolist(),
+    )
+
+
+def _filas_datos(lector, campos):
+    """Filas del lector sin las líneas en blanco; una fila con otra cantidad de campos es un error."""
+    for fila in lector:
+        if not fila:
+            continue
+        if len(fila) != campos:
+            raise ValueError(f"Línea {lector.line_num}: se esperaban {campos} campos y hay {len(fila)}")
+        yield fila
+
+
+def puntuar_csv(sistema, entrada, salida, tamano_bloque=100000, informar=None):
+    """Lee el CSV `entrada` por bloques de tamano_bloque filas y escribe cada fila con sus salidas en `salida`.
+
+    entrada y salida son archivos de texto abiertos; solo se mantiene en memoria un bloque a la vez.
+    El encabezado debe incluir resolucion (nombre del catálogo o "W×H"), configuracion, fps_objetivo y
+    potencia_gpu; el resto de columnas se copian tal cual. Las líneas en blanco se omiten; una fila
+    con otra cantidad de campos que el encabezado lanza ValueError con su número de línea.
+    informar(filas, segundos) se llama tras cada bloque con el acumulado. Retorna el número de
+    filas procesadas.
+    """
+    lector = csv.reader(entrada)
+    escritor = csv.writer(salida)
+    try:
+        encabezado = next(lector)
+    except StopIteration:
+        raise ValueError("El archivo de entrada está vacío") from None
+    faltantes = [c for c in SistemaDifusoTarjetasGraficas.ENTRADAS if c not in encabezado]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en el encabezado: {', '.join(faltantes)}")
+    indices = {c: encabezado.index(c) for c in SistemaDifusoTarjetasGraficas.ENTRADAS}
+    escritor.writerow(encabezado + list(COLUMNAS_SALIDA))
+
+    filas_datos = _filas_datos(lector, len(encabezado))
+    total = 0
+    inicio = time.perf_counter()
+    while True:
+        filas = list(itertools.islice(filas_datos, tamano_bloque))
+        if not filas:
+            break
+        resultados = puntuar_bloque(sistema, filas, indices)
+        escritor.writerows(fila + list(valores) for fila, valores in zip(filas, zip(*resultados)))
+        total += len(filas)
+        if informar is not None:
+            informar(total, time.perf_counter() - inicio)
+    return total
+
+
+def _informar_progreso(filas, segundos):
+    print(f"{filas} filas en {segundos:.1f} s ({filas / segundos:,.0f} filas/s)", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Puntúa un CSV de telemetría por bloques con el motor vectorizado.")
+    parser.add_argument('entrada', help="CSV con columnas resolucion, configuracion, fps_objetivo y potencia_gpu")
+    parser.add_argument('salida', help="CSV de salida (las filas de entrada más uso_gpu, temperatura y etiquetas)")
+    parser.add_argument('--tamano-bloque', type=int, default=100000, help="Filas leídas y evaluadas por bloque")
+    parser.add_argument('--ruta-compilado', default=None, help="Artefacto del sistema compilado a reutilizar")
+    parser.add_argument('--motor', choices=('vectorizado', 'sugeno'), default='vectorizado',
+                        help="Inferencia Mamdani o la aproximación Sugeno de orden cero (ver SugenoDF)")
+    args = parser.parse_args(argv)
+    if args.tamano_bloque <= 0:
+        parser.error("--tamano-bloque debe ser positivo")
+
+    sistema = SistemaDifusoTarjetasGraficas(motor=args.motor, ruta_compilado=args.ruta_compilado, tamano_cache=0)
+    with open(args.entrada, newline='', encoding='utf-8') as entrada, \
+            open(args.salida, 'w', newline='', encoding='utf-8') as salida:
+        total = puntuar_csv(sistema, entrada, salida, args.tamano_bloque, informar=_informar_progreso)
+    print(f"Total: {total} filas", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+import bisect
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+# Límites de los histogramas en segundos: de 50 µs a ~52 s en escala exponencial
+LIMITES_SEGUNDOS = tuple(5e-5 * 2 ** i for i in range(21))
+
+CUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histograma:
+    """Histograma de buckets fijos: registrar un valor es una búsqueda binaria y un incremento."""
+
+    __slots__ = ('limites', 'conteos', 'suma', 'total', '_lock')
+
+    def __init__(self, limites=LIMITES_SEGUNDOS):
+        self.limites = list(limites)
+        self.conteos = [0] * (len(self.limites) + 1)
+        self.suma = 0.0
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def observar(self, valor):
+        i = bisect.bisect_left(self.limites, valor)
+        with self._lock:
+            self.conteos[i] += 1
+            self.suma += valor
+            self.total += 1
+
+    def cuantil(self, q):
+        """Estimación del cuantil q interpolando linealmente dentro del bucket que lo contiene."""
+        with self._lock:
+            conteos = list(self.conteos)
+            total = self.total
+        if total == 0:
+            return 0.0
+        objetivo = q * total
+        acumulado = 0
+        for i, conteo in enumerate(conteos):
+            if conteo and acumulado + conteo >= objetivo:
+                if i == len(self.limites):
+                    return self.limites[-1]
+                inferior = self.limites[i - 1] if i > 0 else 0.0
+                return inferior + (self.limites[i] - inferior) * (objetivo - acumulado) / conteo
+            acumulado += conteo
+        return self.limites[-1]
+
+
+class RegistroMetricas:
+    """Duraciones por etapa, solicitudes en curso y estadísticas externas en formato Prometheus."""
+
+    def __init__(self, activo=True, prefijo='sistema_difuso'):
+        self.activo = activo
+        self.prefijo = prefijo
+        self._histogramas = {}
+        self._en_curso = defaultdict(int)
+        self._fuentes = {}
+        self._lock = threading.Lock()
+
+    def observar(self, etapa, segundos):
+        """Registra la duración de una etapa."""
+        if not self.activo:
+            return
+        histograma = self._histogramas.get(etapa)
+        if histograma is None:
+            with self._lock:
+                histograma = self._histogramas.setdefault(etapa, Histograma())
+        histograma.observar(segundos)
+
+    @contextmanager
+    def medir(self, etapa):
+        """Mide la duración del bloque with como la etapa indicada."""
+        if not self.activo:
+            yield
+            return
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(etapa, time.perf_counter() - inicio)
+
+    @contextmanager
+    def en_curso(self, operacion):
+        """Cuenta la operación como en curso mientras dura el bloque with."""
+        with self._lock:
+            self._en_curso[operacion] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._en_curso[operacion] -= 1
+
+    def registrar_fuente(self, nombre, funcion):
+        """Registra una función que retorna un diccionario de valores numéricos (o None) a exportar."""
+        self._fuentes[nombre] = funcion
+
+    def resumen(self):
+        """Retorna cuantiles, suma y conteo de cada etapa."""
+        return {
+            etapa: dict({f'p{int(q * 100)}': h.cuantil(q) for q in CUANTILES}, suma=h.suma, conteo=h.total)
+            for etapa, h in sorted(self._histogramas.items())
+        }
+
+    def exportar_prometheus(self):
+        """Texto en formato de exposición de Prometheus (0.0.4)."""
+        p = self.prefijo
+        lineas = [
+            f'# HELP {p}_etapa_segundos Duración de cada etapa del cálculo de predicciones.',
+            f'# TYPE {p}_etapa_segundos summary',
+        ]
+        for etapa, h in sorted(self._histogramas.items()):
+            for q in CUANTILES:
+                lineas.append(f'{p}_etapa_segundos{{etapa="{etapa}",quantile="{q}"}} {h.cuantil(q)!r}')
+            lineas.append(f'{p}_etapa_segundos_sum{{etapa="{etapa}"}} {h.suma!r}')
+            lineas.append(f'{p}_etapa_segundos_count{{etapa="{etapa}"}} {h.total}')
+
+        lineas += [
+            f'# HELP {p}_en_curso Solicitudes en curso por operación.',
+            f'# TYPE {p}_en_curso gauge',
+        ]
+        with self._lock:
+            en_curso = sorted(self._en_curso.items())
+        lineas += [f'{p}_en_curso{{operacion="{operacion}"}} {n}' for operacion, n in en_curso]
+
+        # Un gauge por campo, etiquetado con la fuente (caché de predicciones, pool, ...)
+        por_campo = defaultdict(list)
+        for fuente, funcion in sorted(self._fuentes.items()):
+            valores = funcion() or {}
+            for campo, valor in valores.items():
+                if isinstance(valor, (int, float)):
+                    por_campo[campo].append((fuente, valor))
+        for campo, valores in sorted(por_campo.items()):
+            lineas.append(f'# TYPE {p}_{campo} gauge')
+            lineas += [f'{p}_{campo}{{fuente="{fuente}"}} {valor!r}' for fuente, valor in valores]
+        return '\n'.join(lineas) + '\n'
+
+
+# Registro global; SISTEMA_DIFUSO_METRICAS=0 desactiva la medición de etapas
+metricas = RegistroMetricas(activo=os.environ.get('SISTEMA_DIFUSO_METRICAS', '1') != '0')
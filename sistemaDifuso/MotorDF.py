@@ -0,0 +1,257 @@
+import numpy as np
+
+
+class MotorMamdaniVectorizado:
+    """Motor de inferencia Mamdani vectorizado con NumPy, equivalente al ControlSystemSimulation de skfuzzy."""
+
+    # Diferencia máxima admitida frente a los valores crisp de skfuzzy
+    TOLERANCIA = 1e-6
+
+    # Por debajo de este tamaño de lote indexar las reglas activas cuesta más que evaluar las 256
+    MINIMO_LOTE_REGLAS_ACTIVAS = 2
+
+    # 'muestreado' reproduce skfuzzy; 'analitico' integra la envolvente exacta de los trapecios
+    DEFUZZIFICACIONES = ('muestreado', 'analitico')
+
+    def __init__(self, antecedentes, consecuentes, consecuentes_reglas, trapecios_salida=None,
+                 defuzzificacion='muestreado'):
+        """
+        antecedentes: lista de (universo, matriz de pertenencia etiquetas x universo) por variable de entrada.
+        consecuentes: lista de (universo, matriz de pertenencia etiquetas x universo) por variable de salida.
+        consecuentes_reglas: matriz (reglas x salidas) con el índice de etiqueta de cada consecuente,
+        en el orden de itertools.product sobre las etiquetas de los antecedentes.
+        trapecios_salida: por salida, matriz (etiquetas x 4) con los parámetros [a, b, c, d] de cada
+        trapecio; requerida para la defuzzificación analítica.
+        """
+        if defuzzificacion not in self.DEFUZZIFICACIONES:
+            raise ValueError(f"Defuzzificación desconocida: {defuzzificacion}")
+        if defuzzificacion == 'analitico' and trapecios_salida is None:
+            raise ValueError("La defuzzificación analítica requiere los parámetros de los trapecios de salida")
+        self.defuzzificacion = defuzzificacion
+        self.trapecios_salida = None if trapecios_salida is None else \
+            [np.asarray(t, dtype=np.float64) for t in trapecios_salida]
+        self.antecedentes = [(np.asarray(u, dtype=np.float64), np.asarray(m, dtype=np.float64))
+                             for u, m in antecedentes]
+        self.consecuentes = [(np.asarray(u, dtype=np.float64), np.asarray(m, dtype=np.float64))
+                             for u, m in consecuentes]
+        self.consecuentes_reglas = np.asarray(consecuentes_reglas, dtype=np.intp)
+
+        # Máscara regla -> etiqueta de salida para acumular con max
+        self._mascaras = [
+            self.consecuentes_reglas[:, s, None] == np.arange(mfs.shape[0])[None, :]
+            for s, (_, mfs) in enumerate(self.consecuentes)
+        ]
+        # Flancos de subida y bajada de cada etiqueta de salida (para los puntos de corte)
+        self._flancos = [self._calcular_flancos(u, mfs) for u, mfs in self.consecuentes]
+
+        # Tabla de reglas indexada por etiqueta de cada antecedente (res x conf x fps x gpu -> consecuentes)
+        forma = tuple(mfs.shape[0] for _, mfs in self.antecedentes)
+        self.tabla_reglas = self.consecuentes_reglas.reshape(forma + (len(self.consecuentes),))
+        # Máximo de etiquetas con pertenencia no nula a la vez en cada antecedente
+        self._activas_por_variable = [self._maximo_activas(mfs) for _, mfs in self.antecedentes]
+
+    @classmethod
+    def desde_sistema(cls, sistema, defuzzificacion='muestreado'):
+        """Construye el motor a partir de las variables y reglas de un SistemaDifusoTarjetasGraficas."""
+        def matriz(variable, etiquetas):
+            return variable.universe, np.vstack([variable[e].mf for e in etiquetas])
+
+        antecedentes = [
+            matriz(sistema.resolucion, sistema.res_labels),
+            matriz(sistema.configuracion, sistema.conf_labels),
+            matriz(sistema.fps_objetivo, sistema.fps_labels),
+            matriz(sistema.potencia_gpu, sistema.gpu_labels),
+        ]
+        consecuentes = [
+            matriz(sistema.uso_gpu, sistema.uso_labels),
+            matriz(sistema.temperatura, sistema.temp_labels),
+        ]
+        consecuentes_reglas = [
+            (sistema.uso_labels.index(r['salidas']['uso']), sistema.temp_labels.index(r['salidas']['temp']))
+            for r in sistema.reglas_detalladas
+        ]
+        trapecios_salida = [
+            [sistema.trapecios_salida['uso_gpu'][e] for e in sistema.uso_labels],
+            [sistema.trapecios_salida['temperatura'][e] for e in sistema.temp_labels],
+        ]
+        return cls(antecedentes, consecuentes, consecuentes_reglas, trapecios_salida, defuzzificacion)
+
+    @staticmethod
+    def _calcular_flancos(universo, mfs):
+        """Obtiene, por etiqueta, los tramos monótonos (pertenencia, universo) de subida y bajada."""
+        flancos = []
+        for mf in mfs:
+            picos = np.flatnonzero(mf == mf.max())
+            inicio, fin = picos[0], picos[-1]
+            ceros_antes = np.flatnonzero(mf[:inicio] == 0)
+            ceros_despues = np.flatnonzero(mf[fin:] == 0)
+            tramos = []
+            if inicio > 0:
+                desde = ceros_antes[-1] if len(ceros_antes) else 0
+                tramos.append((mf[desde:inicio + 1], universo[desde:inicio + 1]))
+            if fin < len(mf) - 1:
+                hasta = fin + ceros_despues[0] if len(ceros_despues) else len(mf) - 1
+                tramos.append((mf[fin:hasta + 1][::-1], universo[fin:hasta + 1][::-1]))
+            flancos.append(tramos)
+        return flancos
+
+    @staticmethod
+    def _maximo_activas(mfs):
+        """Número máximo de etiquetas no nulas en cualquier punto del universo (incluido entre muestras)."""
+        no_nulas = mfs > 0
+        return int((no_nulas[:, :-1] | no_nulas[:, 1:]).sum(axis=0).max()) if mfs.shape[1] > 1 \
+            else int(no_nulas.sum())
+
+    def fuzzificar(self, entradas):
+        """Calcula la pertenencia de cada entrada (N x variables) a cada etiqueta, recortando al universo."""
+        entradas = np.atleast_2d(np.asarray(entradas, dtype=np.float64))
+        return [self.fuzzificar_variable(k, entradas[:, k]) for k in range(len(self.antecedentes))]
+
+    def fuzzificar_variable(self, k, x):
+        """Pertenencia de los valores x de la variable k a cada etiqueta (forma de x + etiquetas)."""
+        universo, mfs = self.antecedentes[k]
+        x = np.clip(x, universo[0], universo[-1])
+        return np.stack([np.interp(x, universo, mf) for mf in mfs], axis=-1)
+
+    def activar_reglas(self, grados):
+        """Fuerza de disparo (N x reglas) de todas las reglas usando el mínimo como AND."""
+        fuerza = grados[0]
+        for g in grados[1:]:
+            fuerza = np.minimum(fuerza[:, :, None], g[:, None, :]).reshape(len(g), -1)
+        return fuerza
+
+    def acumular(self, fuerza):
+        """Activación por etiqueta de cada salida (máximo de las reglas que la tienen como consecuente)."""
+        return [np.where(mascara[None, :, :], fuerza[:, :, None], 0.0).max(axis=1)
+                for mascara in self._mascaras]
+
+    def activar_reglas_activas(self, grados):
+        """Fuerza de disparo solo de las reglas cuyas etiquetas pueden estar activas.
+
+        Con trapecios que se solapan de a pares hay a lo sumo 2 etiquetas no nulas por variable,
+        es decir 16 de las 256 reglas. Retorna (fuerza N x k, consecuentes N x k x salidas).
+        """
+        n = len(grados[0])
+        fuerza = np.ones((n, 1))
+        etiquetas_activas = []
+        for g, k in zip(grados, self._activas_por_variable):
+            # Las k etiquetas con mayor pertenencia de cada fila
+            etiquetas = np.argsort(-g, axis=1, kind='stable')[:, :k]
+            valores = np.take_along_axis(g, etiquetas, axis=1)
+            fuerza = np.minimum(fuerza[:, :, None], valores[:, None, :]).reshape(n, -1)
+            etiquetas_activas.append(etiquetas)
+
+        # Índices de la tabla de reglas en el mismo orden de combinación que la fuerza
+        d = len(etiquetas_activas)
+        indices = tuple(e.reshape((n,) + tuple(-1 if j == i else 1 for j in range(d)))
+                        for i, e in enumerate(etiquetas_activas))
+        consecuentes = self.tabla_reglas[indices].reshape(n, fuerza.shape[1], -1)
+        return fuerza, consecuentes
+
+    def acumular_activas(self, fuerza, consecuentes):
+        """Activación por etiqueta de cada salida a partir de las reglas activas."""
+        return [np.where(consecuentes[:, :, s, None] == np.arange(mfs.shape[0]), fuerza[:, :, None], 0.0).max(axis=1)
+                for s, (_, mfs) in enumerate(self.consecuentes)]
+
+    def defuzzificar(self, s, activacion):
+        """Centroide de la salida s con el mismo muestreo que skfuzzy (universo más puntos de corte)."""
+        universo, mfs = self.consecuentes[s]
+        n = len(activacion)
+
+        # Puntos del universo donde cada etiqueta alcanza su nivel de corte
+        cortes = [np.interp(activacion[:, j], ys, xs)
+                  for j, tramos in enumerate(self._flancos[s]) for ys, xs in tramos]
+        puntos = np.concatenate([np.broadcast_to(universo, (n, len(universo))),
+                                 np.stack(cortes, axis=1)], axis=1) if cortes else \
+            np.broadcast_to(universo, (n, len(universo)))
+        puntos = np.sort(puntos, axis=1)
+
+        # Función de pertenencia agregada (máximo de las etiquetas recortadas)
+        agregada = np.zeros_like(puntos)
+        for j, mf in enumerate(mfs):
+            valores = np.interp(puntos.ravel(), universo, mf).reshape(puntos.shape)
+            np.maximum(agregada, np.minimum(valores, activacion[:, j, None]), out=agregada)
+
+        # Integración exacta de la interpolación lineal por tramos
+        x1, x2 = puntos[:, :-1], puntos[:, 1:]
+        y1, y2 = agregada[:, :-1], agregada[:, 1:]
+        ancho = x2 - x1
+        area = 0.5 * ancho * (y1 + y2)
+        momento = ancho * (x1 * (2 * y1 + y2) + x2 * (y1 + 2 * y2)) / 6.0
+        return momento.sum(axis=1) / np.fmax(area.sum(axis=1), np.finfo(float).eps)
+
+    def defuzzificar_analitico(self, s, activacion):
+        """Centroide exacto de la salida s a partir de la envolvente de los trapecios recortados.
+
+        El máximo de trapecios recortados es lineal por tramos; sus quiebres están en los vértices de
+        cada trapecio recortado o en cruces entre dos de sus segmentos (subida, meseta y bajada).
+        Evaluando la envolvente en todos esos puntos la integración por trapecios es exacta y no
+        depende de la resolución del universo.
+        """
+        universo, _ = self.consecuentes[s]
+        a, b, c, d = (self.trapecios_salida[s][:, i] for i in range(4))
+        h = activacion
+        n = len(h)
+
+        # Rectas y = m x + q de cada segmento: subida, meseta (y = h) y bajada
+        con_subida = b > a
+        con_bajada = d > c
+        m_subida = np.where(con_subida, 1.0 / np.where(con_subida, b - a, 1.0), 0.0)
+        m_bajada = np.where(con_bajada, -1.0 / np.where(con_bajada, d - c, 1.0), 0.0)
+        pendientes = np.concatenate([m_subida, np.zeros_like(a), m_bajada])
+        pendientes = np.broadcast_to(pendientes, (n, len(pendientes)))
+        ordenadas = np.concatenate([np.broadcast_to(-a * m_subida, h.shape), h,
+                                    np.broadcast_to(-d * m_bajada, h.shape)], axis=1)
+        validas = np.concatenate([con_subida, np.ones_like(con_subida), con_bajada])
+
+        # Cruces entre todos los pares de rectas válidas (no paralelas)
+        i, j = np.triu_indices(pendientes.shape[1], k=1)
+        par_valido = validas[i] & validas[j]
+        i, j = i[par_valido], j[par_valido]
+        dm = pendientes[:, i] - pendientes[:, j]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cruces = np.where(dm != 0, (ordenadas[:, j] - ordenadas[:, i]) / np.where(dm != 0, dm, 1.0), np.nan)
+
+        # Vértices de cada trapecio recortado y extremos del universo
+        vertices = np.concatenate([
+            np.broadcast_to(a, h.shape), a + h * (b - a), d - h * (d - c), np.broadcast_to(d, h.shape),
+            np.full((n, 2), (universo[0], universo[-1])),
+        ], axis=1)
+        puntos = np.concatenate([vertices, cruces], axis=1)
+        puntos = np.clip(np.where(np.isnan(puntos), universo[0], puntos), universo[0], universo[-1])
+        puntos = np.sort(puntos, axis=1)
+
+        # Envolvente evaluada de forma exacta en los quiebres
+        x = puntos[:, :, None]
+        subida = np.where(con_subida, (x - a) / np.where(con_subida, b - a, 1.0), np.where(x >= a, 1.0, 0.0))
+        bajada = np.where(con_bajada, (d - x) / np.where(con_bajada, d - c, 1.0), np.where(x <= d, 1.0, 0.0))
+        recortada = np.clip(np.minimum(np.minimum(subida, bajada), h[:, None, :]), 0.0, None)
+        envolvente = recortada.max(axis=2)
+
+        x1, x2 = puntos[:, :-1], puntos[:, 1:]
+        y1, y2 = envolvente[:, :-1], envolvente[:, 1:]
+        ancho = x2 - x1
+        area = 0.5 * ancho * (y1 + y2)
+        momento = ancho * (x1 * (2 * y1 + y2) + x2 * (y1 + 2 * y2)) / 6.0
+        return momento.sum(axis=1) / np.fmax(area.sum(axis=1), np.finfo(float).eps)
+
+    def evaluar_reglas(self, grados, solo_activas=None):
+        """Activación por etiqueta de cada salida a partir de los grados de pertenencia de las entradas.
+
+        solo_activas indica si se indexan solo las reglas activas (True) o se evalúan las 256 (False);
+        por defecto se elige según el tamaño del lote.
+        """
+        if solo_activas is None:
+            solo_activas = len(grados[0]) >= self.MINIMO_LOTE_REGLAS_ACTIVAS
+        if solo_activas:
+            return self.acumular_activas(*self.activar_reglas_activas(grados))
+        return self.acumular(self.activar_reglas(grados))
+
+    def defuzzificar_salidas(self, activaciones):
+        """Valor crisp de cada salida con el método de defuzzificación configurado."""
+        defuzzificar = self.defuzzificar_analitico if self.defuzzificacion == 'analitico' else self.defuzzificar
+        return [defuzzificar(s, activacion) for s, activacion in enumerate(activaciones)]
+
+    def calcular(self, entradas, solo_activas=None):
+        """Evalúa un lote de entradas (N x variables) y devuelve un arreglo crisp por cada salida."""
+        return self.defuzzificar_salidas(self.evaluar_reglas(self.fuzzificar(entradas), solo_activas))
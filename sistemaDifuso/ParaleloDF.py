@@ -0,0 +1,158 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from .CompiladoDF import ruta_compilado_predeterminada
+from .SistemaDF import SistemaDifusoTarjetasGraficas
+
+# Sistema construido una sola vez por proceso trabajador (en el inicializador del pool)
+_sistema_trabajador = None
+
+
+def _inicializar_trabajador(ruta_compilado):
+    global _sistema_trabajador
+    _sistema_trabajador = SistemaDifusoTarjetasGraficas(
+        motor='vectorizado', ruta_compilado=ruta_compilado, tamano_cache=0, tamano_cache_graficos=0,
+    )
+
+
+def _evaluar_fragmento(nombre_entradas, nombre_salidas, n, inicio, fin):
+    """Evalúa las filas [inicio, fin) leyendo y escribiendo directamente en la memoria compartida."""
+    memoria_entradas = shared_memory.SharedMemory(name=nombre_entradas)
+    memoria_salidas = shared_memory.SharedMemory(name=nombre_salidas)
+    try:
+        entradas = np.ndarray((n, 4), dtype=np.float64, buffer=memoria_entradas.buf)
+        salidas = np.ndarray((n, 2), dtype=np.float64, buffer=memoria_salidas.buf)
+        lote = _sistema_trabajador.obtener_predicciones_lote(entradas[inicio:fin])
+        salidas[inicio:fin, 0] = lote['uso_gpu']
+        salidas[inicio:fin, 1] = lote['temperatura']
+        # Las vistas deben liberarse antes de cerrar los bloques
+        del entradas, salidas
+    finally:
+        memoria_entradas.close()
+        memoria_salidas.close()
+    return fin - inicio
+
+
+def _listo(_):
+    return os.getpid()
+
+
+class EvaluadorParalelo:
+    """Reparte lotes grandes entre varios procesos, cada uno con su propio sistema difuso vectorizado.
+
+    Las entradas (N, 4) y las salidas (N, 2) viajan por memoria compartida: a cada proceso solo
+    se le envían los nombres de los bloques y el rango de filas que le corresponde.
+    """
+
+    def __init__(self, procesos=None, ruta_compilado=None, fragmentos_por_proceso=2):
+        """
+        procesos: número de procesos trabajadores (por defecto, os.cpu_count()).
+        ruta_compilado: artefacto del sistema compilado que carga cada proceso en lugar de construir
+            el sistema desde cero (por defecto, ruta_compilado_predeterminada()).
+        fragmentos_por_proceso: fragmentos en que se divide el lote por proceso, para repartir mejor la carga.
+        """
+        self.procesos = procesos or os.cpu_count() or 1
+        if self.procesos <= 0:
+            raise ValueError("El número de procesos debe ser positivo")
+        self.fragmentos_por_proceso = fragmentos_por_proceso
+        if ruta_compilado is None:
+            ruta_compilado = ruta_compilado_predeterminada()
+        # Los trabajadores deben heredar el resource_tracker de este proceso: así los bloques que
+        # adjuntan quedan registrados una sola vez y solo se liberan con unlink() aquí
+        resource_tracker.ensure_running()
+        self._ejecutor = ProcessPoolExecutor(
+            max_workers=self.procesos, initializer=_inicializar_trabajador, initargs=(ruta_compilado,),
+        )
+        # Arrancar todos los procesos ahora para no medir su construcción en la primera evaluación
+        list(self._ejecutor.map(_listo, range(self.procesos)))
+
+    def evaluar(self, entradas):
+        """Evalúa un arreglo (N, 4) y retorna los arreglos uso_gpu y temperatura, como obtener_predicciones_lote."""
+        entradas = np.atleast_2d(np.asarray(entradas, dtype=np.float64))
+        if entradas.ndim != 2 or entradas.shape[1] != 4:
+            raise ValueError(f"Se esperaba un arreglo de forma (N, 4), se recibió {entradas.shape}")
+        n = len(entradas)
+        if n == 0:
+            return {'uso_gpu': np.empty(0), 'temperatura': np.empty(0)}
+
+        memoria_entradas = shared_memory.SharedMemory(create=True, size=entradas.nbytes)
+        memoria_salidas = shared_memory.SharedMemory(create=True, size=n * 2 * 8)
+        try:
+            compartidas = np.ndarray(entradas.shape, dtype=np.float64, buffer=memoria_entradas.buf)
+            compartidas[:] = entradas
+            del compartidas
+            limites = np.linspace(0, n, min(n, self.procesos * self.fragmentos_por_proceso) + 1).astype(int)
+            futuros = [
+                self._ejecutor.submit(_evaluar_fragmento, memoria_entradas.name, memoria_salidas.name,
+                                      n, int(inicio), int(fin))
+                for inicio, fin in zip(limites[:-1], limites[1:])
+            ]
+            for futuro in futuros:
+                futuro.result()
+            salidas = np.ndarray((n, 2), dtype=np.float64, buffer=memoria_salidas.buf).copy()
+        finally:
+            for memoria in (memoria_entradas, memoria_salidas):
+                memoria.close()
+                memoria.unlink()
+        return {'uso_gpu': salidas[:, 0], 'temperatura': salidas[:, 1]}
+
+    def cerrar(self):
+        """Termina los procesos trabajadores."""
+        self._ejecutor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+def medir_escalamiento(n=200000, procesos=None, ruta_compilado=None, repeticiones=3, semilla=0):
+    """Filas por segundo de EvaluadorParalelo con 1..N procesos sobre un lote aleatorio de n filas."""
+    from .BenchmarkDF import entradas_aleatorias
+
+    if procesos is None:
+        procesos = range(1, (os.cpu_count() or 1) + 1)
+    if ruta_compilado is None:
+        ruta_compilado = ruta_compilado_predeterminada()
+    # Si el artefacto no existe, este sistema lo construye y lo guarda antes de arrancar los trabajadores
+    referencia = SistemaDifusoTarjetasGraficas(motor='vectorizado', ruta_compilado=ruta_compilado)
+    entradas = entradas_aleatorias(referencia, n, semilla)
+
+    resultados = []
+    for p in procesos:
+        with EvaluadorParalelo(p, ruta_compilado) as evaluador:
+            tiempos = []
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                evaluador.evaluar(entradas)
+                tiempos.append(time.perf_counter() - inicio)
+        mejor = min(tiempos)
+        resultados.append({'procesos': p, 'mejor_s': mejor, 'filas_por_segundo': n / mejor})
+    base = resultados[0]['filas_por_segundo'] / resultados[0]['procesos']
+    for r in resultados:
+        r['eficiencia'] = r['filas_por_segundo'] / (base * r['procesos'])
+    return {'n': n, 'cpu_count': os.cpu_count(), 'escalamiento': resultados}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Escalamiento de la evaluación por procesos (salida JSON).")
+    parser.add_argument('--n', type=int, default=200000, help="Filas del lote de prueba")
+    parser.add_argument('--procesos', default=None, help="Niveles a medir separados por comas (por defecto 1..cpu_count)")
+    parser.add_argument('--ruta-compilado', default=None,
+                        help="Artefacto del sistema compilado a reutilizar (por defecto, el de la caché del usuario)")
+    parser.add_argument('--repeticiones', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    procesos = tuple(int(p) for p in args.procesos.split(',')) if args.procesos else None
+    print(json.dumps(medir_escalamiento(args.n, procesos, args.ruta_compilado, args.repeticiones), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import copy
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+
+class PoolSimuladores:
+    """Pool de simuladores skfuzzy independientes que se prestan a un hilo a la vez.
+
+    skfuzzy guarda el estado de cada simulación en los propios términos y reglas del
+    ControlSystem, así que cada elemento del pool es una copia profunda del grafo completo
+    (simulador, uso_gpu y temperatura) y no comparte nada mutable con los demás.
+    """
+
+    def __init__(self, sistema, tamano=4, timeout=None):
+        """
+        sistema: SistemaDifusoTarjetasGraficas ya construido del que se copian los simuladores.
+        tamano: número de simuladores disponibles a la vez.
+        timeout: segundos máximos de espera cuando el pool está agotado (None espera indefinidamente).
+        """
+        if tamano <= 0:
+            raise ValueError("El tamaño del pool debe ser positivo")
+        self.tamano = tamano
+        self.timeout = timeout
+        self._libres = queue.LifoQueue()
+        for _ in range(tamano):
+            self._libres.put(copy.deepcopy((sistema.simulador, sistema.uso_gpu, sistema.temperatura)))
+
+        self._lock = threading.Lock()
+        self.prestamos = 0
+        self.agotados = 0
+        self.esperas = 0
+        self.espera_total = 0.0
+        self.espera_maxima = 0.0
+
+    @contextmanager
+    def prestar(self, timeout=None):
+        """Presta un (simulador, uso_gpu, temperatura) durante el bloque with.
+
+        Si no hay simuladores libres espera hasta timeout (o el del pool) y lanza TimeoutError.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        inicio = time.perf_counter()
+        try:
+            elemento = self._libres.get_nowait()
+        except queue.Empty:
+            try:
+                elemento = self._libres.get(timeout=timeout)
+            except queue.Empty:
+                with self._lock:
+                    self.agotados += 1
+                raise TimeoutError(f"No hay simuladores libres tras esperar {timeout} s") from None
+            finally:
+                espera = time.perf_counter() - inicio
+                with self._lock:
+                    self.esperas += 1
+                    self.espera_total += espera
+                    self.espera_maxima = max(self.espera_maxima, espera)
+
+        with self._lock:
+            self.prestamos += 1
+        try:
+            yield elemento
+        finally:
+            self._libres.put(elemento)
+
+    def estadisticas(self):
+        """Retorna préstamos, esperas, tiempo de espera (total, medio y máximo) y simuladores libres."""
+        with self._lock:
+            return {
+                'tamano': self.tamano,
+                'disponibles': self._libres.qsize(),
+                'prestamos': self.prestamos,
+                'esperas': self.esperas,
+                'agotados': self.agotados,
+                'espera_total': self.espera_total,
+                'espera_media': self.espera_total / self.esperas if self.esperas else 0.0,
+                'espera_maxima': self.espera_maxima,
+            }
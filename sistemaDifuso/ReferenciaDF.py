@@ -0,0 +1,251 @@
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import skfuzzy
+
+from .SistemaDF import SistemaDifusoTarjetasGraficas
+
+SALIDAS = ('uso_gpu', 'temperatura')
+
+# Sistema construido una sola vez por proceso trabajador al generar en paralelo
+_sistema_trabajador = None
+
+
+def ejes_referencia(sistema, paso_configuracion=25, paso_fps=30, paso_gpu=25):
+    """Ejes de la malla: todos los valores del catálogo de resoluciones (más los extremos del universo) y el resto cada paso."""
+    def eje(universo, paso):
+        return np.union1d(np.arange(universo[0], universo[-1], paso), [universo[-1]]).astype(np.float64)
+
+    return [
+        np.union1d(list(sistema.resoluciones.values()),
+                   [sistema.resolucion_universe[0], sistema.resolucion_universe[-1]]).astype(np.float64),
+        eje(sistema.configuracion_universe, paso_configuracion),
+        eje(sistema.fps_objetivo_universe, paso_fps),
+        eje(sistema.potencia_gpu_universe, paso_gpu),
+    ]
+
+
+def entradas_referencia(sistema, ejes, aleatorias=0, semilla=0):
+    """Filas (N x 4) de la malla de `ejes` seguidas de `aleatorias` puntos uniformes dentro de los universos."""
+    malla = np.stack(np.meshgrid(*ejes, indexing='ij'), axis=-1).reshape(-1, 4)
+    rng = np.random.default_rng(semilla)
+    universos = (sistema.resolucion_universe, sistema.configuracion_universe,
+                 sistema.fps_objetivo_universe, sistema.potencia_gpu_universe)
+    extra = np.column_stack([rng.uniform(u[0], u[-1], aleatorias) for u in universos])
+    return np.concatenate([malla, extra]).astype(np.float64)
+
+
+def _evaluar_puntual(sistema, entradas):
+    """Evalúa fila por fila con obtener_resultado (motor configurado, caché y cuantización incluidas)."""
+    salidas = np.empty((len(entradas), len(SALIDAS)))
+    for i, fila in enumerate(entradas.tolist()):
+        resultado = sistema.obtener_resultado(dict(zip(sistema.ENTRADAS, fila)))
+        salidas[i] = resultado.uso_gpu, resultado.temperatura
+    return salidas
+
+
+def _evaluar_lote(sistema, entradas):
+    lote = sistema.obtener_predicciones_lote(entradas)
+    return np.column_stack([lote[s] for s in SALIDAS])
+
+
+EVALUACIONES = {'puntual': _evaluar_puntual, 'lote': _evaluar_lote}
+
+
+def _inicializar_trabajador(opciones):
+    global _sistema_trabajador
+    _sistema_trabajador = SistemaDifusoTarjetasGraficas(tamano_cache=0, tamano_cache_graficos=0, **opciones)
+
+
+def _evaluar_fragmento(entradas):
+    return _evaluar_puntual(_sistema_trabajador, entradas)
+
+
+def generar_referencia(ruta, paso_configuracion=25, paso_fps=30, paso_gpu=25, aleatorias=500, semilla=0,
+                       procesos=1, informar=None, **opciones):
+    """Calcula las salidas de referencia punto a punto y las guarda comprimidas en `ruta` (.npz).
+
+    Por defecto se usa el ControlSystemSimulation de skfuzzy (motor='skfuzzy' en `opciones`, que se
+    pasan a SistemaDifusoTarjetasGraficas). Solo se guardan los ejes de la malla, los puntos
+    aleatorios, las salidas en float64 y los códigos de etiqueta en uint8. Con procesos > 1 la
+    evaluación se reparte entre procesos. informar(hechos, total) se llama tras cada fragmento.
+
+    skfuzzy tarda ~1.3 s por punto: la malla por defecto (~5700 puntos) lleva unas dos horas en un
+    núcleo. La referencia que usan las pruebas (tests/datos/referencia_skfuzzy.npz, 667 puntos,
+    ~17 min) se generó con pasos 50, 105 y 50 y 100 puntos aleatorios.
+    """
+    opciones.setdefault('motor', 'skfuzzy')
+    sistema = SistemaDifusoTarjetasGraficas(tamano_cache=0, tamano_cache_graficos=0, **opciones)
+    ejes = ejes_referencia(sistema, paso_configuracion, paso_fps, paso_gpu)
+    entradas = entradas_referencia(sistema, ejes, aleatorias, semilla)
+
+    inicio = time.perf_counter()
+    fragmentos = np.array_split(entradas, max(1, min(len(entradas), 64 * procesos)))
+    partes = []
+    if procesos > 1:
+        with ProcessPoolExecutor(procesos, initializer=_inicializar_trabajador, initargs=(opciones,)) as pool:
+            for parte in pool.map(_evaluar_fragmento, fragmentos):
+                partes.append(parte)
+                if informar is not None:
+                    informar(sum(len(p) for p in partes), len(entradas))
+    else:
+        for fragmento in fragmentos:
+            partes.append(_evaluar_puntual(sistema, fragmento))
+            if informar is not None:
+                informar(sum(len(p) for p in partes), len(entradas))
+    salidas = np.concatenate(partes)
+
+    metadatos = {
+        'motor': sistema.motor,
+        'defuzzificacion': sistema.defuzzificacion,
+        'huella': sistema.huella,
+        'skfuzzy': skfuzzy.__version__,
+        'pasos': [paso_configuracion, paso_fps, paso_gpu],
+        'semilla': semilla,
+        'segundos': time.perf_counter() - inicio,
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    np.savez_compressed(
+        ruta,
+        **{f'eje_{nombre}': eje for nombre, eje in zip(sistema.ENTRADAS, ejes)},
+        aleatorias=entradas[len(entradas) - aleatorias:],
+        salidas=salidas,
+        codigos=np.column_stack([sistema._codificar_uso_gpu(salidas[:, 0]),
+                                 sistema._codificar_temperatura(salidas[:, 1])]).astype(np.uint8),
+        metadatos=np.array(json.dumps(metadatos)),
+    )
+    return metadatos
+
+
+def cargar_referencia(ruta):
+    """Carga un archivo de generar_referencia: {'entradas', 'salidas', 'codigos', 'metadatos'}."""
+    with np.load(ruta, allow_pickle=False) as datos:
+        ejes = [datos[f'eje_{nombre}'] for nombre in SistemaDifusoTarjetasGraficas.ENTRADAS]
+        malla = np.stack(np.meshgrid(*ejes, indexing='ij'), axis=-1).reshape(-1, 4)
+        referencia = {
+            'entradas': np.concatenate([malla, datos['aleatorias']]),
+            'salidas': datos['salidas'],
+            'codigos': datos['codigos'],
+            'metadatos': json.loads(str(datos['metadatos'])),
+        }
+    if len(referencia['entradas']) != len(referencia['salidas']):
+        raise ValueError(f"{ruta}: la malla y las salidas de referencia no coinciden")
+    return referencia
+
+
+def verificar(sistema, referencia, via='lote', tolerancia=1e-6, tolerancia_etiquetas=0.0, peores=10,
+              pasadas=1):
+    """Compara las salidas del sistema con la referencia y retorna un informe.
+
+    via: 'lote' (obtener_predicciones_lote) o 'puntual' (obtener_resultado por fila, que pasa por
+    el motor configurado y las cachés; con pasadas > 1 la segunda pasada se responde desde la caché).
+    tolerancia: error absoluto máximo admitido en cada salida.
+    tolerancia_etiquetas: fracción máxima de puntos con etiqueta distinta a la de referencia.
+    El informe incluye, por salida, el error máximo, medio y los `peores` puntos.
+    """
+    if via not in EVALUACIONES:
+        raise ValueError(f"Vía de evaluación desconocida: {via}. Opciones: {', '.join(EVALUACIONES)}")
+    entradas, esperadas = referencia['entradas'], referencia['salidas']
+
+    informe = {'via': via, 'motor': sistema.motor, 'defuzzificacion': sistema.defuzzificacion,
+               'puntos': len(entradas), 'tolerancia': tolerancia,
+               'tolerancia_etiquetas': tolerancia_etiquetas, 'pasadas': []}
+    for _ in range(pasadas):
+        inicio = time.perf_counter()
+        obtenidas = EVALUACIONES[via](sistema, entradas)
+        segundos = time.perf_counter() - inicio
+        codigos = np.column_stack([sistema._codificar_uso_gpu(obtenidas[:, 0]),
+                                   sistema._codificar_temperatura(obtenidas[:, 1])])
+        # Un NaN cuenta como error infinito
+        errores = np.nan_to_num(np.abs(obtenidas - esperadas), nan=np.inf)
+
+        pasada = {'segundos': segundos}
+        for s, salida in enumerate(SALIDAS):
+            e = errores[:, s]
+            orden = np.argsort(-e, kind='stable')[:peores]
+            pasada[salida] = {
+                'error_maximo': float(e.max()),
+                'error_medio': float(e.mean()),
+                'fuera_de_tolerancia': int((e > tolerancia).sum()),
+                'etiquetas_distintas': int((codigos[:, s] != referencia['codigos'][:, s]).sum()),
+                'peores': [
+                    {'entrada': dict(zip(sistema.ENTRADAS, entradas[i].tolist())),
+                     'esperado': float(esperadas[i, s]), 'obtenido': float(obtenidas[i, s]), 'error': float(e[i])}
+                    for i in orden.tolist()
+                ],
+            }
+        pasada['ok'] = all(
+            pasada[salida]['fuera_de_tolerancia'] == 0
+            and pasada[salida]['etiquetas_distintas'] <= tolerancia_etiquetas * len(entradas)
+            for salida in SALIDAS
+        )
+        informe['pasadas'].append(pasada)
+    informe['ok'] = all(p['ok'] for p in informe['pasadas'])
+    return informe
+
+
+def _informar_progreso(hechos, total):
+    print(f"{hechos}/{total} puntos", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera salidas de referencia y verifica motores y cachés contra ellas.")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    generar = subcomandos.add_parser('generar', help="Calcula la referencia (por defecto con skfuzzy)")
+    generar.add_argument('ruta', help="Archivo .npz de salida")
+    generar.add_argument('--motor', default='skfuzzy', choices=SistemaDifusoTarjetasGraficas.MOTORES)
+    generar.add_argument('--paso-configuracion', type=int, default=25)
+    generar.add_argument('--paso-fps', type=int, default=30)
+    generar.add_argument('--paso-gpu', type=int, default=25)
+    generar.add_argument('--aleatorias', type=int, default=500, help="Puntos aleatorios además de la malla")
+    generar.add_argument('--procesos', type=int, default=1)
+
+    verificar_ = subcomandos.add_parser('verificar', help="Compara un motor con la referencia (sale con 1 si falla)")
+    verificar_.add_argument('ruta', help="Archivo .npz generado con 'generar'")
+    verificar_.add_argument('--motor', default='vectorizado', choices=SistemaDifusoTarjetasGraficas.MOTORES)
+    verificar_.add_argument('--via', default='lote', choices=tuple(EVALUACIONES))
+    verificar_.add_argument('--tolerancia', type=float, default=1e-6)
+    verificar_.add_argument('--tolerancia-etiquetas', type=float, default=0.0,
+                            help="Fracción máxima de puntos con etiqueta distinta")
+    verificar_.add_argument('--pasadas', type=int, default=1, help="Con --via puntual, 2 verifica también la caché")
+    verificar_.add_argument('--cuantizacion', type=float, default=None)
+    verificar_.add_argument('--ruta-tabla', default=None)
+    verificar_.add_argument('--peores', type=int, default=10)
+
+    for subcomando in (generar, verificar_):
+        subcomando.add_argument('--defuzzificacion', default='muestreado',
+                                choices=SistemaDifusoTarjetasGraficas.DEFUZZIFICACIONES)
+        subcomando.add_argument('--ruta-compilado', default=None, help="Artefacto del sistema compilado a reutilizar")
+    args = parser.parse_args(argv)
+
+    if args.comando == 'generar':
+        metadatos = generar_referencia(
+            args.ruta, args.paso_configuracion, args.paso_fps, args.paso_gpu, args.aleatorias,
+            procesos=args.procesos, informar=_informar_progreso, motor=args.motor,
+            defuzzificacion=args.defuzzificacion, ruta_compilado=args.ruta_compilado,
+        )
+        print(json.dumps(metadatos, indent=2))
+        return
+
+    referencia = cargar_referencia(args.ruta)
+    sistema = SistemaDifusoTarjetasGraficas(
+        motor=args.motor, defuzzificacion=args.defuzzificacion, ruta_compilado=args.ruta_compilado,
+        ruta_tabla=args.ruta_tabla, cuantizacion=args.cuantizacion,
+        tamano_cache=len(referencia['entradas']) if args.pasadas > 1 else 0,
+    )
+    if sistema.huella != referencia['metadatos']['huella']:
+        print("Aviso: la base de reglas o las funciones de pertenencia cambiaron desde que se generó la referencia",
+              file=sys.stderr)
+    informe = verificar(sistema, referencia, args.via, args.tolerancia, args.tolerancia_etiquetas,
+                        args.peores, args.pasadas)
+    print(json.dumps(informe, indent=2, ensure_ascii=False))
+    sys.exit(0 if informe['ok'] else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+import argparse
+import csv
+import itertools
+import sys
+
+import numpy as np
+
+# Columnas del archivo de reglas: etiquetas de los antecedentes y de los consecuentes
+COLUMNAS = ('res', 'conf', 'fps', 'gpu', 'uso', 'temp')
+
+
+class TablaDecision:
+    """Base de reglas compilada: índices de etiqueta (uso, temperatura) por combinación de antecedentes.
+
+    La tabla tiene forma (4, 4, 4, 4, 2) en el orden de itertools.product de las etiquetas, que es
+    el mismo de reglas_detalladas. Se guarda como CSV de una regla por fila para poder editarla y
+    compararla con diff.
+    """
+
+    def __init__(self, consecuentes, etiquetas_entradas, etiquetas_salidas):
+        """
+        consecuentes: arreglo (etiquetas de cada antecedente..., salidas) con índices en etiquetas_salidas.
+        etiquetas_entradas: listas de etiquetas de resolucion, configuracion, fps_objetivo y potencia_gpu.
+        etiquetas_salidas: listas de etiquetas de uso_gpu y temperatura.
+        """
+        self.etiquetas_entradas = [list(e) for e in etiquetas_entradas]
+        self.etiquetas_salidas = [list(e) for e in etiquetas_salidas]
+        forma = tuple(len(e) for e in self.etiquetas_entradas) + (len(self.etiquetas_salidas),)
+        self.consecuentes = np.array(consecuentes, dtype=np.intp)
+        if self.consecuentes.shape != forma:
+            raise ValueError(f"La tabla de decisión debe tener forma {forma}, tiene {self.consecuentes.shape}")
+        for s, etiquetas in enumerate(self.etiquetas_salidas):
+            if not ((self.consecuentes[..., s] >= 0) & (self.consecuentes[..., s] < len(etiquetas))).all():
+                raise ValueError("La tabla de decisión tiene índices de consecuente fuera de rango")
+        self.consecuentes.flags.writeable = False
+
+    @classmethod
+    def desde_funcion(cls, evaluar, etiquetas_entradas, etiquetas_salidas):
+        """Compila la tabla llamando a evaluar(res, conf, fps, gpu) -> (uso, temp) una vez por combinación."""
+        forma = tuple(len(e) for e in etiquetas_entradas)
+        consecuentes = [
+            [etiquetas.index(etiqueta) for etiquetas, etiqueta in zip(etiquetas_salidas, evaluar(*combinacion))]
+            for combinacion in itertools.product(*etiquetas_entradas)
+        ]
+        return cls(np.reshape(consecuentes, forma + (len(etiquetas_salidas),)), etiquetas_entradas, etiquetas_salidas)
+
+    @classmethod
+    def cargar(cls, ruta, etiquetas_entradas, etiquetas_salidas):
+        """Carga la tabla de un CSV con columnas res, conf, fps, gpu, uso y temp (una fila por regla)."""
+        indices_entradas = [{e: i for i, e in enumerate(etiquetas)} for etiquetas in etiquetas_entradas]
+        indices_salidas = [{e: i for i, e in enumerate(etiquetas)} for etiquetas in etiquetas_salidas]
+        forma = tuple(len(e) for e in etiquetas_entradas)
+        consecuentes = np.full(forma + (len(etiquetas_salidas),), -1, dtype=np.intp)
+
+        with open(ruta, newline='', encoding='utf-8') as f:
+            lector = csv.DictReader(f)
+            faltantes = [c for c in COLUMNAS if c not in (lector.fieldnames or [])]
+            if faltantes:
+                raise ValueError(f"{ruta}: faltan columnas {', '.join(faltantes)}")
+            for linea, fila in enumerate(lector, start=2):
+                try:
+                    posicion = tuple(indices[fila[c]] for indices, c in zip(indices_entradas, COLUMNAS[:4]))
+                    valores = [indices[fila[c]] for indices, c in zip(indices_salidas, COLUMNAS[4:])]
+                except KeyError as e:
+                    raise ValueError(f"{ruta}:{linea}: etiqueta desconocida {e}") from None
+                if consecuentes[posicion][0] != -1:
+                    raise ValueError(f"{ruta}:{linea}: regla repetida para {', '.join(fila[c] for c in COLUMNAS[:4])}")
+                consecuentes[posicion] = valores
+        if (consecuentes == -1).any():
+            raise ValueError(f"{ruta}: faltan {int((consecuentes[..., 0] == -1).sum())} reglas")
+        return cls(consecuentes, etiquetas_entradas, etiquetas_salidas)
+
+    def guardar(self, ruta):
+        """Escribe la tabla como CSV, una regla por fila en el orden de reglas_detalladas."""
+        with open(ruta, 'w', newline='', encoding='utf-8') as f:
+            escritor = csv.writer(f)
+            escritor.writerow(COLUMNAS)
+            escritor.writerows(self.filas())
+
+    def consecuente(self, res, conf, fps, gpu):
+        """Etiquetas (uso, temp) de la regla con esos antecedentes."""
+        posicion = tuple(e.index(x) for e, x in zip(self.etiquetas_entradas, (res, conf, fps, gpu)))
+        return tuple(e[i] for e, i in zip(self.etiquetas_salidas, self.consecuentes[posicion].tolist()))
+
+    def filas(self):
+        """Genera (res, conf, fps, gpu, uso, temp) de cada regla en el orden de itertools.product."""
+        for combinacion, indices in zip(itertools.product(*self.etiquetas_entradas),
+                                        self.consecuentes.reshape(-1, len(self.etiquetas_salidas)).tolist()):
+            yield combinacion + tuple(e[i] for e, i in zip(self.etiquetas_salidas, indices))
+
+    def diferencias(self, otra):
+        """Reglas cuyo consecuente cambia de esta tabla a `otra`: lista de (número de regla, antes, después)."""
+        if otra.etiquetas_entradas != self.etiquetas_entradas or otra.etiquetas_salidas != self.etiquetas_salidas:
+            raise ValueError("Las tablas de decisión usan etiquetas distintas")
+        planas = self.consecuentes.reshape(-1, len(self.etiquetas_salidas))
+        otras = otra.consecuentes.reshape(-1, len(self.etiquetas_salidas))
+        cambios = np.flatnonzero((planas != otras).any(axis=1))
+        filas_antes = list(self.filas())
+        filas_despues = list(otra.filas())
+        return [(int(i), filas_antes[i], filas_despues[i]) for i in cambios]
+
+    def __eq__(self, otra):
+        return isinstance(otra, TablaDecision) and not self.diferencias(otra)
+
+    __hash__ = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta o compara bases de reglas en formato CSV.")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+    exportar = subcomandos.add_parser('exportar', help="Escribe la base de reglas incorporada como CSV")
+    exportar.add_argument('ruta')
+    comparar = subcomandos.add_parser('comparar', help="Lista las reglas que cambian entre dos archivos")
+    comparar.add_argument('antes')
+    comparar.add_argument('despues')
+    args = parser.parse_args(argv)
+
+    from .SistemaDF import SistemaDifusoTarjetasGraficas as Sistema
+    etiquetas_entradas, etiquetas_salidas = Sistema.ETIQUETAS_ENTRADAS, Sistema.ETIQUETAS_SALIDAS
+    if args.comando == 'exportar':
+        # No hace falta construir el sistema: la base incorporada es una función de las etiquetas
+        TablaDecision.desde_funcion(Sistema._evaluar_salida_, etiquetas_entradas, etiquetas_salidas).guardar(args.ruta)
+        return
+    antes = TablaDecision.cargar(args.antes, etiquetas_entradas, etiquetas_salidas)
+    despues = TablaDecision.cargar(args.despues, etiquetas_entradas, etiquetas_salidas)
+    for numero, fila_antes, fila_despues in antes.diferencias(despues):
+        print(f"Regla {numero + 1} ({', '.join(fila_antes[:4])}): "
+              f"{'/'.join(fila_antes[4:])} -> {'/'.join(fila_despues[4:])}")
+    sys.exit(1 if antes != despues else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+import bisect
+import re
+
+import numpy as np
+
+# Resoluciones con sus valores en el universo difuso (el orden es el del selector de la interfaz)
+RESOLUCIONES = {
+    # Resoluciones clásicas (4:3) - BAJA (0-30)
+    "640×480 (VGA)": 10,
+    "800×600 (SVGA)": 15,
+    "1024×768 (XGA)": 20,
+    "1280×1024 (SXGA)": 25,
+    "1600×1200 (UXGA)": 30,
+
+    # Resoluciones HD y widescreen (16:9/16:10) - MEDIA (20-50)
+    "1366×768 (HD)": 35,
+    "1440×900 (WXGA+)": 40,
+    "1600×900 (HD+)": 45,
+    "1680×1050 (WSXGA+)": 50,
+    "1920×1080 (Full HD)": 55,
+    "1920×1200 (WUXGA)": 60,
+
+    # Resoluciones 2K, 3K - ALTA (40-70)
+    "2560×1440 (QHD/2K)": 65,
+    "2560×1600 (WQXGA)": 70,
+    "2880×1800 (3K Retina)": 75,
+    "3200×1800 (QHD+)": 80,
+
+    # Resoluciones 4K y superiores - ULTRA (60-100)
+    "3840×2160 (4K UHD)": 85,
+    "4096×2160 (DCI 4K)": 90,
+    "5120×2880 (5K)": 95,
+    "6016×3384 (6K)": 98,
+    "7680×4320 (8K UHD)": 100,
+
+    # Ultrawide
+    "2560×1080 (UW-FHD)": 50,
+    "3440×1440 (UW-QHD)": 70,
+    "3840×1600 (UW-QHD+)": 80,
+    "5120×1440 (Dual QHD)": 85,
+    "5120×2160 (5K Ultrawide)": 95
+}
+
+# "1920×1080", "1920x1080" o "1920 x 1080 (Full HD)"
+_PATRON_DIMENSIONES = re.compile(r'^\s*(\d+)\s*[×xX*]\s*(\d+)\b')
+
+# Lado máximo admitido en píxeles (holgado frente a 8K/16K, pero acota ancho*alto)
+LADO_MAXIMO = 100_000
+
+
+def parsear_dimensiones(texto):
+    """Retorna (ancho, alto) de un texto "W×H" (admite x y una etiqueta al final) o None si no lo es.
+
+    ValueError si tiene forma W×H pero algún lado es 0 o mayor que LADO_MAXIMO.
+    """
+    coincidencia = _PATRON_DIMENSIONES.match(texto)
+    if coincidencia is None:
+        return None
+    ancho, alto = int(coincidencia.group(1)), int(coincidencia.group(2))
+    if not (0 < ancho <= LADO_MAXIMO and 0 < alto <= LADO_MAXIMO):
+        raise ValueError(f"Dimensiones fuera de rango (1-{LADO_MAXIMO} píxeles por lado): {texto}")
+    return ancho, alto
+
+
+class CatalogoResoluciones:
+    """Catálogo de resoluciones con búsqueda por nombre, por valor más cercano y por dimensiones W×H.
+
+    Se construye una vez: guarda un índice ordenado de valores para las búsquedas con bisect y
+    la curva píxeles -> valor con la que se estiman resoluciones fuera del catálogo.
+    """
+
+    def __init__(self, resoluciones=RESOLUCIONES):
+        self.resoluciones = dict(resoluciones)
+        self.nombres = list(self.resoluciones)
+
+        # Valores distintos ordenados; para cada uno, el primer nombre del catálogo que lo tiene
+        primero = {}
+        for orden, (nombre, valor) in enumerate(self.resoluciones.items()):
+            primero.setdefault(valor, (orden, nombre))
+        self._valores = sorted(primero)
+        self._nombres_por_valor = [primero[v][1] for v in self._valores]
+        self._orden_por_valor = [primero[v][0] for v in self._valores]
+
+        # Valor de cada W×H del catálogo (el primer nombre que lo tiene), para que "1280×1024" y
+        # "1280×1024 (SXGA)" coincidan aunque el valor no esté sobre la curva de píxeles
+        self._valores_por_dimensiones = {}
+        for nombre, valor in self.resoluciones.items():
+            dimensiones = parsear_dimensiones(nombre)
+            if dimensiones is not None:
+                self._valores_por_dimensiones.setdefault(dimensiones, valor)
+
+        # Curva monótona log(píxeles) -> valor a partir de las entradas del catálogo con dimensiones
+        puntos = sorted((ancho * alto, valor) for (ancho, alto), valor in self._valores_por_dimensiones.items())
+        self._log_pixeles = np.log([p for p, _ in puntos])
+        # Las resoluciones 4:3 tienen valores menores que widescreen con menos píxeles; se toma la envolvente
+        self._valores_pixeles = np.maximum.accumulate([v for _, v in puntos]).astype(np.float64)
+
+    def __len__(self):
+        return len(self.resoluciones)
+
+    def __contains__(self, nombre):
+        return nombre in self.resoluciones
+
+    def valor_por_dimensiones(self, ancho, alto):
+        """Valor de unas dimensiones: el del catálogo si alguna entrada las tiene; si no, estimado por
+        número de píxeles, interpolando en escala logarítmica entre el catálogo."""
+        valor = self._valores_por_dimensiones.get((ancho, alto))
+        if valor is not None:
+            return float(valor)
+        return float(np.interp(np.log(float(ancho) * float(alto)), self._log_pixeles, self._valores_pixeles))
+
+    def valor(self, nombre):
+        """Valor de un nombre del catálogo o de un texto "W×H" arbitrario; ValueError si no es ninguno."""
+        valor = self.resoluciones.get(nombre)
+        if valor is not None:
+            return valor
+        dimensiones = parsear_dimensiones(nombre) if isinstance(nombre, str) else None
+        if dimensiones is None:
+            raise ValueError(f"Resolución desconocida: {nombre}")
+        return self.valor_por_dimensiones(*dimensiones)
+
+    def valores(self, nombres):
+        """Versión vectorizada de valor: resuelve cada nombre distinto una sola vez."""
+        unicos, inversos = np.unique(np.asarray(nombres, dtype=str), return_inverse=True)
+        return np.array([self.valor(nombre) for nombre in unicos.tolist()], dtype=np.float64)[inversos]
+
+    def nombre_mas_cercano(self, valor):
+        """Nombre del catálogo con el valor más cercano; en empate, el que aparece primero en el catálogo."""
+        i = bisect.bisect_left(self._valores, valor)
+        if i == 0:
+            return self._nombres_por_valor[0]
+        if i == len(self._valores):
+            return self._nombres_por_valor[-1]
+        distancia_izquierda = valor - self._valores[i - 1]
+        distancia_derecha = self._valores[i] - valor
+        if distancia_izquierda < distancia_derecha or (
+                distancia_izquierda == distancia_derecha
+                and self._orden_por_valor[i - 1] < self._orden_por_valor[i]):
+            return self._nombres_por_valor[i - 1]
+        return self._nombres_por_valor[i]
+
+
+# Catálogo compartido por el sistema difuso, la interfaz y los procesos por lotes
+CATALOGO_RESOLUCIONES = CatalogoResoluciones()
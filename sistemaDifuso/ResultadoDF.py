@@ -0,0 +1,118 @@
+import numpy as np
+
+
+class ResultadoPrediccion:
+    """Resultado de una predicción: salidas crisp, pertenencias de las entradas y fuerza de cada regla.
+
+    Las pertenencias y fuerzas vienen de la misma fuzzificación del motor que calculó las salidas;
+    si el motor no fuzzifica (tabla), se calculan al leerlas por primera vez. Los textos para la
+    interfaz también se construyen solo cuando se piden; todo queda guardado.
+    """
+
+    __slots__ = ('uso_gpu', 'temperatura', '_activaciones', '_fuerza_reglas', '_valores', '_motor',
+                 '_sistema', '_reglas', '_texto_prediccion', '_texto_activaciones')
+
+    def __init__(self, sistema, uso_gpu, temperatura, activaciones=None, fuerza_reglas=None, valores=None):
+        """
+        sistema: SistemaDifusoTarjetasGraficas que produjo el resultado (etiquetas y reglas).
+        uso_gpu, temperatura: valores crisp de las salidas.
+        activaciones: matriz (antecedentes x etiquetas) de pertenencias, en el orden de ENTRADAS;
+            None para fuzzificar `valores` al leerla.
+        fuerza_reglas: fuerza de disparo de cada regla, en el orden de reglas_detalladas;
+            None para calcularla desde las activaciones al leerla.
+        valores: las cuatro entradas crisp, en el orden de ENTRADAS (solo si se omiten las activaciones).
+        """
+        if activaciones is None and valores is None:
+            raise ValueError("Se necesitan las activaciones o los valores de entrada")
+        self.uso_gpu = np.float64(uso_gpu)
+        self.temperatura = np.float64(temperatura)
+        self._activaciones = activaciones
+        self._fuerza_reglas = fuerza_reglas
+        self._valores = valores
+        self._sistema = sistema
+        # Las reglas y el motor vigentes al calcular el resultado (una recarga los reemplaza, no los modifica)
+        self._reglas = sistema.reglas_detalladas
+        self._motor = sistema.motor_vectorizado
+        self._texto_prediccion = None
+        self._texto_activaciones = None
+
+    @property
+    def activaciones(self):
+        if self._activaciones is None:
+            self._activaciones = np.vstack(self._motor.fuzzificar([self._valores]))
+        return self._activaciones
+
+    @property
+    def fuerza_reglas(self):
+        if self._fuerza_reglas is None:
+            self._fuerza_reglas = self._motor.activar_reglas([fila[None, :] for fila in self.activaciones])[0]
+        return self._fuerza_reglas
+
+    def a_bytes(self):
+        """Serialización compacta para cachés compartidas: salidas y pertenencias en float64."""
+        return np.concatenate([[self.uso_gpu, self.temperatura], np.ravel(self.activaciones)]).astype('<f8').tobytes()
+
+    @classmethod
+    def desde_bytes(cls, sistema, datos):
+        """Reconstruye un resultado de a_bytes; la fuerza de las reglas se recalcula al leerla."""
+        valores = np.frombuffer(datos, dtype='<f8')
+        antecedentes = len(sistema.ENTRADAS)
+        if len(valores) < 2 or (len(valores) - 2) % antecedentes:
+            raise ValueError("Datos de resultado serializado inválidos")
+        return cls(sistema, valores[0], valores[1], valores[2:].reshape(antecedentes, -1).copy())
+
+    @property
+    def etiqueta_uso_gpu(self):
+        return self._sistema._convertir_uso_gpu_a_etiqueta(self.uso_gpu)
+
+    @property
+    def etiqueta_temperatura(self):
+        return self._sistema._convertir_temperatura_a_etiqueta(self.temperatura)
+
+    def activaciones_por_etiqueta(self):
+        """Pertenencias como {antecedente: {etiqueta: grado}}."""
+        sistema = self._sistema
+        etiquetas = (sistema.res_labels, sistema.conf_labels, sistema.fps_labels, sistema.gpu_labels)
+        return {
+            nombre: dict(zip(e, fila.tolist()))
+            for nombre, e, fila in zip(sistema.ENTRADAS, etiquetas, self.activaciones)
+        }
+
+    def activaciones_salidas(self):
+        """Nivel de corte de cada etiqueta de salida: {'uso_gpu': ..., 'temperatura': ...} en el orden de las etiquetas."""
+        uso_gpu, temperatura = self._motor.acumular(self.fuerza_reglas[None, :])
+        return {'uso_gpu': uso_gpu[0], 'temperatura': temperatura[0]}
+
+    def reglas_principales(self, cantidad=3):
+        """Las reglas con mayor fuerza de disparo (solo las que disparan), de mayor a menor."""
+        cantidad = min(cantidad, len(self.fuerza_reglas))
+        indices = np.argpartition(-self.fuerza_reglas, cantidad - 1)[:cantidad]
+        indices = indices[np.argsort(-self.fuerza_reglas[indices], kind='stable')]
+        return [
+            dict(self._reglas[i], fuerza=float(self.fuerza_reglas[i]))
+            for i in indices.tolist() if self.fuerza_reglas[i] > 0
+        ]
+
+    def texto_prediccion(self):
+        """Frase con las etiquetas y valores de uso de GPU y temperatura."""
+        if self._texto_prediccion is None:
+            self._texto_prediccion = (
+                "El Uso de GPU es " + self.etiqueta_uso_gpu + " (" + str(self.uso_gpu.round(2)) + "%) "
+                "y la Temperatura es " + self.etiqueta_temperatura + " (" + str(self.temperatura.round(2)) + "°C)"
+            )
+        return self._texto_prediccion
+
+    def texto_activaciones(self):
+        """Texto con las activaciones de cada etiqueta de entrada."""
+        if self._texto_activaciones is None:
+            resolucion, configuracion, fps, gpu = (
+                ", ".join(f"{etiqueta}={grado:.2f}" for etiqueta, grado in grados.items())
+                for grados in self.activaciones_por_etiqueta().values()
+            )
+            self._texto_activaciones = (
+                f"\n   Resolución activaciones: {resolucion}"
+                f"\n   Configuración activaciones: {configuracion}"
+                f"\n    FPS activaciones: {fps}"
+                f"\n    GPU activaciones: {gpu}"
+            )
+        return self._texto_activaciones
@@ -1,71 +1,153 @@
 import numpy as np
 import skfuzzy as fuzz
 from skfuzzy import control as ctrl
+import copy
 import itertools
 import random
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-
+import threading
+import time
+from contextlib import contextmanager
+
+from .MotorDF import MotorMamdaniVectorizado
+from .SugenoDF import MotorSugenoOrdenCero
+from .TablaDF import TablaSuperficieControl
+from .CacheDF import CacheDosNiveles, CacheLRU
+from .GraficosDF import RenderizadorPertenencias, deserializar_graficos, serializar_graficos
+from .PoolDF import PoolSimuladores
+from .CompiladoDF import ATRIBUTOS_COMPILADOS, cargar_compilado, guardar_compilado, huella_sistema
+from .MetricasDF import metricas
+from .ResolucionesDF import CATALOGO_RESOLUCIONES
+from .ResultadoDF import ResultadoPrediccion
+from .ReglasDF import TablaDecision
+from .IncrementalDF import SesionIncremental
 
 
 class SistemaDifusoTarjetasGraficas:
     """Clase que maneja toda la lógica del sistema difuso para recomendación de tarjetas gráficas."""
 
-    def __init__(self):
-        self.res_labels = ['baja', 'media', 'alta', 'ultra']
-        self.conf_labels = ['baja', 'media', 'alta', 'ultra']
-        self.fps_labels = ['conservador', 'estandar', 'competitivo', 'extremo']
-        self.gpu_labels = ['baja', 'media', 'alta', 'ultra']
-
-        self.uso_labels = ['baja', 'media', 'alta', 'critico']
-        self.temp_labels = ['normal', 'tibio', 'caliente', 'critica']
-
-        # Diccionario de resoluciones con sus valores en el universo difuso
-        self.resoluciones = {
-            # Resoluciones clásicas (4:3) - BAJA (0-30)
-            "640×480 (VGA)": 10,
-            "800×600 (SVGA)": 15,
-            "1024×768 (XGA)": 20,
-            "1280×1024 (SXGA)": 25,
-            "1600×1200 (UXGA)": 30,
-            
-            # Resoluciones HD y widescreen (16:9/16:10) - MEDIA (20-50)
-            "1366×768 (HD)": 35,
-            "1440×900 (WXGA+)": 40,
-            "1600×900 (HD+)": 45,
-            "1680×1050 (WSXGA+)": 50,
-            "1920×1080 (Full HD)": 55,
-            "1920×1200 (WUXGA)": 60,
-            
-            # Resoluciones 2K, 3K - ALTA (40-70)
-            "2560×1440 (QHD/2K)": 65,
-            "2560×1600 (WQXGA)": 70,
-            "2880×1800 (3K Retina)": 75,
-            "3200×1800 (QHD+)": 80,
-            
-            # Resoluciones 4K y superiores - ULTRA (60-100)
-            "3840×2160 (4K UHD)": 85,
-            "4096×2160 (DCI 4K)": 90,
-            "5120×2880 (5K)": 95,
-            "6016×3384 (6K)": 98,
-            "7680×4320 (8K UHD)": 100,
-            
-            # Ultrawide
-            "2560×1080 (UW-FHD)": 50,
-            "3440×1440 (UW-QHD)": 70,
-            "3840×1600 (UW-QHD+)": 80,
-            "5120×1440 (Dual QHD)": 85,
-            "5120×2160 (5K Ultrawide)": 95
-        }
+    # Motores de inferencia disponibles para obtener_prediccion
+    MOTORES = ('skfuzzy', 'vectorizado', 'tabla', 'sugeno')
+
+    # Métodos de defuzzificación del motor vectorizado
+    DEFUZZIFICACIONES = ('muestreado', 'analitico')
+
+    # Atributos, además de los compilados de skfuzzy, que recargar_reglas reemplaza juntos
+    _ATRIBUTOS_REGLAS = ('tabla_decision', 'reglas_detalladas', 'huella', 'motor_vectorizado', 'motor_sugeno',
+                         'pool', 'tabla')
+
+    # Antecedentes en el orden de las columnas de obtener_predicciones_lote
+    ENTRADAS = ('resolucion', 'configuracion', 'fps_objetivo', 'potencia_gpu')
+
+    # Etiquetas de los antecedentes (en el orden de ENTRADAS) y de las salidas uso_gpu y temperatura
+    ETIQUETAS_ENTRADAS = (
+        ('baja', 'media', 'alta', 'ultra'),
+        ('baja', 'media', 'alta', 'ultra'),
+        ('conservador', 'estandar', 'competitivo', 'extremo'),
+        ('baja', 'media', 'alta', 'ultra'),
+    )
+    ETIQUETAS_SALIDAS = (
+        ('baja', 'media', 'alta', 'critico'),
+        ('normal', 'tibio', 'caliente', 'critica'),
+    )
+
+    # Límites superiores (inclusivos) de las etiquetas de salida, salvo la última
+    UMBRALES_USO_GPU = (25, 50, 75)
+    UMBRALES_TEMPERATURA = (60, 70, 85)
+
+    def __init__(self, motor='skfuzzy', ruta_tabla=None, tamano_cache=1024, cuantizacion=None,
+                 tamano_cache_graficos=64, tamano_pool=0, timeout_pool=None, ruta_compilado=None,
+                 mostrar_reglas=False, defuzzificacion='muestreado', tamano_cache_superficies=16,
+                 ruta_reglas=None, cache_compartido=None):
+        if motor not in self.MOTORES:
+            raise ValueError(f"Motor desconocido: {motor}. Opciones: {', '.join(self.MOTORES)}")
+        if defuzzificacion not in self.DEFUZZIFICACIONES:
+            raise ValueError(f"Defuzzificación desconocida: {defuzzificacion}. "
+                             f"Opciones: {', '.join(self.DEFUZZIFICACIONES)}")
+        self.motor = motor
+        self.defuzzificacion = defuzzificacion
+        self.mostrar_reglas = mostrar_reglas
+
+        # Caché LRU de resultados de obtener_prediccion (0 la desactiva)
+        self.cache = CacheLRU(tamano_cache) if tamano_cache else None
+        self.cuantizacion = cuantizacion
+        # Caché de gráficos en memoria (bytes PNG/SVG por entrada y formato)
+        self.cache_graficos = CacheLRU(tamano_cache_graficos) if tamano_cache_graficos else None
+        # Caché de superficies 2-D por ejes barridos, valores fijos y mallas
+        self.cache_superficies = CacheLRU(tamano_cache_superficies) if tamano_cache_superficies else None
+        # Nivel compartido entre workers (CacheRedis) detrás de las cachés de predicciones y gráficos
+        self.cache_compartido = cache_compartido
+        # Renderizadores de gráficos por salida, con el fondo estático reutilizable
+        self._renderizadores = {}
+        self._lock_renderizadores = threading.Lock()
+        if cache_compartido is not None:
+            if self.cache is not None:
+                self.cache = CacheDosNiveles(
+                    self.cache, cache_compartido, 'prediccion', self._version_cache,
+                    ResultadoPrediccion.a_bytes, lambda datos: ResultadoPrediccion.desde_bytes(self, datos))
+            if self.cache_graficos is not None:
+                self.cache_graficos = CacheDosNiveles(
+                    self.cache_graficos, cache_compartido, 'graficos', self._version_cache,
+                    serializar_graficos, deserializar_graficos)
+
+        self.res_labels, self.conf_labels, self.fps_labels, self.gpu_labels = map(list, self.ETIQUETAS_ENTRADAS)
+        self.uso_labels, self.temp_labels = map(list, self.ETIQUETAS_SALIDAS)
+
+        # Consecuentes de las 256 reglas: del archivo indicado o de la base incorporada (_evaluar_salida_)
+        if ruta_reglas is None:
+            self.tabla_decision = TablaDecision.desde_funcion(
+                self._evaluar_salida_, self.ETIQUETAS_ENTRADAS, self.ETIQUETAS_SALIDAS)
+        else:
+            self.tabla_decision = TablaDecision.cargar(ruta_reglas, self.ETIQUETAS_ENTRADAS, self.ETIQUETAS_SALIDAS)
+        # Se incrementa con cada recarga de reglas; los resultados de otra generación no se guardan en caché
+        self._generacion_reglas = 0
+        # Protege la generación: su cambio junto con la publicación de las reglas y cada guardado en caché
+        self._lock_generacion = threading.Lock()
+        self._lock_recarga = threading.Lock()
+        self.ruta_compilado = ruta_compilado
+        self.ruta_tabla = ruta_tabla
+
+        # Catálogo de resoluciones con sus valores en el universo difuso
+        self.catalogo_resoluciones = CATALOGO_RESOLUCIONES
+        self.resoluciones = self.catalogo_resoluciones.resoluciones
 
         self._configurar_universos()
         self._configurar_variables()
         self._configurar_conjuntos_difusos()
         self._configurar_salidas()
         self.reglas_detalladas, self.rules = self._generar_reglas()
+        self._construir_simulador(ruta_compilado)
+        self.motor_vectorizado = MotorMamdaniVectorizado.desde_sistema(self, defuzzificacion)
+        # Aproximación Sugeno de orden cero con las mismas reglas (ver SugenoDF.informe_desviacion)
+        self.motor_sugeno = MotorSugenoOrdenCero(self.motor_vectorizado)
+
+        # Sin pool, el simulador compartido se usa con exclusión mutua
+        self._lock_simulador = threading.Lock()
+        self.tamano_pool = tamano_pool
+        self.timeout_pool = timeout_pool
+        self.pool = PoolSimuladores(self, tamano_pool, timeout_pool) if tamano_pool else None
+
+        # Superficie precompilada (memoria mapeada si se indica ruta_tabla)
+        self.tabla = None
+        if motor == 'tabla':
+            if ruta_tabla is None:
+                self.tabla = TablaSuperficieControl.compilar(self)
+            else:
+                self.tabla = TablaSuperficieControl.cargar_o_compilar(self, ruta_tabla)
+
+    def _construir_simulador(self, ruta_compilado=None):
+        """Construye el ControlSystem de skfuzzy, o lo carga del artefacto compilado si su huella coincide."""
+        self.huella = huella_sistema(self)
+        if ruta_compilado is not None:
+            compilado = cargar_compilado(ruta_compilado, self.huella)
+            if compilado is not None:
+                for nombre in ATRIBUTOS_COMPILADOS:
+                    setattr(self, nombre, compilado[nombre])
+                return
+
         sistema_ctrl = ctrl.ControlSystem(self.rules)
         self.simulador = ctrl.ControlSystemSimulation(sistema_ctrl)
+        if ruta_compilado is not None:
+            guardar_compilado(self, ruta_compilado, self.huella)
 
     def _configurar_universos(self):
         self.resolucion_universe = np.arange(0, 101, 1)
@@ -104,17 +186,31 @@ class SistemaDifusoTarjetasGraficas:
         self.uso_gpu = ctrl.Consequent(np.arange(0, 101, 1), 'uso_gpu')
         self.temperatura = ctrl.Consequent(np.arange(40, 101, 1), 'temperatura')
 
-        self.uso_gpu['baja'] = fuzz.trapmf(self.uso_gpu.universe, [0, 0, 20, 25])
-        self.uso_gpu['media'] = fuzz.trapmf(self.uso_gpu.universe, [20, 25, 45, 50])
-        self.uso_gpu['alta'] = fuzz.trapmf(self.uso_gpu.universe, [45, 50, 70, 75])
-        self.uso_gpu['critico'] = fuzz.trapmf(self.uso_gpu.universe, [70, 75, 100, 100])
+        # Parámetros [a, b, c, d] de los trapecios de salida (también usados por la defuzzificación analítica)
+        self.trapecios_salida = {
+            'uso_gpu': {
+                'baja': [0, 0, 20, 25],
+                'media': [20, 25, 45, 50],
+                'alta': [45, 50, 70, 75],
+                'critico': [70, 75, 100, 100],
+            },
+            'temperatura': {
+                'normal': [40, 40, 55, 60],
+                'tibio': [55, 60, 65, 70],
+                'caliente': [65, 70, 80, 85],
+                'critica': [80, 85, 100, 100],
+            },
+        }
+
+        for etiqueta, parametros in self.trapecios_salida['uso_gpu'].items():
+            self.uso_gpu[etiqueta] = fuzz.trapmf(self.uso_gpu.universe, parametros)
 
-        self.temperatura['normal'] = fuzz.trapmf(self.temperatura.universe, [40, 40, 55, 60])
-        self.temperatura['tibio'] = fuzz.trapmf(self.temperatura.universe, [55, 60, 65, 70])
-        self.temperatura['caliente'] = fuzz.trapmf(self.temperatura.universe, [65, 70, 80, 85])
-        self.temperatura['critica'] = fuzz.trapmf(self.temperatura.universe, [80, 85, 100, 100])
+        for etiqueta, parametros in self.trapecios_salida['temperatura'].items():
+            self.temperatura[etiqueta] = fuzz.trapmf(self.temperatura.universe, parametros)
 
-    def _evaluar_salida_(self, res, conf, fps, gpu):
+    @staticmethod
+    def _evaluar_salida_(res, conf, fps, gpu):
+        """Base de reglas incorporada; se compila una sola vez en tabla_decision."""
         mapping = {
             'baja': 1, 'media': 2, 'alta': 3, 'ultra': 4,
             'conservador': 1, 'estandar': 2, 'competitivo': 3, 'extremo': 4
@@ -248,6 +344,19 @@ class SistemaDifusoTarjetasGraficas:
 
         return uso, temp 
 
+    @staticmethod
+    def _detallar_regla(i, res, conf, fps, gpu, uso, temp):
+        """Diccionario descriptivo de la regla i (desde 0)."""
+        # Crear descripción de la regla
+        descripcion = (f"Regla {i+1}: SI resolución={res} Y configuración={conf} "
+                    f"Y fps={fps} Y gpu={gpu} ENTONCES uso={uso} Y temperatura={temp}")
+        return {
+            'id': i+1,
+            'entradas': {'res': res, 'conf': conf, 'fps': fps, 'gpu': gpu},
+            'salidas': {'uso': uso, 'temp': temp},
+            'descripcion': descripcion
+        }
+
     def _generar_reglas(self):
         
         rules = []
@@ -257,17 +366,7 @@ class SistemaDifusoTarjetasGraficas:
         for i, (res, conf, fps, gpu) in enumerate(itertools.product(self.res_labels, self.conf_labels, self.fps_labels, self.gpu_labels)):
             uso, temp = self.evaluar_salida(res, conf, fps, gpu)
 
-            
-            # Crear descripción de la regla
-            descripcion = (f"Regla {i+1}: SI resolución={res} Y configuración={conf} "
-                        f"Y fps={fps} Y gpu={gpu} ENTONCES uso={uso} Y temperatura={temp}")
-            
-            reglas_detalladas.append({
-                'id': i+1,
-                'entradas': {'res': res, 'conf': conf, 'fps': fps, 'gpu': gpu},
-                'salidas': {'uso': uso, 'temp': temp},
-                'descripcion': descripcion
-            })
+            reglas_detalladas.append(self._detallar_regla(i, res, conf, fps, gpu, uso, temp))
 
             
 
@@ -281,15 +380,16 @@ class SistemaDifusoTarjetasGraficas:
             
 
         # Mostrar solo 20 reglas aleatorias
-        reglas_aleatorias = random.sample(reglas_detalladas, min(20, len(reglas_detalladas)))
-        for i in reglas_aleatorias:
-            print(i['descripcion'])
+        if self.mostrar_reglas:
+            reglas_aleatorias = random.sample(reglas_detalladas, min(20, len(reglas_detalladas)))
+            for i in reglas_aleatorias:
+                print(i['descripcion'])
 
         return reglas_detalladas, rules
 
     def evaluar_salida(self, res, conf, fps, gpu):
         """Método público para evaluar la salida del sistema difuso."""
-        return self._evaluar_salida_(res, conf, fps, gpu)
+        return self.tabla_decision.consecuente(res, conf, fps, gpu)
   
     def convertir_a_etiqueta(self, valor, tipo):
         """Convierte un valor numérico a su etiqueta difusa correspondiente."""
@@ -333,74 +433,363 @@ class SistemaDifusoTarjetasGraficas:
             else:
                 return 'ultra'
 
-    def obtener_prediccion(self, entrada):
-        """Obtiene la predicción específica de uso de GPU y temperatura usando el simulador de control."""
-        
+    def _evaluar(self, entrada):
+        """Calcula las salidas con el motor seleccionado y arma el ResultadoPrediccion.
+
+        Las pertenencias y fuerzas de las reglas se toman de la misma fuzzificación que usó
+        el motor; el motor de tabla, que no fuzzifica, deja que el resultado las calcule si se leen.
+        """
+        valores = [[entrada['resolucion'], entrada['configuracion'], entrada['fps_objetivo'], entrada['potencia_gpu']]]
+        motor = self.motor_vectorizado
+        if self.motor == 'vectorizado':
+            with metricas.medir('fuzzificacion'):
+                grados = motor.fuzzificar(valores)
+            with metricas.medir('reglas'):
+                fuerza = motor.activar_reglas(grados)
+                activaciones = motor.acumular(fuerza)
+            with metricas.medir('defuzzificacion'):
+                uso_gpu, temperatura = motor.defuzzificar_salidas(activaciones)
+            return ResultadoPrediccion(self, uso_gpu[0], temperatura[0], np.vstack(grados), fuerza[0])
+
+        if self.motor == 'sugeno':
+            with metricas.medir('fuzzificacion'):
+                grados = motor.fuzzificar(valores)
+            with metricas.medir('reglas'):
+                fuerza = motor.activar_reglas(grados)
+                # Promedio ponderado de las constantes de los consecuentes, sin defuzzificar
+                uso_gpu, temperatura = self.motor_sugeno.ponderar(fuerza)
+            return ResultadoPrediccion(self, uso_gpu[0], temperatura[0], np.vstack(grados), fuerza[0])
+
+        if self.motor == 'tabla':
+            with metricas.medir('interpolacion'):
+                uso_gpu, temperatura = self.tabla.interpolar_punto(*valores[0])
+            return ResultadoPrediccion(self, uso_gpu, temperatura, valores=valores[0])
+
+        with self._prestar_simulador() as (simulador, _, _):
+            # skfuzzy fuzzifica, evalúa reglas y defuzzifica dentro de compute()
+            with metricas.medir('inferencia_skfuzzy'):
+                self._simular(simulador, entrada)
+            antecedentes = {a.label: a for a in simulador.ctrl.antecedents}
+            grados = [
+                np.array([[antecedentes[nombre][e].membership_value[simulador] for e in etiquetas]])
+                for nombre, etiquetas in zip(self.ENTRADAS, (self.res_labels, self.conf_labels,
+                                                             self.fps_labels, self.gpu_labels))
+            ]
+            uso_gpu, temperatura = simulador.output['uso_gpu'], simulador.output['temperatura']
+        # skfuzzy usa el mínimo como AND, igual que activar_reglas
+        return ResultadoPrediccion(self, uso_gpu, temperatura, np.vstack(grados), motor.activar_reglas(grados)[0])
+
+    @contextmanager
+    def _prestar_simulador(self):
+        """Entrega (simulador, uso_gpu, temperatura) de uso exclusivo: del pool o el compartido con lock."""
+        inicio = time.perf_counter()
+        if self.pool is not None:
+            with self.pool.prestar() as elemento:
+                metricas.observar('espera_simulador', time.perf_counter() - inicio)
+                yield elemento
+        else:
+            with self._lock_simulador:
+                metricas.observar('espera_simulador', time.perf_counter() - inicio)
+                yield self.simulador, self.uso_gpu, self.temperatura
+
+    def _guardar_en_cache(self, cache, clave, valor, generacion):
+        """Guarda en la caché solo si la base de reglas no cambió desde `generacion` (ver recargar_reglas)."""
+        with self._lock_generacion:
+            if generacion == self._generacion_reglas:
+                cache.guardar(clave, valor)
+
+    def _simular(self, simulador, entrada):
+        """Ejecuta un ControlSystemSimulation de skfuzzy para una entrada."""
         # Resetear el simulador para evitar acumulación de estado entre ejecuciones
-        self.simulador.reset()
+        simulador.reset()
         # Configurar las entradas del simulador
-        self.simulador.input['resolucion'] = entrada['resolucion']
-        self.simulador.input['configuracion'] = entrada['configuracion']
-        self.simulador.input['fps_objetivo'] = entrada['fps_objetivo']
-        self.simulador.input['potencia_gpu'] = entrada['potencia_gpu']
+        simulador.input['resolucion'] = entrada['resolucion']
+        simulador.input['configuracion'] = entrada['configuracion']
+        simulador.input['fps_objetivo'] = entrada['fps_objetivo']
+        simulador.input['potencia_gpu'] = entrada['potencia_gpu']
         
         # Ejecutar el cálculo del sistema difuso
-        self.simulador.compute()
-
-        # Ejecutar el simulador
-        self.uso_gpu.view(sim=self.simulador)
-        plt.savefig(f"/tmp/uso_gpu_caso.png")
-        plt.close()
-
-        self.temperatura.view(sim=self.simulador)
-        plt.savefig(f"/tmp/temperatura_caso.png")
-        plt.close()
-
-        
-        
-        # Obtener los valores de salida
-        uso_gpu_valor = self.simulador.output['uso_gpu']
-        temperatura_valor = self.simulador.output['temperatura']
-        
-        # Convertir valores numéricos a etiquetas
-        uso_gpu_label = self._convertir_uso_gpu_a_etiqueta(uso_gpu_valor)
-        temperatura_label = self._convertir_temperatura_a_etiqueta(temperatura_valor)
-        
-        # Crear predicción detallada
-        prediccion = "El Uso de GPU es " + uso_gpu_label + " (" + str(uso_gpu_valor.round(2)) + "%) y la Temperatura es " + temperatura_label + " (" + str(temperatura_valor.round(2)) + "°C)"
-        
-        regla_activada = ""
-
-        # Mostrar activación en las entradas
-        r_baja = fuzz.interp_membership(self.resolucion.universe, self.resolucion['baja'].mf, entrada["resolucion"])
-        r_media = fuzz.interp_membership(self.resolucion.universe, self.resolucion['media'].mf, entrada["resolucion"])
-        r_alta = fuzz.interp_membership(self.resolucion.universe, self.resolucion['alta'].mf, entrada["resolucion"])
-        r_ultra = fuzz.interp_membership(self.resolucion.universe, self.resolucion['ultra'].mf, entrada["resolucion"])
-        regla_activada += f"\n   Resolución activaciones: baja={r_baja:.2f}, media={r_media:.2f}, alta={r_alta:.2f}, ultra={r_ultra:.2f}"
-
-        c_baja = fuzz.interp_membership(self.configuracion.universe, self.configuracion['baja'].mf, entrada["configuracion"])
-        c_media = fuzz.interp_membership(self.configuracion.universe, self.configuracion['media'].mf, entrada["configuracion"])
-        c_alta = fuzz.interp_membership(self.configuracion.universe, self.configuracion['alta'].mf, entrada["configuracion"])
-        c_ultra = fuzz.interp_membership(self.configuracion.universe, self.configuracion['ultra'].mf, entrada["configuracion"])
-        regla_activada += f"\n   Configuración activaciones: baja={c_baja:.2f}, media={c_media:.2f}, alta={c_alta:.2f}, ultra={c_ultra:.2f}"
-
-        f_conservador = fuzz.interp_membership(self.fps_objetivo.universe, self.fps_objetivo['conservador'].mf, entrada["fps_objetivo"])
-        f_estandar = fuzz.interp_membership(self.fps_objetivo.universe, self.fps_objetivo['estandar'].mf, entrada["fps_objetivo"])
-        f_competitivo = fuzz.interp_membership(self.fps_objetivo.universe, self.fps_objetivo['competitivo'].mf, entrada["fps_objetivo"])
-        f_extremo = fuzz.interp_membership(self.fps_objetivo.universe, self.fps_objetivo['extremo'].mf, entrada["fps_objetivo"])
-        regla_activada += f"\n    FPS activaciones: conservador={f_conservador:.2f}, estandar={f_estandar:.2f}, competitivo={f_competitivo:.2f}, extremo={f_extremo:.2f}"
-
-        g_baja = fuzz.interp_membership(self.potencia_gpu.universe, self.potencia_gpu['baja'].mf, entrada["potencia_gpu"])
-        g_media = fuzz.interp_membership(self.potencia_gpu.universe, self.potencia_gpu['media'].mf, entrada["potencia_gpu"])
-        g_alta = fuzz.interp_membership(self.potencia_gpu.universe, self.potencia_gpu['alta'].mf, entrada["potencia_gpu"])
-        g_ultra = fuzz.interp_membership(self.potencia_gpu.universe, self.potencia_gpu['ultra'].mf, entrada["potencia_gpu"])
-        regla_activada += f"\n    GPU activaciones: baja={g_baja:.2f}, media={g_media:.2f}, alta={g_alta:.2f}, ultra={g_ultra:.2f}"
+        simulador.compute()
+
+    def _version_cache(self):
+        """Versión de las claves compartidas: cambia con la base de reglas, el motor o la defuzzificación."""
+        return f"{self.huella[:16]}:{self.motor}:{self.defuzzificacion}"
+
+    def _clave_cache(self, entrada):
+        """Tupla de entrada usada como clave de caché, redondeada al paso de cuantización si se configuró."""
+        valores = (entrada['resolucion'], entrada['configuracion'], entrada['fps_objetivo'], entrada['potencia_gpu'])
+        if self.cuantizacion:
+            return tuple(round(v / self.cuantizacion) * self.cuantizacion for v in valores)
+        return tuple(valores)
+
+    def obtener_resultado(self, entrada):
+        """Obtiene el ResultadoPrediccion de una entrada (desde la caché si ya se calculó)."""
+        clave = self._clave_cache(entrada)
+        resultado = self.cache.obtener(clave) if self.cache is not None else None
+        if resultado is None:
+            generacion = self._generacion_reglas
+            # Con cuantización se evalúa el punto representativo de la clave
+            if self.cuantizacion:
+                entrada = dict(zip(self.ENTRADAS, clave))
+            resultado = self._evaluar(entrada)
+            # Un resultado calculado con reglas que se reemplazaron mientras tanto no se guarda
+            if self.cache is not None:
+                self._guardar_en_cache(self.cache, clave, resultado, generacion)
+        return resultado
+
+    def crear_sesion(self):
+        """Crea una SesionIncremental para evaluar entradas que cambian de a una variable.
+
+        La sesión evalúa con el motor Mamdani vectorizado, que reproduce al de skfuzzy; con los
+        motores 'sugeno' y 'tabla' daría valores distintos a los de obtener_resultado, así que se
+        rechaza con ValueError.
+        """
+        if self.motor in ('sugeno', 'tabla'):
+            raise ValueError(f"La evaluación incremental no está disponible con el motor '{self.motor}'")
+        return SesionIncremental(self)
+
+    def obtener_prediccion(self, entrada, sesion=None):
+        """Obtiene la predicción específica de uso de GPU y temperatura usando el motor de inferencia configurado.
+
+        Con una sesión (crear_sesion, solo con los motores 'skfuzzy' y 'vectorizado') se evalúa de
+        forma incremental con el motor vectorizado, sin pasar por la caché. Retorna (prediccion, regla_activada) como textos; obtener_resultado da
+        los valores sin formatear.
+        """
+        resultado = self.obtener_resultado(entrada) if sesion is None else sesion.evaluar(entrada)
+
+        with metricas.medir('formato'):
+            prediccion = resultado.texto_prediccion()
+            regla_activada = resultado.texto_activaciones()
 
         print(prediccion)
         
         return prediccion, regla_activada
 
+    def obtener_graficos(self, entrada, formato='png'):
+        """Genera bajo demanda las gráficas de uso de GPU y temperatura como bytes en memoria.
+
+        Los resultados se guardan en una caché acotada por entrada y formato; la predicción
+        normal (obtener_prediccion) nunca dibuja. Los gráficos se arman con el resultado de
+        obtener_resultado (sin volver a simular) sobre el fondo precalculado de cada salida.
+        """
+        clave = self._clave_cache(entrada) + (formato,)
+        graficos = self.cache_graficos.obtener(clave) if self.cache_graficos is not None else None
+        if graficos is None:
+            generacion = self._generacion_reglas
+            resultado = self.obtener_resultado(entrada)
+            activaciones = resultado.activaciones_salidas()
+            with metricas.medir('render'):
+                graficos = {
+                    salida: self._renderizador(salida).renderizar(
+                        activaciones[salida], getattr(resultado, salida), formato)
+                    for salida in ('uso_gpu', 'temperatura')
+                }
+            if self.cache_graficos is not None:
+                self._guardar_en_cache(self.cache_graficos, clave, graficos, generacion)
+        return graficos
+
+    def _renderizador(self, salida):
+        """RenderizadorPertenencias de la salida, creado en el primer gráfico (las funciones no cambian)."""
+        with self._lock_renderizadores:
+            if salida not in self._renderizadores:
+                variable = getattr(self, salida)
+                etiquetas = self.uso_labels if salida == 'uso_gpu' else self.temp_labels
+                self._renderizadores[salida] = RenderizadorPertenencias(
+                    variable.label, variable.universe, {e: variable[e].mf for e in etiquetas})
+            return self._renderizadores[salida]
+
+    def recargar_reglas(self, fuente):
+        """Reemplaza la base de reglas en caliente y retorna la lista de cambios aplicados.
+
+        fuente: TablaDecision o ruta de un CSV de reglas (ver ReglasDF). Solo se modifican los
+        consecuentes de las reglas que cambian, sobre una copia del simulador de skfuzzy que luego
+        se publica junto con el nuevo motor vectorizado: las predicciones en curso terminan con la
+        base anterior. El pool, la tabla y los motores nuevos se arman antes de publicarlos todos
+        juntos; después se vacían las cachés, y los resultados en curso ya no se guardan en ellas.
+        """
+        if not isinstance(fuente, TablaDecision):
+            fuente = TablaDecision.cargar(fuente, self.ETIQUETAS_ENTRADAS, self.ETIQUETAS_SALIDAS)
+        with self._lock_recarga:
+            cambios = self.tabla_decision.diferencias(fuente)
+            if not cambios:
+                return cambios
+
+            reglas_detalladas = list(self.reglas_detalladas)
+            for numero, _, fila in cambios:
+                reglas_detalladas[numero] = self._detallar_regla(numero, *fila)
+
+            # Copia conjunta de los objetos de skfuzzy (comparten referencias) y edición de los consecuentes
+            compilado = dict(zip(ATRIBUTOS_COMPILADOS, copy.deepcopy(
+                tuple(getattr(self, nombre) for nombre in ATRIBUTOS_COMPILADOS))))
+            grafo = compilado['simulador'].ctrl.graph
+            for numero, _, (*_, uso, temp) in cambios:
+                regla = compilado['rules'][numero]
+                for consecuente in regla.consequent:
+                    grafo.remove_edge(regla, consecuente.term)
+                regla.consequent = [compilado['uso_gpu'][uso], compilado['temperatura'][temp]]
+                for consecuente in regla.consequent:
+                    grafo.add_edge(regla, consecuente.term)
+
+            # Todo lo que depende de las reglas se arma antes de publicarlo, sobre una copia superficial
+            # del sistema con los objetos nuevos: mientras tanto las predicciones siguen con la base anterior
+            nuevo = copy.copy(self)
+            nuevo.tabla_decision = fuente
+            nuevo.reglas_detalladas = reglas_detalladas
+            for nombre, objeto in compilado.items():
+                setattr(nuevo, nombre, objeto)
+            nuevo.huella = huella_sistema(nuevo)
+            nuevo.motor_vectorizado = MotorMamdaniVectorizado.desde_sistema(nuevo, self.defuzzificacion)
+            nuevo.motor_sugeno = MotorSugenoOrdenCero(nuevo.motor_vectorizado, self.motor_sugeno.constantes)
+            if self.pool is not None:
+                nuevo.pool = PoolSimuladores(nuevo, self.tamano_pool, self.timeout_pool)
+            if self.tabla is not None:
+                tabla = TablaSuperficieControl.compilar(nuevo)
+                if self.ruta_tabla is not None:
+                    tabla.guardar(self.ruta_tabla)
+                    tabla = TablaSuperficieControl.cargar(self.ruta_tabla)
+                nuevo.tabla = tabla
+
+            # Publicación en una sola sección crítica; la generación cambia junto con los objetos, así
+            # que un resultado solo se guarda en caché si se calculó enteramente con una de las bases
+            with self._lock_simulador, self._lock_generacion:
+                for nombre in ATRIBUTOS_COMPILADOS + self._ATRIBUTOS_REGLAS:
+                    setattr(self, nombre, getattr(nuevo, nombre))
+                self._generacion_reglas += 1
+
+            # Se vacían ambos niveles (en el compartido, las entradas de la versión nueva)
+            for cache in (self.cache, self.cache_graficos, self.cache_superficies):
+                if cache is not None:
+                    cache.limpiar()
+            if self.ruta_compilado is not None:
+                guardar_compilado(self, self.ruta_compilado, self.huella)
+            return cambios
+
+    def estadisticas_pool(self):
+        """Retorna las estadísticas del pool de simuladores (None si no se configuró)."""
+        return self.pool.estadisticas() if self.pool is not None else None
+
+    def estadisticas_cache(self):
+        """Retorna las estadísticas de la caché de predicciones (None si está desactivada)."""
+        return self.cache.estadisticas() if self.cache is not None else None
+
+    def obtener_predicciones_lote(self, entradas=None, resolucion=None, configuracion=None,
+                                  fps_objetivo=None, potencia_gpu=None, tamano_bloque=50000):
+        """Evalúa un lote de entradas en una sola pasada vectorizada, sin gráficos ni textos.
+
+        Acepta un arreglo (N, 4) con columnas resolucion, configuracion, fps_objetivo y potencia_gpu,
+        o las cuatro columnas por separado. Retorna un diccionario de arreglos NumPy con los valores
+        crisp y los códigos de etiqueta (índices en uso_labels y temp_labels).
+        """
+        if entradas is None:
+            columnas = [resolucion, configuracion, fps_objetivo, potencia_gpu]
+            if any(c is None for c in columnas):
+                raise ValueError("Se requiere un arreglo (N, 4) o las cuatro columnas de entrada")
+            entradas = np.column_stack([np.asarray(c, dtype=np.float64) for c in columnas])
+        entradas = np.atleast_2d(np.asarray(entradas, dtype=np.float64))
+        if entradas.ndim != 2 or entradas.shape[1] != 4:
+            raise ValueError(f"Se esperaba un arreglo de forma (N, 4), se recibió {entradas.shape}")
+
+        # Solo el modo Sugeno cambia el modelo de inferencia; el resto usa el motor Mamdani vectorizado
+        motor = self.motor_sugeno if self.motor == 'sugeno' else self.motor_vectorizado
+        uso_gpu = np.empty(len(entradas))
+        temperatura = np.empty(len(entradas))
+        # Procesar por bloques para acotar la memoria de los arreglos intermedios
+        for inicio in range(0, len(entradas), tamano_bloque):
+            bloque = slice(inicio, inicio + tamano_bloque)
+            uso_gpu[bloque], temperatura[bloque] = motor.calcular(entradas[bloque])
+
+        return {
+            'uso_gpu': uso_gpu,
+            'temperatura': temperatura,
+            'uso_gpu_codigo': self._codificar_uso_gpu(uso_gpu),
+            'temperatura_codigo': self._codificar_temperatura(temperatura),
+        }
 
+    def obtener_activaciones_lote(self, entradas):
+        """Pertenencia de cada fila de un arreglo (N, 4) a cada etiqueta: {antecedente: {etiqueta: arreglo}}."""
+        grados = self.motor_vectorizado.fuzzificar(entradas)
+        etiquetas = (self.res_labels, self.conf_labels, self.fps_labels, self.gpu_labels)
+        return {nombre: dict(zip(e, g.T)) for nombre, e, g in zip(self.ENTRADAS, etiquetas, grados)}
+
+    def obtener_superficie(self, eje_x, eje_y, fijos, valores_x=None, valores_y=None):
+        """Evalúa la superficie de control sobre una malla 2-D de dos antecedentes en una sola pasada.
+
+        eje_x, eje_y: antecedentes a barrer (dos nombres distintos de ENTRADAS).
+        fijos: diccionario con el valor de los otros dos antecedentes; las claves de los ejes se ignoran.
+        valores_x, valores_y: puntos de cada eje; por defecto, el universo completo de la variable.
+        Retorna los nombres y valores de los ejes y las matrices (len(valores_y), len(valores_x)) de
+        uso_gpu y temperatura. Los arreglos son de solo lectura porque se comparten desde la caché.
+        """
+        for eje in (eje_x, eje_y):
+            if eje not in self.ENTRADAS:
+                raise ValueError(f"Antecedente desconocido: {eje}. Opciones: {', '.join(self.ENTRADAS)}")
+        if eje_x == eje_y:
+            raise ValueError("Los dos ejes de la superficie deben ser antecedentes distintos")
+        faltantes = [n for n in self.ENTRADAS if n not in (eje_x, eje_y) and n not in fijos]
+        if faltantes:
+            raise ValueError(f"Faltan valores fijos para: {', '.join(faltantes)}")
+        fijos = {n: float(fijos[n]) for n in self.ENTRADAS if n not in (eje_x, eje_y)}
+
+        valores_x = np.array(getattr(self, f'{eje_x}_universe') if valores_x is None else valores_x,
+                             dtype=np.float64)
+        valores_y = np.array(getattr(self, f'{eje_y}_universe') if valores_y is None else valores_y,
+                             dtype=np.float64)
+
+        clave = (eje_x, eje_y, tuple(fijos.items()), valores_x.tobytes(), valores_y.tobytes())
+        superficie = self.cache_superficies.obtener(clave) if self.cache_superficies is not None else None
+        if superficie is not None:
+            return superficie
+
+        with metricas.medir('superficie'):
+            malla_x, malla_y = np.meshgrid(valores_x, valores_y)
+            columnas = {eje_x: malla_x.ravel(), eje_y: malla_y.ravel()}
+            columnas.update({n: np.full(malla_x.size, v) for n, v in fijos.items()})
+            lote = self.obtener_predicciones_lote(np.column_stack([columnas[n] for n in self.ENTRADAS]))
+
+        superficie = {
+            'eje_x': eje_x,
+            'eje_y': eje_y,
+            'fijos': fijos,
+            'valores_x': valores_x,
+            'valores_y': valores_y,
+            'uso_gpu': lote['uso_gpu'].reshape(malla_x.shape),
+            'temperatura': lote['temperatura'].reshape(malla_x.shape),
+        }
+        for nombre in ('valores_x', 'valores_y', 'uso_gpu', 'temperatura'):
+            superficie[nombre].flags.writeable = False
+        if self.cache_superficies is not None:
+            self.cache_superficies.guardar(clave, superficie)
+        return superficie
+
+    def obtener_corte_cuantizado(self, resolucion, paso=5):
+        """Superficie 3-D de configuracion x fps_objetivo x potencia_gpu para una resolución fija, en uint8.
+
+        Pensada para enviarse al navegador e interpolarse allí: cada salida se guarda como
+        minimo + codigo * escala, en orden C sobre los ejes. El error de cuantización es a lo
+        sumo escala / 2; el de interpolar entre puntos de la malla depende de paso.
+        """
+        clave = ('corte', float(resolucion), paso)
+        corte = self.cache_superficies.obtener(clave) if self.cache_superficies is not None else None
+        if corte is not None:
+            return corte
+
+        ejes = [np.arange(u[0], u[-1] + paso / 2, paso, dtype=np.float64) for u in (
+            self.configuracion_universe, self.fps_objetivo_universe, self.potencia_gpu_universe)]
+        malla = np.meshgrid(*ejes, indexing='ij')
+        entradas = np.column_stack([np.full(malla[0].size, float(resolucion))] + [m.ravel() for m in malla])
+        lote = self.obtener_predicciones_lote(entradas)
+
+        corte = {'resolucion': float(resolucion), 'ejes': [e.tolist() for e in ejes]}
+        for salida in ('uso_gpu', 'temperatura'):
+            valores = lote[salida]
+            minimo = float(valores.min())
+            escala = max(float(valores.max()) - minimo, 1e-9) / 255
+            codigos = np.round((valores - minimo) / escala).astype(np.uint8)
+            codigos.flags.writeable = False
+            corte[salida] = {'codigos': codigos, 'minimo': minimo, 'escala': escala}
+        if self.cache_superficies is not None:
+            self.cache_superficies.guardar(clave, corte)
+        return corte
 
     def _convertir_uso_gpu_a_etiqueta(self, valor):
         """Convierte un valor numérico de uso de GPU a su etiqueta correspondiente."""
@@ -424,18 +813,26 @@ class SistemaDifusoTarjetasGraficas:
         else:
             return 'critica'
 
+    def _codificar_uso_gpu(self, valores):
+        """Versión vectorizada de _convertir_uso_gpu_a_etiqueta: índices en uso_labels."""
+        return np.searchsorted(self.UMBRALES_USO_GPU, valores, side='left')
+
+    def _codificar_temperatura(self, valores):
+        """Versión vectorizada de _convertir_temperatura_a_etiqueta: índices en temp_labels."""
+        return np.searchsorted(self.UMBRALES_TEMPERATURA, valores, side='left')
+
     def obtener_resoluciones_disponibles(self):
         """Retorna una lista de todas las resoluciones disponibles."""
-        return list(self.resoluciones.keys())
+        return list(self.catalogo_resoluciones.nombres)
     
     def obtener_valor_resolucion(self, nombre_resolucion):
-        """Obtiene el valor numérico de una resolución por su nombre."""
-        return self.resoluciones.get(nombre_resolucion, 50)  
+        """Obtiene el valor numérico de una resolución por su nombre o por un texto "W×H"."""
+        return self.catalogo_resoluciones.valor(nombre_resolucion)
+
+    def obtener_valores_resolucion(self, nombres_resolucion):
+        """Versión vectorizada de obtener_valor_resolucion para un arreglo de nombres."""
+        return self.catalogo_resoluciones.valores(nombres_resolucion)
     
     def obtener_nombre_resolucion_por_valor(self, valor):
         """Obtiene el nombre de la resolución más cercana a un valor numérico."""
-        # Encuentra la resolución con el valor más cercano
-        resolucion_cercana = min(self.resoluciones.items(), 
-                               key=lambda x: abs(x[1] - valor))
-        return resolucion_cercana[0]
-
+        return self.catalogo_resoluciones.nombre_mas_cercano(valor)
@@ -0,0 +1,132 @@
+import argparse
+import json
+
+import numpy as np
+
+
+class MotorSugenoOrdenCero:
+    """Inferencia Takagi-Sugeno de orden cero sobre los antecedentes y reglas del motor Mamdani.
+
+    Cada etiqueta de salida se reemplaza por una constante (por defecto el centroide de su función
+    de pertenencia) y la salida es el promedio de las constantes de los consecuentes de las 256
+    reglas ponderado por su fuerza de disparo. No hay agregación ni integración sobre el universo
+    de salida, por lo que es más barato que defuzzificar; la desviación frente a Mamdani se mide
+    con informe_desviacion.
+    """
+
+    def __init__(self, mamdani, constantes=None):
+        """
+        mamdani: MotorMamdaniVectorizado del que se toman la fuzzificación y la tabla de reglas.
+        constantes: por salida, un valor por etiqueta; por defecto, los centroides de los consecuentes.
+        """
+        self.mamdani = mamdani
+        if constantes is None:
+            constantes = [self.centroides(universo, mfs) for universo, mfs in mamdani.consecuentes]
+        self.constantes = [np.asarray(c, dtype=np.float64) for c in constantes]
+        for c, (_, mfs) in zip(self.constantes, mamdani.consecuentes):
+            if c.shape != (mfs.shape[0],):
+                raise ValueError(f"Se esperaban {mfs.shape[0]} constantes por salida, se recibieron {c.shape}")
+        # Constante del consecuente de cada regla, por salida (reglas x salidas)
+        self.constantes_reglas = np.stack(
+            [c[mamdani.consecuentes_reglas[:, s]] for s, c in enumerate(self.constantes)], axis=1)
+
+    @staticmethod
+    def centroides(universo, mfs):
+        """Centroide de cada función de pertenencia, integrando exactamente la interpolación lineal."""
+        x1, x2 = universo[:-1], universo[1:]
+        y1, y2 = mfs[:, :-1], mfs[:, 1:]
+        ancho = x2 - x1
+        area = (0.5 * ancho * (y1 + y2)).sum(axis=1)
+        momento = (ancho * (x1 * (2 * y1 + y2) + x2 * (y1 + 2 * y2)) / 6.0).sum(axis=1)
+        return momento / np.fmax(area, np.finfo(float).eps)
+
+    def calcular(self, entradas, solo_activas=None):
+        """Evalúa un lote de entradas (N x variables) y devuelve un arreglo crisp por cada salida."""
+        mamdani = self.mamdani
+        grados = mamdani.fuzzificar(entradas)
+        if solo_activas is None:
+            solo_activas = len(grados[0]) >= mamdani.MINIMO_LOTE_REGLAS_ACTIVAS
+        if solo_activas:
+            fuerza, consecuentes = mamdani.activar_reglas_activas(grados)
+            return self._promediar(fuerza, [c[consecuentes[:, :, s]] for s, c in enumerate(self.constantes)])
+        return self.ponderar(mamdani.activar_reglas(grados))
+
+    def ponderar(self, fuerza):
+        """Salidas a partir de la fuerza de disparo de todas las reglas (N x reglas), en su orden."""
+        return self._promediar(fuerza, [self.constantes_reglas[None, :, s] for s in range(len(self.constantes))])
+
+    @staticmethod
+    def _promediar(fuerza, valores):
+        """Promedio de las constantes de los consecuentes ponderado por la fuerza de cada regla."""
+        # Sin reglas disparadas la salida es 0, como en la defuzzificación del motor Mamdani
+        total = np.fmax(fuerza.sum(axis=1), np.finfo(float).eps)
+        return [(fuerza * v).sum(axis=1) / total for v in valores]
+
+
+def malla_entradas(sistema, paso=5):
+    """Malla (N x 4) con los valores del catálogo de resoluciones y el resto de universos cada `paso`."""
+    ejes = [np.union1d(list(sistema.resoluciones.values()),
+                       [sistema.resolucion_universe[0], sistema.resolucion_universe[-1]])]
+    for universo in (sistema.configuracion_universe, sistema.fps_objetivo_universe, sistema.potencia_gpu_universe):
+        ejes.append(np.union1d(np.arange(universo[0], universo[-1], paso), [universo[-1]]))
+    return np.stack(np.meshgrid(*ejes, indexing='ij'), axis=-1).reshape(-1, 4).astype(np.float64)
+
+
+def informe_desviacion(sistema, paso=5, tamano_bloque=50000):
+    """Desviación del modo Sugeno frente a las salidas Mamdani del motor vectorizado sobre malla_entradas.
+
+    Retorna, por salida, la desviación máxima (con la entrada donde ocurre), media y percentil 95,
+    y la fracción de puntos donde coincide la etiqueta de salida.
+    """
+    entradas = malla_entradas(sistema, paso)
+    sugeno = sistema.motor_sugeno
+    mamdani = sistema.motor_vectorizado
+    salidas = ('uso_gpu', 'temperatura')
+    codificar = {'uso_gpu': sistema._codificar_uso_gpu, 'temperatura': sistema._codificar_temperatura}
+    desviaciones = {s: np.empty(len(entradas)) for s in salidas}
+    coincidencias = {s: 0 for s in salidas}
+    for inicio in range(0, len(entradas), tamano_bloque):
+        bloque = slice(inicio, inicio + tamano_bloque)
+        for salida, a, b in zip(salidas, mamdani.calcular(entradas[bloque]), sugeno.calcular(entradas[bloque])):
+            desviaciones[salida][bloque] = np.abs(b - a)
+            coincidencias[salida] += int((codificar[salida](a) == codificar[salida](b)).sum())
+
+    informe = {'puntos': len(entradas), 'paso': paso, 'defuzzificacion': sistema.defuzzificacion}
+    for salida in salidas:
+        d = desviaciones[salida]
+        peor = int(np.argmax(d))
+        informe[salida] = {
+            'constantes': dict(zip(sistema.uso_labels if salida == 'uso_gpu' else sistema.temp_labels,
+                                   sugeno.constantes[salidas.index(salida)].round(4).tolist())),
+            'desviacion_maxima': float(d[peor]),
+            'entrada_desviacion_maxima': dict(zip(sistema.ENTRADAS, entradas[peor].tolist())),
+            'desviacion_media': float(d.mean()),
+            'desviacion_p95': float(np.percentile(d, 95)),
+            'coincidencia_etiquetas': coincidencias[salida] / len(entradas),
+        }
+    return informe
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Desviación del modo Sugeno frente a Mamdani (salida JSON).")
+    parser.add_argument('--paso', type=int, default=5, help="Paso de la malla en configuracion, fps y gpu")
+    parser.add_argument('--ruta-compilado', default=None, help="Artefacto del sistema compilado a reutilizar")
+    parser.add_argument('--defuzzificacion', default='muestreado', help="Defuzzificación del motor Mamdani")
+    parser.add_argument('--salida', default=None, help="Archivo JSON de salida (por defecto, stdout)")
+    args = parser.parse_args(argv)
+    if args.paso <= 0:
+        parser.error("--paso debe ser positivo")
+
+    from .SistemaDF import SistemaDifusoTarjetasGraficas
+    sistema = SistemaDifusoTarjetasGraficas(motor='sugeno', ruta_compilado=args.ruta_compilado,
+                                            defuzzificacion=args.defuzzificacion, tamano_cache=0)
+    texto = json.dumps(informe_desviacion(sistema, args.paso), indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            f.write(texto + '\n')
+    else:
+        print(texto)
+
+
+if __name__ == '__main__':
+    main()
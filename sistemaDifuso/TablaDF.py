@@ -0,0 +1,191 @@
+import bisect
+import json
+import os
+
+import numpy as np
+
+
+class TablaSuperficieControl:
+    """Superficie de control precompilada del sistema difuso con interpolación multilineal.
+
+    Las superficies de uso_gpu y temperatura se guardan en un archivo .npy (forma 2 x ejes) que se
+    abre con memoria mapeada en modo solo lectura; los ejes y metadatos van en un .json hermano.
+    Como las páginas del archivo vienen de la caché del sistema operativo, todos los workers de
+    Reflex que cargan la misma tabla comparten la memoria física.
+
+    Los ejes pasan por los quiebres de las funciones de pertenencia y solo se afinan donde alguna
+    pertenencia cambia: en las mesetas la superficie es constante a lo largo del eje. Dentro de las
+    rampas quedan los quiebres del mínimo entre antecedentes y de la defuzzificación, que no siguen
+    los ejes; con los pasos por defecto (1) el error máximo frente al motor exacto ronda los 3
+    puntos de uso_gpu y 1.5 °C, y solo cambia la etiqueta de entradas a esa distancia de un umbral
+    (~0.1 % de uso_gpu y ~0.2 % de temperatura). El error medido se guarda en metadatos['error_maximo'].
+    """
+
+    SALIDAS = ('uso_gpu', 'temperatura')
+
+    def __init__(self, ejes, superficies, metadatos=None):
+        self.ejes = [np.asarray(e, dtype=np.float64) for e in ejes]
+        # Vista ndarray sin copia (evita la sobrecarga de indexar np.memmap)
+        self.superficies = np.asarray(superficies)
+        self._ejes_lista = [e.tolist() for e in self.ejes]
+        self.metadatos = metadatos or {}
+
+    @staticmethod
+    def _rutas(ruta):
+        base = ruta[:-4] if ruta.endswith('.npy') else ruta
+        return base + '.npy', base + '.json'
+
+    @classmethod
+    def compilar(cls, sistema, paso_configuracion=1, paso_fps=1, paso_gpu=1, muestras_error=5000):
+        """Muestrea el controlador sobre la malla indicada usando la evaluación por lotes.
+
+        Los pasos son la separación máxima entre nodos dentro de las rampas de cada variable; la
+        resolución se muestrea en los valores del catálogo y los quiebres de sus pertenencias.
+        Los metadatos guardan la huella y la defuzzificación del sistema para detectar tablas obsoletas.
+        """
+        ejes = [
+            np.union1d(list(sistema.resoluciones.values()), cls._quiebres(sistema.resolucion)),
+            cls._eje(sistema.configuracion, paso_configuracion),
+            cls._eje(sistema.fps_objetivo, paso_fps),
+            cls._eje(sistema.potencia_gpu, paso_gpu),
+        ]
+        malla = np.stack(np.meshgrid(*ejes, indexing='ij'), axis=-1).reshape(-1, 4)
+        resultado = sistema.obtener_predicciones_lote(malla)
+        forma = tuple(len(e) for e in ejes)
+        superficies = np.stack([resultado[s].reshape(forma) for s in cls.SALIDAS]).astype(np.float32)
+
+        tabla = cls(ejes, superficies, {
+            'pasos': [paso_configuracion, paso_fps, paso_gpu],
+            'huella': sistema.huella,
+            'defuzzificacion': sistema.defuzzificacion,
+        })
+        if muestras_error:
+            tabla.metadatos['error_maximo'] = tabla.error_maximo(sistema, muestras_error)
+        return tabla
+
+    @staticmethod
+    def _quiebres(variable):
+        """Extremos del universo y puntos donde cambia la pendiente de alguna función de pertenencia."""
+        universo = variable.universe
+        pertenencias = np.vstack([termino.mf for termino in variable.terms.values()])
+        cambios = np.abs(np.diff(pertenencias, n=2, axis=1)).max(axis=0) > 1e-9
+        return np.union1d(universo[1:-1][cambios], [universo[0], universo[-1]])
+
+    @classmethod
+    def _eje(cls, variable, paso):
+        """Eje de muestreo de una variable: sus quiebres y, en los tramos entre quiebres donde alguna
+        pertenencia cambia, nodos separados a lo sumo `paso`."""
+        universo = variable.universe
+        pertenencias = np.vstack([termino.mf for termino in variable.terms.values()])
+        quiebres = cls._quiebres(variable)
+        puntos = [quiebres]
+        for inicio, fin in zip(quiebres[:-1], quiebres[1:]):
+            tramo = pertenencias[:, (universo >= inicio) & (universo <= fin)]
+            if np.ptp(tramo, axis=1).max() > 0:
+                puntos.append(np.linspace(inicio, fin, int(np.ceil((fin - inicio) / paso)) + 1))
+        return np.unique(np.concatenate(puntos))
+
+    def guardar(self, ruta):
+        """Guarda las superficies (.npy) y los ejes y metadatos (.json).
+
+        Cada archivo se escribe en uno temporal y se reemplaza (una tabla anterior puede seguir
+        mapeada en memoria); el .json va después del .npy, así que su huella nunca describe un .npy
+        a medio escribir.
+        """
+        ruta_npy, ruta_json = self._rutas(ruta)
+        temporal = ruta_npy + '.tmp'
+        with open(temporal, 'wb') as f:
+            np.save(f, np.ascontiguousarray(self.superficies))
+        os.replace(temporal, ruta_npy)
+        temporal = ruta_json + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump({'ejes': [e.tolist() for e in self.ejes], 'metadatos': self.metadatos}, f)
+        os.replace(temporal, ruta_json)
+        return ruta_npy
+
+    @classmethod
+    def cargar(cls, ruta):
+        """Carga una tabla guardada mapeando las superficies en memoria (solo lectura)."""
+        ruta_npy, ruta_json = cls._rutas(ruta)
+        with open(ruta_json, encoding='utf-8') as f:
+            datos = json.load(f)
+        superficies = np.load(ruta_npy, mmap_mode='r')
+        return cls(datos['ejes'], superficies, datos.get('metadatos'))
+
+    @classmethod
+    def cargar_o_compilar(cls, sistema, ruta, **opciones):
+        """Carga la tabla si existe en disco y corresponde al sistema; si no, la compila y la guarda.
+
+        Una tabla compilada con otras reglas, funciones de pertenencia o defuzzificación (huella o
+        defuzzificación distintas en los metadatos) se recompila.
+        """
+        if all(os.path.exists(r) for r in cls._rutas(ruta)):
+            try:
+                tabla = cls.cargar(ruta)
+            except (OSError, ValueError):
+                tabla = None
+            if tabla is not None and tabla.corresponde_a(sistema):
+                return tabla
+        tabla = cls.compilar(sistema, **opciones)
+        tabla.guardar(ruta)
+        return cls.cargar(ruta)
+
+    def corresponde_a(self, sistema):
+        """Indica si la tabla se compiló con las reglas, conjuntos y defuzzificación de `sistema`."""
+        return (self.metadatos.get('huella') == sistema.huella
+                and self.metadatos.get('defuzzificacion') == sistema.defuzzificacion)
+
+    def interpolar_punto(self, resolucion, configuracion, fps_objetivo, potencia_gpu):
+        """Interpolación multilineal de una sola entrada; retorna (uso_gpu, temperatura)."""
+        inicio, pesos = [], []
+        for x, eje in zip((resolucion, configuracion, fps_objetivo, potencia_gpu), self._ejes_lista):
+            x = min(max(x, eje[0]), eje[-1])
+            i = min(max(bisect.bisect_right(eje, x) - 1, 0), len(eje) - 2)
+            inicio.append(i)
+            pesos.append((x - eje[i]) / (eje[i + 1] - eje[i]))
+
+        # Celda 2x2x2x2 de cada salida, reducida eje por eje (el último eje es el contiguo)
+        celda = self.superficies[(slice(None),) + tuple(slice(i, i + 2) for i in inicio)]
+        resultado = []
+        for valores in celda.reshape(len(self.SALIDAS), -1).tolist():
+            for t in reversed(pesos):
+                valores = [a + (b - a) * t for a, b in zip(valores[::2], valores[1::2])]
+            resultado.append(valores[0])
+        return tuple(resultado)
+
+    def interpolar(self, entradas):
+        """Interpolación multilineal de un lote (N x 4); retorna un arreglo por salida."""
+        entradas = np.atleast_2d(np.asarray(entradas, dtype=np.float64))
+        n = len(entradas)
+
+        indices, pesos = [], []
+        for k, eje in enumerate(self.ejes):
+            x = np.clip(entradas[:, k], eje[0], eje[-1])
+            i = np.clip(np.searchsorted(eje, x, side='right') - 1, 0, len(eje) - 2)
+            indices.append(i)
+            pesos.append((x - eje[i]) / (eje[i + 1] - eje[i]))
+
+        # Suma ponderada sobre los 16 vértices de la celda
+        salidas = np.zeros((len(self.SALIDAS), n))
+        for vertice in range(1 << len(self.ejes)):
+            peso = np.ones(n)
+            indice = []
+            for k in range(len(self.ejes)):
+                arriba = (vertice >> k) & 1
+                peso = peso * (pesos[k] if arriba else 1.0 - pesos[k])
+                indice.append(indices[k] + arriba)
+            salidas += peso * self.superficies[(slice(None),) + tuple(indice)]
+        return list(salidas)
+
+    def error_maximo(self, sistema, muestras=5000, semilla=0):
+        """Error máximo de interpolación frente al motor vivo sobre entradas aleatorias del dominio."""
+        rng = np.random.default_rng(semilla)
+        entradas = np.column_stack([
+            rng.choice(list(sistema.resoluciones.values()), muestras),
+            rng.uniform(sistema.configuracion_universe[0], sistema.configuracion_universe[-1], muestras),
+            rng.uniform(sistema.fps_objetivo_universe[0], sistema.fps_objetivo_universe[-1], muestras),
+            rng.uniform(sistema.potencia_gpu_universe[0], sistema.potencia_gpu_universe[-1], muestras),
+        ])
+        referencia = sistema.obtener_predicciones_lote(entradas)
+        interpolado = self.interpolar(entradas)
+        return {s: float(np.abs(interpolado[i] - referencia[s]).max()) for i, s in enumerate(self.SALIDAS)}
@@ -1,17 +1,144 @@
 import reflex as rx
+from reflex.experimental import ClientStateVar
+from reflex.vars.base import Var, VarData
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
 from .SistemaDF import SistemaDifusoTarjetasGraficas
+from .GraficosDF import renderizar_superficie
+from .ApiDF import crear_rutas
+from .MetricasDF import metricas
+from .CacheDF import CacheLRU, CacheRedis
+from .CompiladoDF import ruta_compilado_predeterminada
+from .ResolucionesDF import CATALOGO_RESOLUCIONES
+import asyncio
+import base64
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Simuladores independientes para atender eventos concurrentes
+TAMANO_POOL_SIMULADORES = 4
+
+# Artefacto con el sistema difuso compilado, compartido por todos los workers (en la caché privada del usuario)
+RUTA_SISTEMA_COMPILADO = os.environ.get("SISTEMA_DIFUSO_COMPILADO", ruta_compilado_predeterminada())
+
+# Caché de resultados y gráficos compartida entre workers (p. ej. redis://localhost:6379/0; vacío la desactiva)
+URL_CACHE_COMPARTIDO = os.environ.get("SISTEMA_DIFUSO_REDIS", "")
+TTL_CACHE_COMPARTIDO = int(os.environ.get("SISTEMA_DIFUSO_REDIS_TTL", "3600"))
+
+# Evaluación incremental por sesión del navegador (solo recalcula la entrada que cambió)
+EVALUACION_INCREMENTAL = os.environ.get("SISTEMA_DIFUSO_INCREMENTAL", "0") == "1"
+
+# Sesiones incrementales por cliente; las menos usadas se descartan
+_sesiones = CacheLRU(256)
 
 # Variable global para cachear la instancia del sistema difuso
 _sistema_difuso_cache = None
+_sistema_difuso_lock = threading.Lock()
 
 def obtener_sistema_difuso():
-    """Obtiene la instancia del sistema difuso (singleton pattern)."""
+    """Obtiene la instancia del sistema difuso (singleton pattern).
+
+    La instancia es segura entre hilos: cada evaluación toma un simulador propio del pool.
+    """
     global _sistema_difuso_cache
     if _sistema_difuso_cache is None:
-        _sistema_difuso_cache = SistemaDifusoTarjetasGraficas()
+        with _sistema_difuso_lock:
+            if _sistema_difuso_cache is None:
+                cache_compartido = CacheRedis(URL_CACHE_COMPARTIDO, ttl=TTL_CACHE_COMPARTIDO) \
+                    if URL_CACHE_COMPARTIDO else None
+                sistema_difuso = SistemaDifusoTarjetasGraficas(
+                    tamano_pool=TAMANO_POOL_SIMULADORES,
+                    ruta_compilado=RUTA_SISTEMA_COMPILADO,
+                    cache_compartido=cache_compartido,
+                )
+                metricas.registrar_fuente("cache_predicciones", sistema_difuso.estadisticas_cache)
+                metricas.registrar_fuente("cache_graficos", lambda: sistema_difuso.cache_graficos.estadisticas()
+                                          if sistema_difuso.cache_graficos is not None else None)
+                metricas.registrar_fuente("pool_simuladores", sistema_difuso.estadisticas_pool)
+                metricas.registrar_fuente("sesiones_incrementales", _sesiones.estadisticas)
+                _sistema_difuso_cache = sistema_difuso
     return _sistema_difuso_cache
 
+# Hilos donde se ejecuta la inferencia para no bloquear el event loop del worker
+_ejecutor = ThreadPoolExecutor(max_workers=TAMANO_POOL_SIMULADORES, thread_name_prefix="sistema-difuso")
+
+# Última tarea lanzada por cada cliente y tipo de solicitud, para cancelar la anterior si aún no empezó
+_tareas_en_curso = {}
+
+async def precalentar_sistema_difuso():
+    """Construye el sistema difuso al arrancar la app, no en el primer clic de un usuario."""
+    inicio = time.perf_counter()
+    await asyncio.get_running_loop().run_in_executor(_ejecutor, obtener_sistema_difuso)
+    print(f"Sistema difuso listo en {time.perf_counter() - inicio:.2f} s")
+
+def _construir_entrada(sistema_difuso, resolucion, configuracion, fps_objetivo, potencia_gpu):
+    """Construye la entrada del sistema difuso a partir de los valores seleccionados."""
+    return {
+        'resolucion': sistema_difuso.obtener_valor_resolucion(resolucion),
+        'configuracion': configuracion,
+        'fps_objetivo': fps_objetivo,
+        'potencia_gpu': potencia_gpu
+    }
+
+def _sesion_incremental(sistema_difuso, cliente):
+    """Sesión incremental del cliente, creada en su primera predicción."""
+    sesion = _sesiones.obtener(cliente)
+    if sesion is None:
+        sesion = sistema_difuso.crear_sesion()
+        _sesiones.guardar(cliente, sesion)
+    return sesion
+
+def _predecir(cliente, *valores):
+    """Ejecuta la predicción en un hilo del ejecutor."""
+    # Usar la instancia cacheada del sistema difuso
+    sistema_difuso = obtener_sistema_difuso()
+    entrada = _construir_entrada(sistema_difuso, *valores)
+    print(entrada)
+    sesion = _sesion_incremental(sistema_difuso, cliente) if EVALUACION_INCREMENTAL else None
+    return sistema_difuso.obtener_prediccion(entrada, sesion)
+
+def _graficar(cliente, *valores):
+    """Genera las gráficas SVG de las salidas en un hilo del ejecutor (no depende del cliente)."""
+    sistema_difuso = obtener_sistema_difuso()
+    graficos = sistema_difuso.obtener_graficos(_construir_entrada(sistema_difuso, *valores), formato="svg")
+    return tuple("data:image/svg+xml;base64," + base64.b64encode(graficos[salida]).decode()
+                 for salida in ('uso_gpu', 'temperatura'))
+
+def _graficar_superficie(eje_x, eje_y, fijos):
+    """Barre la superficie 2-D y la dibuja como mapas de calor PNG en un hilo del ejecutor."""
+    sistema_difuso = obtener_sistema_difuso()
+    superficie = sistema_difuso.obtener_superficie(eje_x, eje_y, fijos)
+    return tuple("data:image/png;base64," + base64.b64encode(renderizar_superficie(superficie, salida)).decode()
+                 for salida in ('uso_gpu', 'temperatura'))
+
+def _corte_local(resolucion):
+    """Corte cuantizado de la superficie para la resolución dada, listo para enviarse al navegador."""
+    sistema_difuso = obtener_sistema_difuso()
+    corte = sistema_difuso.obtener_corte_cuantizado(sistema_difuso.obtener_valor_resolucion(resolucion))
+    return {
+        'ejes': corte['ejes'],
+        **{salida: {'codigos': base64.b64encode(corte[salida]['codigos'].tobytes()).decode(),
+                    'minimo': corte[salida]['minimo'], 'escala': corte[salida]['escala']}
+           for salida in ('uso_gpu', 'temperatura')},
+        'umbrales_uso_gpu': list(sistema_difuso.UMBRALES_USO_GPU),
+        'etiquetas_uso_gpu': sistema_difuso.uso_labels,
+        'umbrales_temperatura': list(sistema_difuso.UMBRALES_TEMPERATURA),
+        'etiquetas_temperatura': sistema_difuso.temp_labels,
+    }
+
+async def exponer_metricas(request):
+    """Métricas en formato de texto de Prometheus."""
+    return PlainTextResponse(metricas.exportar_prometheus(), media_type="text/plain; version=0.0.4")
+
+# Rutas HTTP propias montadas junto al backend de Reflex: métricas y API JSON sin estado
+api = Starlette(routes=[
+    Route("/metrics", exponer_metricas, methods=["GET"]),
+    *crear_rutas(obtener_sistema_difuso, _ejecutor),
+])
+
 class State(rx.State):
     """Estado de la aplicación para el sistema experto de tarjetas gráficas."""
     
@@ -23,11 +150,15 @@ class State(rx.State):
     prediccion: str = ""
     regla_activada: str = ""
     cargando: bool = False
-    grafico_url: str = "/tmp/uso_gpu_caso.png"
+    # Gráficas como data URI, generadas solo cuando el usuario las pide
+    grafico_uso_gpu: str = ""
+    grafico_temperatura: str = ""
     
     def set_resolucion(self, resolucion: str):
         """Establece la resolución deseada."""
         self.resolucion_seleccionada = resolucion
+        if self.prediccion_en_vivo:
+            return State.actualizar_corte_local
     
     def set_configuracion(self, configuracion: list[int | float]):
         """Establece la configuración deseada."""
@@ -41,37 +172,285 @@ class State(rx.State):
         """Establece la potencia de GPU deseada."""
         self.potencia_gpu = potencia_gpu
     
-    def obtener_prediccion(self):
-        """Obtiene la predicción del sistema difuso usando las reglas creadas."""
-        # Activar estado de carga
-        self.cargando = True
-        
-        # Usar la instancia cacheada del sistema difuso
-        sistema_difuso = obtener_sistema_difuso()
-       
-        
-        # Obtener el valor numérico de la resolución seleccionada
-        valor_resolucion = sistema_difuso.obtener_valor_resolucion(self.resolucion_seleccionada)
-        
-        # Preparar entrada para el sistema difuso
-        entrada = {
-            'resolucion': valor_resolucion,
-            'configuracion': self.configuracion[0],
-            'fps_objetivo': self.fps_objetivo[0],
-            'potencia_gpu': self.potencia_gpu[0]
-        }
-
-        print(entrada)
-        
+    # Identificador de la última solicitud de cada tipo; las respuestas de solicitudes anteriores se descartan
+    _solicitud_prediccion: int = 0
+    _solicitud_graficos: int = 0
+
+    # Modo en vivo: el navegador interpola la predicción sobre un corte cuantizado de la superficie
+    prediccion_en_vivo: bool = False
+    corte_local: dict = {}
+
+    def alternar_prediccion_en_vivo(self, activo: bool):
+        """Activa o desactiva la predicción en el navegador mientras se mueven los sliders."""
+        self.prediccion_en_vivo = activo
+        if activo:
+            # Los sliders en vivo parten de los valores que conoce el servidor
+            return [
+                configuracion_local.push(self.configuracion),
+                fps_objetivo_local.push(self.fps_objetivo),
+                potencia_gpu_local.push(self.potencia_gpu),
+                State.actualizar_corte_local,
+            ]
+
+    @rx.event(background=True)
+    async def actualizar_corte_local(self):
+        """Envía al navegador el corte de la superficie para la resolución seleccionada."""
+        async with self:
+            resolucion = self.resolucion_seleccionada
+        corte = await asyncio.get_running_loop().run_in_executor(_ejecutor, _corte_local, resolucion)
+        async with self:
+            if resolucion == self.resolucion_seleccionada:
+                self.corte_local = corte
+
+    def _valores_entrada(self):
+        """Valores seleccionados en la interfaz, en el orden de _construir_entrada."""
+        return (self.resolucion_seleccionada, self.configuracion[0], self.fps_objetivo[0], self.potencia_gpu[0])
+
+    async def _ejecutar(self, funcion, tipo):
+        """Lanza funcion(cliente, *valores) en el ejecutor; retorna su resultado, o None si se canceló.
+
+        tipo: 'prediccion' o 'graficos'. Cada tipo tiene su propia tarea en curso por cliente: una
+        solicitud nueva cancela la anterior del mismo tipo si aún no empezó, nunca la del otro.
+        """
+        operacion = funcion.__name__.lstrip('_')
+        with metricas.en_curso(operacion), metricas.medir('solicitud_' + operacion):
+            return await self._ejecutar_sin_medir(funcion, tipo)
+
+    async def _ejecutar_sin_medir(self, funcion, tipo):
+        async with self:
+            valores = self._valores_entrada()
+            cliente = self.router.session.client_token
+
+        clave = (cliente, tipo)
+        anterior = _tareas_en_curso.pop(clave, None)
+        if anterior is not None:
+            anterior.cancel()
+        tarea = asyncio.get_running_loop().run_in_executor(_ejecutor, funcion, cliente, *valores)
+        _tareas_en_curso[clave] = tarea
+        try:
+            return await tarea
+        except asyncio.CancelledError:
+            return None
+        finally:
+            if _tareas_en_curso.get(clave) is tarea:
+                del _tareas_en_curso[clave]
+
+    @rx.event(background=True)
+    async def obtener_prediccion(self):
+        """Obtiene la predicción del sistema difuso usando las reglas creadas, fuera del event loop."""
+        # Activar estado de carga (se envía al navegador en cuanto se cierra el bloque)
+        async with self:
+            self._solicitud_prediccion += 1
+            solicitud = self._solicitud_prediccion
+            self.cargando = True
+            # Las gráficas anteriores ya no corresponden a la nueva predicción
+            self.grafico_uso_gpu = ""
+            self.grafico_temperatura = ""
+
         # Procesar con el sistema difuso usando el método de predicción
-        self.prediccion, self.regla_activada = sistema_difuso.obtener_prediccion(entrada)
+        resultado = None
+        try:
+            resultado = await self._ejecutar(_predecir, 'prediccion')
+        finally:
+            async with self:
+                # Una solicitud más reciente reemplaza a esta y es la que desactiva el estado de carga
+                if solicitud == self._solicitud_prediccion:
+                    if resultado is not None:
+                        self.prediccion, self.regla_activada = resultado
+                    self.cargando = False
+
+    @rx.event(background=True)
+    async def generar_graficos(self):
+        """Genera bajo demanda las gráficas de las salidas para la entrada actual."""
+        async with self:
+            self._solicitud_graficos += 1
+            solicitud = self._solicitud_graficos
+        resultado = await self._ejecutar(_graficar, 'graficos')
+        async with self:
+            if solicitud != self._solicitud_graficos or resultado is None:
+                return
+            self.grafico_uso_gpu, self.grafico_temperatura = resultado
+
+# Valores de los sliders en el navegador durante el modo en vivo; el servidor los recibe al soltar
+configuracion_local = ClientStateVar.create("configuracion_local", default=[50])
+fps_objetivo_local = ClientStateVar.create("fps_objetivo_local", default=[60])
+potencia_gpu_local = ClientStateVar.create("potencia_gpu_local", default=[50])
+
+def _slider_entrada(valor, al_cambiar, valor_local, minimo, maximo):
+    """Slider de una entrada; en modo en vivo solo actualiza el navegador y sincroniza el servidor al soltar."""
+    return rx.cond(
+        State.prediccion_en_vivo,
+        rx.slider(
+            min=minimo, max=maximo, step=1,
+            value=valor_local.value,
+            on_change=valor_local.set,
+            on_value_commit=al_cambiar,
+            width="100%",
+            is_disabled=State.cargando,
+        ),
+        rx.slider(
+            min=minimo, max=maximo, step=1,
+            value=valor,
+            on_change=al_cambiar,
+            width="100%",
+            is_disabled=State.cargando,
+        ),
+    )
 
+def _prediccion_local():
+    """Texto de la predicción interpolada en el navegador (ver assets/prediccion_local.js)."""
+    corte = State.corte_local
+    valores = (configuracion_local.value, fps_objetivo_local.value, potencia_gpu_local.value)
+    return Var(
+        _js_expr=f"(window.predecirLocal?.({corte!s}, {', '.join(f'{v!s}[0]' for v in valores)}) ?? \"\")",
+        _var_type=str,
+        _var_data=VarData.merge(corte._get_all_var_data(), *(v._get_all_var_data() for v in valores)),
+    )
 
-        # Desactivar estado de carga
-        self.cargando = False
+class EstadoSuperficie(rx.State):
+    """Estado de la página de superficies de control (barrido 2-D de dos antecedentes)."""
+
+    eje_x: str = "fps_objetivo"
+    eje_y: str = "potencia_gpu"
+    # Valores de los antecedentes que no se barren
+    resolucion: list[int] = [55]
+    configuracion: list[int] = [50]
+    fps_objetivo: list[int] = [60]
+    potencia_gpu: list[int] = [50]
+    cargando: bool = False
+    error: str = ""
+    mapa_uso_gpu: str = ""
+    mapa_temperatura: str = ""
+
+    def set_eje_x(self, eje: str):
+        """Establece el antecedente del eje horizontal."""
+        self.eje_x = eje
+
+    def set_eje_y(self, eje: str):
+        """Establece el antecedente del eje vertical."""
+        self.eje_y = eje
+
+    def set_resolucion(self, resolucion: list[int | float]):
+        """Establece la resolución fija."""
+        self.resolucion = resolucion
+
+    def set_configuracion(self, configuracion: list[int | float]):
+        """Establece la configuración fija."""
+        self.configuracion = configuracion
+
+    def set_fps_objetivo(self, fps_objetivo: list[int | float]):
+        """Establece el FPS objetivo fijo."""
+        self.fps_objetivo = fps_objetivo
+
+    def set_potencia_gpu(self, potencia_gpu: list[int | float]):
+        """Establece la potencia de GPU fija."""
+        self.potencia_gpu = potencia_gpu
+
+    @rx.event(background=True)
+    async def generar_superficie(self):
+        """Evalúa la malla completa de los dos ejes elegidos y muestra los mapas de calor."""
+        async with self:
+            if self.eje_x == self.eje_y:
+                self.error = "Elige dos antecedentes distintos para los ejes."
+                return
+            self.cargando = True
+            self.error = ""
+            eje_x, eje_y = self.eje_x, self.eje_y
+            fijos = {
+                'resolucion': self.resolucion[0],
+                'configuracion': self.configuracion[0],
+                'fps_objetivo': self.fps_objetivo[0],
+                'potencia_gpu': self.potencia_gpu[0],
+            }
+
+        mapas = None
+        error = ""
+        try:
+            with metricas.en_curso('superficie'), metricas.medir('solicitud_superficie'):
+                mapas = await asyncio.get_running_loop().run_in_executor(
+                    _ejecutor, _graficar_superficie, eje_x, eje_y, fijos)
+        except Exception as e:
+            # El error se muestra en la página; los mapas anteriores ya no corresponden a la solicitud
+            error = f"No se pudo generar la superficie: {e}"
+            mapas = ("", "")
+        finally:
+            async with self:
+                if mapas is not None:
+                    self.mapa_uso_gpu, self.mapa_temperatura = mapas
+                self.error = error
+                self.cargando = False
+
+def _control_fijo(etiqueta, nombre, valor, al_cambiar, minimo, maximo):
+    """Slider de un antecedente fijo; se oculta cuando el antecedente es uno de los ejes."""
+    return rx.cond(
+        (EstadoSuperficie.eje_x != nombre) & (EstadoSuperficie.eje_y != nombre),
+        rx.vstack(
+            rx.text(f"{etiqueta}: ", valor[0], font_weight="bold"),
+            rx.slider(min=minimo, max=maximo, step=1, value=valor, on_change=al_cambiar, width="100%"),
+            align="start",
+            width="100%",
+            spacing="2",
+        ),
+        rx.box(),
+    )
+
+def superficie():
+    ejes = list(SistemaDifusoTarjetasGraficas.ENTRADAS)
+    return rx.vstack(
+        rx.heading("Superficies de control del sistema difuso", size="5", color="blue.600"),
+        rx.link("← Volver a la predicción", href="/"),
+        rx.text("Evalúa el uso de GPU y la temperatura sobre todo el rango de dos antecedentes, "
+                "con los otros dos fijos.", color="gray.600"),
+        rx.hstack(
+            rx.vstack(
+                rx.text("Eje X:", font_weight="bold"),
+                rx.select(ejes, value=EstadoSuperficie.eje_x, on_change=EstadoSuperficie.set_eje_x),
+                align="start",
+            ),
+            rx.vstack(
+                rx.text("Eje Y:", font_weight="bold"),
+                rx.select(ejes, value=EstadoSuperficie.eje_y, on_change=EstadoSuperficie.set_eje_y),
+                align="start",
+            ),
+            spacing="6",
+        ),
+        _control_fijo("Resolución (0-100)", "resolucion", EstadoSuperficie.resolucion,
+                      EstadoSuperficie.set_resolucion, 0, 100),
+        _control_fijo("Configuración", "configuracion", EstadoSuperficie.configuracion,
+                      EstadoSuperficie.set_configuracion, 0, 100),
+        _control_fijo("FPS Objetivo", "fps_objetivo", EstadoSuperficie.fps_objetivo,
+                      EstadoSuperficie.set_fps_objetivo, 30, 240),
+        _control_fijo("Potencia de GPU", "potencia_gpu", EstadoSuperficie.potencia_gpu,
+                      EstadoSuperficie.set_potencia_gpu, 0, 100),
+        rx.button(
+            rx.cond(EstadoSuperficie.cargando, rx.spinner(size="3"), rx.text("Generar superficies")),
+            on_click=EstadoSuperficie.generar_superficie,
+            color_scheme="blue",
+            size="3",
+        ),
+        rx.cond(EstadoSuperficie.error, rx.text(EstadoSuperficie.error, color="red.600"), rx.box()),
+        rx.cond(
+            EstadoSuperficie.mapa_uso_gpu,
+            rx.hstack(
+                rx.image(src=EstadoSuperficie.mapa_uso_gpu, width="50%"),
+                rx.image(src=EstadoSuperficie.mapa_temperatura, width="50%"),
+                spacing="4",
+                width="100%",
+            ),
+            rx.box(),
+        ),
+        spacing="4",
+        padding="4rem",
+        width="100%",
+        min_height="100vh",
+    )
 
 def index():
     return rx.hstack(
+        rx.script(src="/prediccion_local.js"),
+        configuracion_local,
+        fps_objetivo_local,
+        potencia_gpu_local,
         # Panel izquierdo: Formulario
         rx.vstack(
             rx.heading("Sistema Difuso de Prediccion del uso de Tarjetas Graficas para Gaming", size="5", color="blue.600"),
@@ -81,42 +460,7 @@ def index():
             rx.vstack(
                 rx.text("Resolución:", font_weight="bold", align="left"),
                 rx.select(
-                    items=[
-                        # Resoluciones clásicas (4:3) - BAJA
-                        "640×480 (VGA)",
-                        "800×600 (SVGA)", 
-                        "1024×768 (XGA)",
-                        "1280×1024 (SXGA)",
-                        "1600×1200 (UXGA)",
-                        
-                        # Resoluciones HD y widescreen - MEDIA
-                        "1366×768 (HD)",
-                        "1440×900 (WXGA+)",
-                        "1600×900 (HD+)",
-                        "1680×1050 (WSXGA+)",
-                        "1920×1080 (Full HD)",
-                        "1920×1200 (WUXGA)",
-                        
-                        # Resoluciones 2K, 3K - ALTA
-                        "2560×1440 (QHD/2K)",
-                        "2560×1600 (WQXGA)",
-                        "2880×1800 (3K Retina)",
-                        "3200×1800 (QHD+)",
-                        
-                        # Resoluciones 4K y superiores - ULTRA
-                        "3840×2160 (4K UHD)",
-                        "4096×2160 (DCI 4K)",
-                        "5120×2880 (5K)",
-                        "6016×3384 (6K)",
-                        "7680×4320 (8K UHD)",
-                        
-                        # Ultrawide
-                        "2560×1080 (UW-FHD)",
-                        "3440×1440 (UW-QHD)",
-                        "3840×1600 (UW-QHD+)",
-                        "5120×1440 (Dual QHD)",
-                        "5120×2160 (5K Ultrawide)"
-                    ],
+                    items=CATALOGO_RESOLUCIONES.nombres,
                     value=State.resolucion_seleccionada,
                     on_change=State.set_resolucion,
                     width="100%",
@@ -132,16 +476,8 @@ def index():
             # Selector de configuración
             rx.vstack(
                 rx.text("Configuración (0-30): Bajo, (20-50): Medio, (40-70): Alto, (60-100): Ultra:", font_weight="bold", text_align="left"),
-                rx.slider(
-                    min_=0,
-                    max_=100,
-                    step=1,
-                    value=State.configuracion,
-                    on_change=State.set_configuracion,
-                    width="100%",
-                    is_disabled=State.cargando,
-                ),
-                rx.text(f"Valor en puntos: {State.configuracion[0]}", color="blue.600", font_size="sm"),
+                _slider_entrada(State.configuracion, State.set_configuracion, configuracion_local, 0, 100),
+                rx.text("Valor en puntos: ", rx.cond(State.prediccion_en_vivo, configuracion_local.value[0], State.configuracion[0]), color="blue.600", font_size="sm"),
                 align="start",
                 width="100%",
                 spacing="2",
@@ -150,16 +486,8 @@ def index():
             # Selector de FPS objetivo
             rx.vstack(
                 rx.text("FPS Objetivo:", font_weight="bold", text_align="left"),
-                rx.slider(
-                    min=30,
-                    max=240,
-                    step=1,
-                    value=State.fps_objetivo,
-                    on_change=State.set_fps_objetivo,
-                    width="100%",
-                    is_disabled=State.cargando,
-                ),
-                rx.text(f"Valor: {State.fps_objetivo[0]} FPS", color="blue.600", font_size="sm"),
+                _slider_entrada(State.fps_objetivo, State.set_fps_objetivo, fps_objetivo_local, 30, 240),
+                rx.text("Valor: ", rx.cond(State.prediccion_en_vivo, fps_objetivo_local.value[0], State.fps_objetivo[0]), " FPS", color="blue.600", font_size="sm"),
                 align="start",
                 width="100%",
                 spacing="2",
@@ -168,21 +496,32 @@ def index():
             # Selector de potencia de GPU
             rx.vstack(
                 rx.text("Potencia de GPU -> Gamas: (0-20) Bajo, (20-50) Medio, (50-70) Alto, 70-100) Ultra", font_weight="bold", text_align="left"),
-                rx.slider(
-                    min_=0,
-                    max_=100,
-                    step=1,
-                    value=State.potencia_gpu,
-                    on_change=State.set_potencia_gpu,
-                    width="100%",
-                    is_disabled=State.cargando,
-                ),
-                rx.text(f"Valor: {State.potencia_gpu[0]} puntos", color="blue.600", font_size="sm"),
+                _slider_entrada(State.potencia_gpu, State.set_potencia_gpu, potencia_gpu_local, 0, 100),
+                rx.text("Valor: ", rx.cond(State.prediccion_en_vivo, potencia_gpu_local.value[0], State.potencia_gpu[0]), " puntos", color="blue.600", font_size="sm"),
                 align="start",
                 width="100%",
                 spacing="2",
             ),
             
+            # Predicción en vivo en el navegador (opcional)
+            rx.hstack(
+                rx.switch(checked=State.prediccion_en_vivo, on_change=State.alternar_prediccion_en_vivo),
+                rx.text("Predicción en vivo mientras muevo los sliders (aproximada)"),
+                spacing="2",
+                align="center",
+            ),
+            rx.cond(
+                State.prediccion_en_vivo,
+                rx.box(
+                    rx.text(_prediccion_local(), font_family="monospace", font_size="0.9rem", color="green.700"),
+                    bg="green.50",
+                    padding="0.75rem",
+                    border_radius="6px",
+                    width="100%",
+                ),
+                rx.box(),
+            ),
+
             rx.button(
                 rx.cond(
                     State.cargando,
@@ -198,8 +537,8 @@ def index():
                 size="4",
                 width="100%",
                 margin_top="1rem",
-                is_disabled=State.cargando,
             ),
+            rx.link("Ver superficies de control completas →", href="/superficie"),
             
             spacing="4",
             padding="4rem",
@@ -279,6 +618,33 @@ def index():
 
 
 
+                # Gráficas de las salidas (solo bajo demanda)
+                rx.cond(
+                    State.prediccion,
+                    rx.vstack(
+                        rx.button(
+                            "Ver gráficas de uso de GPU y temperatura",
+                            on_click=State.generar_graficos,
+                            color_scheme="green",
+                            variant="outline",
+                            width="100%",
+                        ),
+                        rx.cond(
+                            State.grafico_uso_gpu,
+                            rx.vstack(
+                                rx.image(src=State.grafico_uso_gpu, width="100%"),
+                                rx.image(src=State.grafico_temperatura, width="100%"),
+                                spacing="2",
+                                width="100%",
+                            ),
+                            rx.box(),
+                        ),
+                        spacing="2",
+                        width="100%",
+                    ),
+                    rx.box(),
+                ),
+
                 # Mensaje de ayuda cuando no hay predicción
                 rx.cond(
                     ~State.prediccion,
@@ -318,5 +684,7 @@ def index():
     )
 
 # Configuración de la app
-app = rx.App()
+app = rx.App(api_transformer=api)
+app.register_lifespan_task(precalentar_sistema_difuso)
 app.add_page(index, title="Sistema Experto de Usos de Tarjetas Graficas para Gaming")
+app.add_page(superficie, route="/superficie", title="Superficies de control del sistema difuso")
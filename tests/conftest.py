@@ -0,0 +1,32 @@
+import os
+
+import pytest
+
+from sistemaDifuso.SistemaDF import SistemaDifusoTarjetasGraficas
+
+
+@pytest.fixture(scope='session')
+def ruta_compilado(tmp_path_factory):
+    """Artefacto compilado de la sesión de pruebas.
+
+    Por defecto va en un directorio temporal de pytest, así que la primera construcción de cada
+    sesión tarda ~1 min; PRUEBAS_SISTEMA_DIFUSO_COMPILADO indica uno a reutilizar entre sesiones.
+    """
+    return os.environ.get('PRUEBAS_SISTEMA_DIFUSO_COMPILADO') or \
+        str(tmp_path_factory.mktemp('compilado') / 'sistema_difuso_compilado.pkl')
+
+
+@pytest.fixture(scope='session')
+def crear_sistema(ruta_compilado):
+    """Construye sistemas reutilizando el artefacto compilado de la sesión."""
+    def crear(**opciones):
+        opciones.setdefault('ruta_compilado', ruta_compilado)
+        opciones.setdefault('tamano_cache', 0)
+        opciones.setdefault('tamano_cache_graficos', 0)
+        return SistemaDifusoTarjetasGraficas(**opciones)
+    return crear
+
+
+@pytest.fixture(scope='session')
+def sistema(crear_sistema):
+    return crear_sistema(motor='vectorizado')
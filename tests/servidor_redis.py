@@ -0,0 +1,68 @@
+"""Servidor local mínimo que habla el protocolo de Redis (RESP) para las pruebas de CacheRedis.
+
+Implementa solo lo que usa CacheRedis: GET, SET (con EX), DEL y SCAN (con MATCH); el resto de
+comandos responde OK.
+"""
+import fnmatch
+import socketserver
+import threading
+import time
+
+
+class _Manejador(socketserver.StreamRequestHandler):
+    def _leer_comando(self):
+        linea = self.rfile.readline()
+        if not linea:
+            return None
+        partes = []
+        for _ in range(int(linea[1:])):
+            largo = int(self.rfile.readline()[1:])
+            partes.append(self.rfile.read(largo + 2)[:-2])
+        return partes
+
+    @staticmethod
+    def _cadena(valor):
+        return b'$-1\r\n' if valor is None else b'$%d\r\n%s\r\n' % (len(valor), valor)
+
+    def handle(self):
+        datos = self.server.datos
+        while (comando := self._leer_comando()) is not None:
+            nombre = comando[0].upper()
+            with self.server.lock:
+                if nombre == b'GET':
+                    valor, expira = datos.get(comando[1], (None, None))
+                    respuesta = self._cadena(None if expira is not None and expira < time.time() else valor)
+                elif nombre == b'SET':
+                    opciones = [c.upper() for c in comando[3::2]]
+                    expira = time.time() + int(comando[4]) if b'EX' in opciones else None
+                    datos[comando[1]] = (comando[2], expira)
+                    respuesta = b'+OK\r\n'
+                elif nombre == b'DEL':
+                    respuesta = b':%d\r\n' % sum(datos.pop(clave, None) is not None for clave in comando[1:])
+                elif nombre == b'SCAN':
+                    patron = comando[comando.index(b'MATCH') + 1].decode() if b'MATCH' in comando else '*'
+                    claves = [c for c in datos if fnmatch.fnmatchcase(c.decode(), patron)]
+                    respuesta = b'*2\r\n$1\r\n0\r\n*%d\r\n' % len(claves) + b''.join(map(self._cadena, claves))
+                else:
+                    respuesta = b'+OK\r\n'
+            self.wfile.write(respuesta)
+
+
+class ServidorRedisLocal(socketserver.ThreadingTCPServer):
+    """Servidor en 127.0.0.1 en un puerto libre; `datos` es {clave: (valor, expiración)}."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _Manejador)
+        self.datos = {}
+        self.lock = threading.Lock()
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"redis://127.0.0.1:{self.server_address[1]}/0"
+
+    def cerrar(self):
+        self.shutdown()
+        self.server_close()
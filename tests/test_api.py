@@ -0,0 +1,37 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from sistemaDifuso.ApiDF import crear_rutas
+
+ENTRADA = {'resolucion': '1920×1080 (Full HD)', 'configuracion': 50, 'fps_objetivo': 60, 'potencia_gpu': 50}
+
+
+@pytest.fixture(scope='module')
+def cliente(sistema):
+    with ThreadPoolExecutor(max_workers=1) as ejecutor:
+        yield TestClient(Starlette(routes=crear_rutas(lambda: sistema, ejecutor)))
+
+
+def test_prediccion(cliente):
+    respuesta = cliente.post('/api/prediccion', json=ENTRADA)
+    assert respuesta.status_code == 200
+    assert set(respuesta.json()) >= {'uso_gpu', 'temperatura'}
+
+
+@pytest.mark.parametrize('valor', ['1' + '0' * 400, '1e400', '"50"', 'true'],
+                         ids=['entero_enorme', 'infinito', 'texto', 'booleano'])
+def test_numero_invalido_es_400(cliente, valor):
+    cuerpo = '{"resolucion": 55, "configuracion": %s, "fps_objetivo": 60, "potencia_gpu": 50}' % valor
+    respuesta = cliente.post('/api/prediccion', content=cuerpo, headers={'content-type': 'application/json'})
+    assert respuesta.status_code == 400
+    assert 'configuracion' in respuesta.json()['error']
+
+
+@pytest.mark.parametrize('resolucion', ['99999999999999999999x2', '0x1080'], ids=['enorme', 'cero'])
+def test_resolucion_fuera_de_rango_es_400(cliente, resolucion):
+    entrada = dict(ENTRADA, resolucion=resolucion)
+    assert cliente.post('/api/prediccion', json=entrada).status_code == 400
+    assert cliente.post('/api/predicciones', json=[ENTRADA, entrada]).status_code == 400
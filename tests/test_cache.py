@@ -0,0 +1,102 @@
+import socket
+
+import numpy as np
+import pytest
+
+from sistemaDifuso.CacheDF import CacheDosNiveles, CacheLRU, CacheRedis
+
+from .servidor_redis import ServidorRedisLocal
+
+ENTRADA = {'resolucion': 55.0, 'configuracion': 50.0, 'fps_objetivo': 90.0, 'potencia_gpu': 60.0}
+
+
+@pytest.fixture
+def servidor():
+    servidor = ServidorRedisLocal()
+    yield servidor
+    servidor.cerrar()
+
+
+@pytest.fixture
+def url_caida():
+    # Puerto que estuvo libre: nadie escucha en él
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        puerto = s.getsockname()[1]
+    return f"redis://127.0.0.1:{puerto}/0"
+
+
+def _dos_niveles(remoto, version):
+    return CacheDosNiveles(CacheLRU(16), remoto, 'prediccion', lambda: version[0], bytes, bytes)
+
+
+def test_guardar_y_obtener(servidor):
+    cache = CacheRedis(servidor.url, ttl=60)
+    assert cache.obtener('a') is None
+    cache.guardar('a', b'\x00\x01valor')
+    assert cache.obtener('a') == b'\x00\x01valor'
+    assert servidor.datos[b'sistema_difuso:a'][1] is not None
+    estadisticas = cache.estadisticas()
+    assert (estadisticas['aciertos'], estadisticas['fallos'], estadisticas['escrituras']) == (1, 1, 1)
+
+
+def test_claves_con_version(servidor):
+    remoto = CacheRedis(servidor.url)
+    version = ['v1']
+    _dos_niveles(remoto, version).guardar((1, 2), b'datos')
+    assert b'sistema_difuso:v1:prediccion:1.0:2.0' in servidor.datos
+
+    # Otro worker (otra caché local) encuentra la entrada en el nivel compartido
+    assert _dos_niveles(remoto, version).obtener((1, 2)) == b'datos'
+    # Con otra versión de las reglas la entrada anterior ya no se consulta
+    version[0] = 'v2'
+    assert _dos_niveles(remoto, version).obtener((1, 2)) is None
+
+
+def test_claves_numericas_equivalentes_comparten_entrada(servidor):
+    remoto = CacheRedis(servidor.url)
+    _dos_niveles(remoto, ['v1']).guardar((55, 50, 90, 60), b'datos')
+    for clave in [(55.0, 50.0, 90.0, 60.0), tuple(np.float64([55, 50, 90, 60])), (55, 50.0, np.float64(90), 60)]:
+        assert _dos_niveles(remoto, ['v1']).obtener(clave) == b'datos'
+    assert list(servidor.datos) == [b'sistema_difuso:v1:prediccion:55.0:50.0:90.0:60.0']
+
+
+def test_limpiar_borra_solo_la_version_actual(servidor):
+    remoto = CacheRedis(servidor.url)
+    _dos_niveles(remoto, ['v1']).guardar('x', b'1')
+    cache = _dos_niveles(remoto, ['v2'])
+    cache.guardar('x', b'2')
+    cache.limpiar()
+    assert len(cache) == 0
+    assert list(servidor.datos) == [b'sistema_difuso:v1:prediccion:x']
+
+
+def test_sin_redis_usa_la_cache_local(url_caida):
+    remoto = CacheRedis(url_caida, timeout=0.05, espera_reintento=60)
+    cache = _dos_niveles(remoto, ['v1'])
+    cache.guardar('x', b'1')
+    assert cache.obtener('x') == b'1'
+    assert cache.obtener('y') is None
+    estadisticas = cache.estadisticas()
+    assert estadisticas['remoto_errores'] == 1
+    assert estadisticas['remoto_disponible'] == 0
+    # Mientras está desactivado no se vuelve a intentar la conexión
+    assert estadisticas['remoto_omitidas'] >= 1
+
+
+def test_resultados_compartidos_entre_sistemas(crear_sistema, servidor):
+    primero = crear_sistema(motor='vectorizado', tamano_cache=16, cache_compartido=CacheRedis(servidor.url))
+    segundo = crear_sistema(motor='vectorizado', tamano_cache=16, cache_compartido=CacheRedis(servidor.url))
+    esperado = primero.obtener_resultado(ENTRADA)
+    resultado = segundo.obtener_resultado(ENTRADA)
+    assert segundo.cache.estadisticas()['remoto_aciertos'] == 1
+    assert (resultado.uso_gpu, resultado.temperatura) == (esperado.uso_gpu, esperado.temperatura)
+    assert resultado.texto_activaciones() == esperado.texto_activaciones()
+
+
+def test_sistema_sin_redis_sigue_prediciendo(crear_sistema, url_caida):
+    sistema = crear_sistema(motor='vectorizado', tamano_cache=16,
+                            cache_compartido=CacheRedis(url_caida, timeout=0.05))
+    resultado = sistema.obtener_resultado(ENTRADA)
+    assert sistema.obtener_resultado(ENTRADA) is resultado
+    assert sistema.cache.estadisticas()['remoto_errores'] >= 1
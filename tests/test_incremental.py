@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+
+def test_sesion_coincide_con_el_motor_vectorizado(sistema):
+    sesion = sistema.crear_sesion()
+    entrada = {'resolucion': 55.0, 'configuracion': 50.0, 'fps_objetivo': 90.0, 'potencia_gpu': 60.0}
+    for nombre in ('configuracion', 'fps_objetivo', 'potencia_gpu'):
+        universo = getattr(sistema, nombre + '_universe')
+        for x in np.linspace(universo[0], universo[-1], 25):
+            entrada = dict(entrada, **{nombre: float(x)})
+            incremental, completo = sesion.evaluar(entrada), sistema._evaluar(entrada)
+            assert incremental.uso_gpu == completo.uso_gpu
+            assert incremental.temperatura == completo.temperatura
+    assert sesion.actualizaciones['incrementales'] > 0
+
+
+@pytest.mark.parametrize('motor', ['sugeno', 'tabla'])
+def test_sesion_rechazada_con_otros_modelos(crear_sistema, motor):
+    with pytest.raises(ValueError, match=motor):
+        crear_sistema(motor=motor, tamano_cache=0).crear_sesion()
@@ -0,0 +1,21 @@
+import io
+
+import pytest
+
+from sistemaDifuso.LoteDF import puntuar_csv
+
+ENCABEZADO = "resolucion,configuracion,fps_objetivo,potencia_gpu,id\n"
+
+
+def test_omite_lineas_en_blanco(sistema):
+    entrada = io.StringIO(ENCABEZADO + "1920×1080,50,60,50,a\n\n2560×1440 (QHD/2K),10,120,90,b\n\n")
+    salida = io.StringIO()
+    assert puntuar_csv(sistema, entrada, salida, tamano_bloque=1) == 2
+    lineas = salida.getvalue().splitlines()
+    assert [linea.split(',')[4] for linea in lineas[1:]] == ['a', 'b']
+
+
+def test_fila_incompleta_indica_la_linea(sistema):
+    entrada = io.StringIO(ENCABEZADO + "1920×1080,50,60,50,a\n1920×1080,50,60\n")
+    with pytest.raises(ValueError, match="Línea 3"):
+        puntuar_csv(sistema, entrada, io.StringIO())
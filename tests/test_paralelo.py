@@ -0,0 +1,32 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from sistemaDifuso import ParaleloDF
+from sistemaDifuso.BenchmarkDF import entradas_aleatorias
+
+
+def test_evaluador_paralelo_coincide_con_el_lote(sistema, ruta_compilado, monkeypatch):
+    creadas = []
+
+    class MemoriaRegistrada(shared_memory.SharedMemory):
+        def __init__(self, name=None, create=False, size=0):
+            super().__init__(name, create, size)
+            if create:
+                creadas.append(self.name)
+
+    monkeypatch.setattr(ParaleloDF.shared_memory, 'SharedMemory', MemoriaRegistrada)
+    entradas = entradas_aleatorias(sistema, 500, semilla=1)
+    with ParaleloDF.EvaluadorParalelo(2, ruta_compilado) as evaluador:
+        resultado = evaluador.evaluar(entradas)
+
+    esperado = sistema.obtener_predicciones_lote(entradas)
+    for salida in ('uso_gpu', 'temperatura'):
+        np.testing.assert_allclose(resultado[salida], esperado[salida], rtol=0, atol=1e-9)
+
+    # Los bloques de entradas y salidas se liberan al terminar la evaluación
+    assert len(creadas) == 2
+    for nombre in creadas:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=nombre)
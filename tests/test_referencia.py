@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+import pytest
+
+from sistemaDifuso.ReferenciaDF import cargar_referencia, verificar
+
+# Salidas de skfuzzy sobre todas las resoluciones del catálogo x 3 x 3 x 3 más 100 puntos aleatorios
+# (ver generar_referencia); regenerar si cambian las reglas o las funciones de pertenencia
+RUTA_REFERENCIA = os.path.join(os.path.dirname(__file__), 'datos', 'referencia_skfuzzy.npz')
+
+
+@pytest.fixture(scope='module')
+def referencia(sistema):
+    referencia = cargar_referencia(RUTA_REFERENCIA)
+    assert referencia['metadatos']['huella'] == sistema.huella, "La referencia es de otra base de reglas"
+    return referencia
+
+
+def _fallos(informe):
+    return [{s: {k: v for k, v in pasada[s].items() if k != 'peores'} for s in ('uso_gpu', 'temperatura')}
+            for pasada in informe['pasadas']]
+
+
+def test_vectorizado_reproduce_skfuzzy(sistema, referencia):
+    informe = verificar(sistema, referencia, via='lote', tolerancia=1e-6)
+    assert informe['ok'], _fallos(informe)
+
+
+def test_vectorizado_con_cache_reproduce_skfuzzy(crear_sistema, referencia):
+    sistema = crear_sistema(motor='vectorizado', tamano_cache=len(referencia['entradas']))
+    informe = verificar(sistema, referencia, via='puntual', tolerancia=1e-6, pasadas=2)
+    assert informe['ok'], _fallos(informe)
+    assert sistema.cache.estadisticas()['aciertos'] == len(referencia['entradas'])
+
+
+def test_sugeno_dentro_de_su_desviacion(crear_sistema, referencia):
+    # Desviación medida de la aproximación Sugeno (SugenoDF.informe_desviacion): hasta ~15 puntos
+    # de uso_gpu y ~11 °C en una malla de paso 5, con 99.6 % de etiquetas iguales (en esta
+    # referencia: 7.0 y 5.8, una etiqueta distinta por salida)
+    sistema = crear_sistema(motor='sugeno')
+    informe = verificar(sistema, referencia, via='lote', tolerancia=16.0, tolerancia_etiquetas=0.02)
+    assert informe['ok'], _fallos(informe)
+
+
+def test_tabla_dentro_del_error_de_interpolacion(crear_sistema, sistema, referencia, tmp_path_factory):
+    # El lote del modo tabla usa el motor vectorizado: la tabla solo se ejercita por obtener_resultado.
+    # Error de interpolación documentado en TablaSuperficieControl: ~3 puntos y ~1.5 °C (en esta
+    # referencia: 1.2 y 1.1, sin etiquetas distintas)
+    tabla = crear_sistema(motor='tabla', ruta_tabla=str(tmp_path_factory.mktemp('tabla') / 'tabla'))
+    informe = verificar(tabla, referencia, via='puntual', tolerancia=3.0, tolerancia_etiquetas=0.0)
+    assert informe['ok'], _fallos(informe)
+
+    # Las pertenencias y fuerzas, calculadas al leerlas, son las del motor vectorizado
+    entrada = {'resolucion': 55, 'configuracion': 47.3, 'fps_objetivo': 72.1, 'potencia_gpu': 51.2}
+    resultado, esperado = tabla._evaluar(entrada), sistema._evaluar(entrada)
+    assert np.array_equal(resultado.activaciones, esperado.activaciones)
+    assert np.array_equal(resultado.fuerza_reglas, esperado.fuerza_reglas)
+    assert resultado.etiqueta_uso_gpu == esperado.etiqueta_uso_gpu
+    assert resultado.etiqueta_temperatura == esperado.etiqueta_temperatura
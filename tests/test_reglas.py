@@ -0,0 +1,95 @@
+import shutil
+
+import numpy as np
+import pytest
+
+from sistemaDifuso.ReglasDF import TablaDecision
+
+# Solo dispara la regla 0 (baja, baja, conservador, baja), con fuerza 1
+ENTRADA = {'resolucion': 10.0, 'configuracion': 10.0, 'fps_objetivo': 35.0, 'potencia_gpu': 10.0}
+
+
+def _csv(sistema, tmp_path, nombre='reglas.csv'):
+    ruta = tmp_path / nombre
+    sistema.tabla_decision.guardar(ruta)
+    return ruta
+
+
+def _tabla_modificada(sistema):
+    consecuentes = sistema.tabla_decision.consecuentes.copy()
+    consecuentes[0, 0, 0, 0] = [3, 3]  # critico, critica
+    return TablaDecision(consecuentes, sistema.ETIQUETAS_ENTRADAS, sistema.ETIQUETAS_SALIDAS)
+
+
+@pytest.fixture
+def crear_recargable(crear_sistema, sistema, ruta_compilado, tmp_path):
+    # recargar_reglas reescribe el artefacto compilado: cada sistema usa su propia copia
+    def crear(motor):
+        copia = tmp_path / f'compilado_{motor}.pkl'
+        shutil.copy(ruta_compilado, copia)
+        return crear_sistema(motor=motor, ruta_compilado=str(copia), tamano_cache=16)
+    return crear
+
+
+def test_guardar_y_cargar_conservan_la_tabla(sistema, tmp_path):
+    tabla = TablaDecision.cargar(_csv(sistema, tmp_path), sistema.ETIQUETAS_ENTRADAS, sistema.ETIQUETAS_SALIDAS)
+    assert tabla == sistema.tabla_decision
+    assert list(tabla.filas()) == list(sistema.tabla_decision.filas())
+
+
+@pytest.mark.parametrize('editar, mensaje', [
+    (lambda lineas: lineas[:1] + [lineas[1].rsplit(',', 1)[0] + ',tibia'] + lineas[2:], 'etiqueta desconocida'),
+    (lambda lineas: lineas[:1] + lineas[2:], 'faltan 1 reglas'),
+    (lambda lineas: lineas + [lineas[1]], 'regla repetida'),
+], ids=['etiqueta_desconocida', 'regla_faltante', 'regla_repetida'])
+def test_cargar_rechaza_tablas_invalidas(sistema, tmp_path, editar, mensaje):
+    ruta = _csv(sistema, tmp_path)
+    ruta.write_text('\n'.join(editar(ruta.read_text(encoding='utf-8').splitlines())) + '\n', encoding='utf-8')
+    with pytest.raises(ValueError, match=mensaje):
+        TablaDecision.cargar(ruta, sistema.ETIQUETAS_ENTRADAS, sistema.ETIQUETAS_SALIDAS)
+
+
+def test_recargar_reglas_en_skfuzzy_y_vectorizado(crear_recargable, sistema, tmp_path):
+    ruta = tmp_path / 'modificadas.csv'
+    _tabla_modificada(sistema).guardar(ruta)
+
+    resultados = {}
+    for motor in ('skfuzzy', 'vectorizado'):
+        recargable = crear_recargable(motor)
+        antes = recargable.obtener_resultado(ENTRADA)
+        generacion = recargable._generacion_reglas
+        assert len(recargable.cache) == 1
+
+        cambios = recargable.recargar_reglas(str(ruta))
+        assert [numero for numero, _, _ in cambios] == [0]
+        assert recargable._generacion_reglas == generacion + 1
+        assert len(recargable.cache) == 0
+
+        despues = recargable.obtener_resultado(ENTRADA)
+        assert (despues.etiqueta_uso_gpu, despues.etiqueta_temperatura) == ('critico', 'critica')
+        assert despues.uso_gpu > antes.uso_gpu
+        assert despues.reglas_principales(1)[0]['salidas'] == {'uso': 'critico', 'temp': 'critica'}
+        resultados[motor] = despues
+
+    skfuzzy, vectorizado = resultados['skfuzzy'], resultados['vectorizado']
+    assert skfuzzy.uso_gpu == pytest.approx(vectorizado.uso_gpu, abs=1e-6)
+    assert skfuzzy.temperatura == pytest.approx(vectorizado.temperatura, abs=1e-6)
+    assert np.array_equal(skfuzzy.fuerza_reglas, vectorizado.fuerza_reglas)
+
+
+def test_recargar_reglas_invalidas_conserva_las_anteriores(crear_recargable, tmp_path):
+    recargable = crear_recargable('vectorizado')
+    tabla, huella, generacion = recargable.tabla_decision, recargable.huella, recargable._generacion_reglas
+    antes = recargable.obtener_resultado(ENTRADA)
+
+    ruta = _csv(recargable, tmp_path)
+    with open(ruta, 'a', encoding='utf-8') as f:
+        f.write('baja,baja,conservador,baja,critico,critica\n')
+    with pytest.raises(ValueError, match='regla repetida'):
+        recargable.recargar_reglas(str(ruta))
+
+    assert recargable.tabla_decision is tabla
+    assert (recargable.huella, recargable._generacion_reglas) == (huella, generacion)
+    assert len(recargable.cache) == 1
+    despues = recargable.obtener_resultado(ENTRADA)
+    assert (despues.uso_gpu, despues.temperatura) == (antes.uso_gpu, antes.temperatura)
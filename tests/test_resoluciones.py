@@ -0,0 +1,23 @@
+import pytest
+
+from sistemaDifuso.ResolucionesDF import CATALOGO_RESOLUCIONES, RESOLUCIONES
+
+
+@pytest.mark.parametrize('nombre', list(RESOLUCIONES))
+def test_dimensiones_del_catalogo_dan_su_valor(nombre):
+    dimensiones = nombre.split(' (')[0]
+    assert CATALOGO_RESOLUCIONES.valor(dimensiones) == RESOLUCIONES[nombre]
+    assert CATALOGO_RESOLUCIONES.valor(dimensiones.replace('×', 'x')) == RESOLUCIONES[nombre]
+
+
+def test_dimensiones_fuera_del_catalogo_se_interpolan():
+    valor = CATALOGO_RESOLUCIONES.valor('3000×2000')
+    assert RESOLUCIONES['2880×1800 (3K Retina)'] <= valor <= RESOLUCIONES['3840×2160 (4K UHD)']
+
+
+@pytest.mark.parametrize('nombre', ['99999999999999999999x2', '0×1080', '1920x0', '100001x1'])
+def test_dimensiones_fuera_de_rango_son_error(nombre):
+    with pytest.raises(ValueError):
+        CATALOGO_RESOLUCIONES.valor(nombre)
+    with pytest.raises(ValueError):
+        CATALOGO_RESOLUCIONES.valores(['1920×1080', nombre])
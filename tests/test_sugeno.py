@@ -0,0 +1,15 @@
+import numpy as np
+
+
+def test_evaluacion_puntual_coincide_con_el_lote(crear_sistema):
+    sistema = crear_sistema(motor='sugeno')
+    rng = np.random.default_rng(0)
+    universos = (sistema.resolucion_universe, sistema.configuracion_universe,
+                 sistema.fps_objetivo_universe, sistema.potencia_gpu_universe)
+    # Lote grande para que el camino por lotes indexe solo las reglas activas
+    entradas = np.column_stack([rng.uniform(u[0], u[-1], 2000) for u in universos])
+    lote = sistema.obtener_predicciones_lote(entradas)
+    for i in range(0, len(entradas), 50):
+        resultado = sistema._evaluar(dict(zip(sistema.ENTRADAS, entradas[i].tolist())))
+        np.testing.assert_allclose([resultado.uso_gpu, resultado.temperatura],
+                                   [lote['uso_gpu'][i], lote['temperatura'][i]], rtol=0, atol=1e-9)